@@ -3,9 +3,13 @@ from linkml_runtime.dumpers.rdf_dumper import RDFDumper
 from linkml_runtime.dumpers.rdflib_dumper import RDFLibDumper
 from linkml_runtime.dumpers.yaml_dumper import YAMLDumper
 from linkml_runtime.dumpers.csv_dumper import CSVDumper
+from linkml_runtime.dumpers.parquet_dumper import ParquetDumper
+from linkml_runtime.dumpers.msgpack_dumper import MessagePackDumper
 
 json_dumper = JSONDumper()
 rdf_dumper = RDFDumper()
 rdflib_dumper = RDFLibDumper()
 yaml_dumper = YAMLDumper()
 csv_dumper = CSVDumper()
+parquet_dumper = ParquetDumper()
+msgpack_dumper = MessagePackDumper()
@@ -1,33 +1,194 @@
+import csv
 import io
-import yaml
 import json
-from typing import Dict, List, Any
+import pickle
+import yaml
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Iterable, Union, TextIO, Tuple, Optional
 
 from linkml_runtime.dumpers.dumper_root import Dumper
-from linkml_runtime.dumpers.json_dumper import JSONDumper
 from linkml_runtime.utils.yamlutils import YAMLRoot
 from linkml_runtime.linkml_model.meta import SlotDefinitionName, SchemaDefinition
+from linkml_runtime.utils.schemaplans import SchemaPlans
 from linkml_runtime.utils.schemaview import SchemaView
 
-from linkml_runtime.utils.csvutils import GlobalConfig, get_configmap
-from json_flattener import flatten_to_csv
+from linkml_runtime.utils.csvutils import GlobalConfig, get_configmap, get_schemaview
+from json_flattener import Serializer
+
+
+@dataclass
+class _FieldPlan:
+    """ How to flatten one top level slot into columns """
+    name: str
+    serialized: List[Tuple[str, Serializer]] = field(default_factory=list)
+    flatten: bool = False
+    is_list: bool = False
+    delete: bool = False
+    mappings: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _ColumnPlan:
+    """
+    The column layout of a CSV file and how to get from an object to a row, worked out once from the schema rather
+    than from the data.  This follows json_flattener.flatten_to_csv.
+    """
+    header: List[str]
+    fields: List[_FieldPlan]
+    sep: str
+    inner_delimiter: str
+    list_markers: Tuple[str, str]
+
+    def __post_init__(self):
+        self.columns = set(self.header)
+
+    @classmethod
+    def build(cls, schemaview: SchemaView, index_slot: SlotDefinitionName, config: GlobalConfig) -> "_ColumnPlan":
+        slot = schemaview.get_slot(index_slot) if index_slot is not None else None
+        if slot is None or slot.range not in schemaview.all_classes():
+            raise ValueError(f'Index slot {index_slot} must have a class as its range')
+        header = []
+        fields = []
+        for sn in schemaview.class_slots(slot.range):
+            kconfig = config.key_configs.get(sn)
+            if kconfig is None:
+                header.append(sn)
+                continue
+            fplan = _FieldPlan(sn, flatten=kconfig.flatten, is_list=kconfig.is_list, delete=kconfig.delete,
+                               mappings=dict(kconfig.mappings) if kconfig.mappings else {})
+            if not fplan.delete:
+                header.append(sn)
+            for serializer in kconfig.serializers:
+                col = f'{sn}{config.sep}{serializer.name}'
+                fplan.serialized.append((col, serializer))
+                header.append(col)
+            if fplan.flatten:
+                header += fplan.mappings.values()
+            fields.append(fplan)
+        return cls(header, fields, config.sep, config.csv_inner_delimiter, config.csv_list_markers)
+
+    def flatten(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """ Flatten one (JSON) object into a dictionary of column values.  obj is updated in place """
+        for fplan in self.fields:
+            if fplan.name not in obj:
+                continue
+            v = obj[fplan.name]
+            for col, serializer in fplan.serialized:
+                if serializer == Serializer.yaml:
+                    obj[col] = yaml.dump(v)
+                elif serializer == Serializer.json:
+                    obj[col] = json.dumps(v)
+                elif serializer == Serializer.pickle:
+                    obj[col] = pickle.dumps(v)
+                elif serializer == Serializer.as_str:
+                    obj[col] = str(v)
+                else:
+                    raise ValueError(f'unknown serializer: {serializer}')
+            if fplan.flatten and not fplan.is_list:
+                if not isinstance(v, dict):
+                    raise ValueError(f'Value of {fplan.name} = {v}, which is not a dict')
+                for k, inner_v in v.items():
+                    obj[fplan.mappings.get(k) or f'{fplan.name}{self.sep}{k}'] = inner_v
+            elif fplan.flatten:
+                inner_keys = {}
+                for inner_obj in v:
+                    inner_keys.update(dict.fromkeys(inner_obj))
+                for k in inner_keys:
+                    obj[fplan.mappings.get(k) or f'{fplan.name}{self.sep}{k}'] = [o.get(k) for o in v]
+            if fplan.delete:
+                del obj[fplan.name]
+        return obj
+
+    def row(self, obj: Dict[str, Any]) -> List[str]:
+        """ Return the column values for obj in header order """
+        flat = self.flatten(obj)
+        if not flat.keys() <= self.columns:
+            extras = [k for k in flat if k not in self.columns]
+            raise ValueError(f'Object has columns that are not in the schema: {", ".join(extras)}')
+        lo, lc = self.list_markers
+        row = []
+        for col in self.header:
+            v = flat.get(col)
+            if isinstance(v, list):
+                row.append(f'{lo}{self.inner_delimiter.join(self._as_str(x) for x in v)}{lc}')
+            else:
+                row.append(self._as_str(v))
+        return row
+
+    def _as_str(self, x: Optional[Any]) -> str:
+        return '' if x is None else str(x).replace(self.inner_delimiter, f'\\{self.inner_delimiter}')
+
+
+class _ColumnPlans(SchemaPlans):
+    """ Column plans for one schema view.  Kept by the dumper -- see CSVDumper._column_plan """
+    def __init__(self, schemaview: SchemaView):
+        super().__init__(schemaview)
+        self.columns: Dict[Tuple, _ColumnPlan] = {}
 
 
 class CSVDumper(Dumper):
+    # Column plans for the schemaview most recently dumped with
+    _plans: Optional[_ColumnPlans] = None
 
-    def dumps(self, element: YAMLRoot,
+    def dump(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], to_file: str, **kwargs) -> None:
+        """
+        Write element as CSV to to_file
+        :param element: container object or iterable of row objects
+        :param to_file: file to write to
+        :param kwargs: additional arguments for dump_stream
+        """
+        with open(to_file, 'w', newline='') as output_file:
+            self.dump_stream(element, output_file, **kwargs)
+
+    def dumps(self, element: Union[YAMLRoot, Iterable[YAMLRoot]],
               index_slot: SlotDefinitionName = None,
               schema: SchemaDefinition = None,
               schemaview: SchemaView = None,
               **kwargs) -> str:
         """ Return element formatted as CSV lines """
-        json_dumper = JSONDumper()
-        element_j = json.loads(json_dumper.dumps(element))
-        objs = element_j[index_slot]
-        if schemaview is None:
-            schemaview = SchemaView(schema)
-        configmap = get_configmap(schemaview, index_slot)
-        config = GlobalConfig(key_configs=configmap)
         output = io.StringIO()
-        flatten_to_csv(objs, output, config=config, **kwargs)
+        self.dump_stream(element, output, index_slot=index_slot, schema=schema, schemaview=schemaview, **kwargs)
         return output.getvalue()
+
+    def dump_stream(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], stream: TextIO,
+                    index_slot: SlotDefinitionName = None,
+                    schema: SchemaDefinition = None,
+                    schemaview: SchemaView = None,
+                    **kwargs) -> None:
+        """
+        Write element as CSV to an open stream
+
+        The columns are laid out from the schema before any rows are seen, so each row is flattened and written as
+        it is reached and rows can come from a generator.
+
+        :param element: container object whose index_slot holds the rows, or an iterable of row objects
+        :param stream: stream to write to
+        :param index_slot: slot in the container that holds the rows.  Determines the row class
+        :param schema: schema describing the rows
+        :param schemaview: alternative to schema
+        :param kwargs: GlobalConfig settings (e.g. csv_delimiter)
+        """
+        if schemaview is None:
+            schemaview = get_schemaview(schema)
+        config = GlobalConfig(**kwargs)
+        plan = self._column_plan(schemaview, index_slot, config)
+        w = csv.writer(stream, delimiter=config.csv_delimiter, quoting=csv.QUOTE_NONE, escapechar='\\',
+                       lineterminator='\n')
+        w.writerow(plan.header)
+        for obj in self.index_slot_rows(element, index_slot):
+            w.writerow(plan.row(obj))
+
+    def _column_plan(self, schemaview: SchemaView, index_slot: SlotDefinitionName,
+                     config: GlobalConfig) -> _ColumnPlan:
+        """ Return the column plan for index_slot, building new plans if schemaview or its namespaces have changed """
+        plans = self._plans
+        if plans is None or not plans.is_current(schemaview):
+            plans = self._plans = _ColumnPlans(schemaview)
+        key = (index_slot, config.sep, config.csv_inner_delimiter, tuple(config.csv_list_markers))
+        plan = plans.columns.get(key)
+        if plan is None:
+            column_config = GlobalConfig(key_configs=get_configmap(schemaview, index_slot, config.sep),
+                                         sep=config.sep, csv_inner_delimiter=config.csv_inner_delimiter,
+                                         csv_list_markers=tuple(config.csv_list_markers))
+            plan = plans.columns[key] = _ColumnPlan.build(schemaview, index_slot, column_config)
+        return plan
@@ -1,4 +1,10 @@
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from functools import partial
+from typing import Optional, Union, Iterable, Iterator, Dict, Any
+
+from jsonasobj2 import JsonObj
 
 from linkml_runtime.utils.yamlutils import YAMLRoot
 
@@ -11,7 +17,7 @@ class Dumper(ABC):
         Write element to to_file
         :param element: LinkML object to be dumped
         :param to_file: file to dump to
-        :@param _: method specific arguments
+        :param _: method specific arguments
         """
         with open(to_file, 'w') as output_file:
             output_file.write(self.dumps(element, **_))
@@ -25,3 +31,45 @@ class Dumper(ABC):
         @return: stringified representation of element
         """
         raise NotImplementedError()
+
+    @staticmethod
+    def index_slot_rows(element: Union[YAMLRoot, Iterable[Union[YAMLRoot, dict]]],
+                        index_slot: str) -> Iterator[Dict[str, Any]]:
+        """
+        Generate the rows for a tabular dump as JSON style dictionaries
+
+        :param element: container object whose index_slot holds the rows, or an iterable of row objects
+        :param index_slot: slot in the container that holds the rows
+        :return: rows, converted one at a time
+        """
+        from linkml_runtime.dumpers.json_dumper import JSONDumper
+
+        if isinstance(element, YAMLRoot):
+            element = element[index_slot] or []
+        if isinstance(element, JsonObj) and not isinstance(element, YAMLRoot):
+            element = [v for _, v in element._items()]
+        elif isinstance(element, dict):
+            element = element.values()
+        json_dumper = JSONDumper()
+        for obj in element:
+            yield obj if isinstance(obj, dict) else json_dumper.to_dict(obj)
+
+    async def adump(self, element: YAMLRoot, to_file: str, *, executor: Optional[Executor] = None, **_) -> None:
+        """
+        Asynchronous form of dump
+
+        The element is rendered in executor and the result is written to to_file on a worker thread, so neither step
+        blocks the event loop.
+        :param element: LinkML object to be dumped
+        :param to_file: file to dump to
+        :param executor: executor for the rendering step.  None means the loop's default executor
+        :param _: method specific arguments
+        """
+        loop = asyncio.get_running_loop()
+        txt = await loop.run_in_executor(executor, partial(self.dumps, element, **_))
+        await loop.run_in_executor(None, _write_file, to_file, txt)
+
+
+def _write_file(to_file: str, txt: Union[str, bytes]) -> None:
+    with open(to_file, 'wb' if isinstance(txt, bytes) else 'w') as output_file:
+        output_file.write(txt)
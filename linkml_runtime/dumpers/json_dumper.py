@@ -1,19 +1,20 @@
+import io
 import json
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Union, TextIO, BinaryIO, Any, List, Tuple
 
 from deprecated.classic import deprecated
 
 from linkml_runtime.dumpers.dumper_root import Dumper
 from linkml_runtime.utils import formatutils
-from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE
+from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE, merge_contexts
 from linkml_runtime.utils.formatutils import remove_empty_items
 from linkml_runtime.utils.yamlutils import YAMLRoot, as_json_object
-from jsonasobj2 import JsonObj
+from jsonasobj2 import JsonObj, is_list, items
 
 class JSONDumper(Dumper):
 
-    def dump(self, element: YAMLRoot, to_file: str, contexts: CONTEXTS_PARAM_TYPE = None) -> None:
+    def dump(self, element: YAMLRoot, to_file: str, contexts: CONTEXTS_PARAM_TYPE = None, **kwargs) -> None:
         """
         Write element as json to to_file
         :param element: LinkML object to be serialized as YAML
@@ -25,8 +26,10 @@ class JSONDumper(Dumper):
             * dict
             * JSON Object
             * A list containing elements of any type named above
+        :param kwargs: additional arguments for dump_stream
         """
-        super().dump(element, to_file, contexts=contexts)
+        with open(to_file, 'w') as output_file:
+            self.dump_stream(element, output_file, contexts=contexts, **kwargs)
 
     def dumps(self, element: YAMLRoot, contexts: CONTEXTS_PARAM_TYPE = None, inject_type=True) -> str:
         """
@@ -42,18 +45,50 @@ class JSONDumper(Dumper):
         :param inject_type: if True (default), add a @type at the top level
         :return: JSON Object representing the element
         """
+        return ''.join(self._encoder(root=element, extras=_top_level_extras(element, contexts, inject_type))
+                       .iterencode(element))
+
+    def dump_stream(self, element: YAMLRoot, stream: Union[TextIO, BinaryIO], contexts: CONTEXTS_PARAM_TYPE = None,
+                    inject_type=True, compact: bool = False) -> None:
+        """
+        Write element as JSON or JSON-LD to an open stream
+
+        The output is written in chunks as the object tree is walked, so the complete JSON image is never held in
+        memory.
+        :param element: LinkML object to be emitted
+        :param stream: text or binary stream to write to.  Binary streams are written in UTF-8
+        :param contexts: JSON-LD context(s) -- see dumps
+        :param inject_type: if True (default), add a @type at the top level
+        :param compact: if True, emit without indentation or whitespace
+        """
+        binary = not isinstance(stream, io.TextIOBase)
+        encoder = self._encoder(compact, root=element, extras=_top_level_extras(element, contexts, inject_type))
+        for chunk in encoder.iterencode(element):
+            stream.write(chunk.encode() if binary else chunk)
+
+    @staticmethod
+    def _encoder(compact: bool = False, root: Any = None, extras: List[Tuple[str, Any]] = None) -> json.JSONEncoder:
+        """
+        Return an encoder that converts YAMLRoot objects to JSON one level at a time as it reaches them
+
+        The conversion follows formatutils.remove_empty_items(obj, hide_protected_keys=True), but, rather than
+        building a copy of the whole tree before encoding it, each object contributes a shallow dictionary whose
+        children are in turn handed back to the encoder.
+        :param compact: if True, emit without indentation or whitespace
+        :param root: the object being encoded
+        :param extras: (key, value) entries -- @type and @context -- that are emitted after the entries of root
+        """
         def default(o):
-            if isinstance(o, YAMLRoot):
-                return remove_empty_items(o, hide_protected_keys=True)
+            if isinstance(o, JsonObj):
+                if is_list(o):
+                    return _clean_list(o._hide_list())
+                return _clean_object(o, extras) if o is root and extras else _clean_object(o)
             elif isinstance(o, Decimal):
-                # https://stackoverflow.com/questions/1960516/python-json-serialize-a-decimal-object
-                return str(o)
+                return remove_empty_items(o)
             else:
                 return json.JSONDecoder().decode(o)
-        return json.dumps(as_json_object(element, contexts, inject_type=inject_type),
-                          default=default,
-                          indent='  ')
-
+        return json.JSONEncoder(default=default, indent=None if compact else '  ',
+                                separators=(',', ':') if compact else None)
 
     @staticmethod
     @deprecated("Use `utils/formatutils/remove_empty_items` instead")
@@ -82,9 +117,10 @@ class JSONDumper(Dumper):
         """
         return as_json_object(element, contexts, inject_type=inject_type)
 
-    def to_dict(self, element: YAMLRoot, **kwargs) -> JsonObj:
+    def to_dict(self, element: YAMLRoot, contexts: CONTEXTS_PARAM_TYPE = None, inject_type=False) -> Dict[str, Any]:
         """
-        As dumps(), except returns a JsonObj, not a string
+        As dumps(), except returns a simple python dictionary, not a string.  The dictionary is built directly from
+        element rather than by parsing the dumps() output, but holds the same (JSON compatible) values
 
         :param element: LinkML object to be emitted
         :param contexts: JSON-LD context(s) in the form of:
@@ -94,7 +130,102 @@ class JSONDumper(Dumper):
             * dict
             * JSON Object
             * A list containing elements of any type named above
-        :param inject_type: if True (default), add a @type at the top level
-        :return: JSON Object representing the element
+        :param inject_type: if True, add a @type at the top level.  Default: False
+        :return: dictionary representing the element
         """
-        return json.loads(self.dumps(element, inject_type=False, **kwargs))
\ No newline at end of file
+        return _as_plain(as_json_object(element, contexts, inject_type=inject_type))
+
+def _is_vacuous(v: Any) -> bool:
+    """ True if v is empty once remove_empty_items has been applied to it.  Stops at the first non-empty leaf """
+    if v is None:
+        return True
+    if isinstance(v, (list, dict, JsonObj)):
+        if is_list(v):
+            return all(e == '_root' or _is_vacuous(e) for e in (v._hide_list() if isinstance(v, JsonObj) else v))
+        return all(_is_vacuous(e) for _, e in items(v))
+    return False
+
+
+def _top_level_extras(element: YAMLRoot, contexts: CONTEXTS_PARAM_TYPE, inject_type: bool) -> List[Tuple[str, Any]]:
+    """ The entries that as_json_object adds to element, without taking a copy of element to add them to """
+    extras = []
+    if inject_type:
+        extras.append(('@type', element.__class__.__name__))
+    context_element = merge_contexts(contexts)
+    if context_element:
+        extras.append(('@context', context_element['@context']))
+    return extras
+
+
+def _clean_object(obj: Union[dict, JsonObj], extras: List[Tuple[str, Any]] = ()) -> Any:
+    """
+    One level of remove_empty_items for a dictionary like object that is known not to be vacuous.  extras are
+    entries that override or follow those of obj
+    """
+    if extras:
+        merged = dict(items(obj))
+        merged.update(extras)
+        entries = [(k, v) for k, v in merged.items() if not _is_vacuous(v)]
+    else:
+        entries = [(k, v) for k, v in items(obj) if not _is_vacuous(v)]
+    if len(entries) == 1 and str(entries[0][0]).startswith('_'):
+        # Enumeration codes and protected wrappers are small -- hand them to remove_empty_items whole
+        return remove_empty_items(obj, hide_protected_keys=True)
+    return {k: _clean_value(v) for k, v in entries}
+
+
+def _clean_list(obj: List) -> List:
+    return [_clean_value(e) for e in obj if e != '_root' and not _is_vacuous(e)]
+
+
+def _clean_value(v: Any) -> Any:
+    """ Clean the plain containers in v, leaving JsonObj and Decimal values for the encoder to pass back to us """
+    if isinstance(v, list):
+        return _clean_list(v)
+    elif isinstance(v, dict):
+        return _clean_object(v)
+    return v
+
+
+def _as_plain(o: Any) -> Any:
+    """
+    The result of encoding o as JSON and parsing it back -- remove_empty_items(o, hide_protected_keys=True) with the
+    values reduced to the basic JSON types -- computed in a single walk.  o is assumed not to be vacuous
+    """
+    if isinstance(o, (dict, JsonObj)):
+        if is_list(o):
+            return _as_plain(o._hide_list())
+        entries = [(k, v) for k, v in items(o) if not _is_vacuous(v)]
+        if len(entries) == 1 and str(entries[0][0]).startswith('_'):
+            return _as_json_types(remove_empty_items(o, hide_protected_keys=True))
+        return {_as_json_key(k): _as_plain(v) for k, v in entries}
+    elif isinstance(o, list):
+        return [_as_plain(e) for e in o if e != '_root' and not _is_vacuous(e)]
+    elif isinstance(o, Decimal):
+        return remove_empty_items(o)
+    return _as_json_types(o)
+
+
+def _as_json_types(o: Any) -> Any:
+    """ Reduce the values in o, which has already been cleaned, to the types that json.loads produces """
+    if isinstance(o, str):
+        return str.__str__(o)
+    elif o is None or isinstance(o, bool):
+        return o
+    elif isinstance(o, int):
+        return int(o)
+    elif isinstance(o, float):
+        return float(o)
+    elif isinstance(o, (dict, JsonObj)) and not is_list(o):
+        return {_as_json_key(k): _as_json_types(v) for k, v in items(o)}
+    elif isinstance(o, (list, tuple, JsonObj)):
+        return [_as_plain(e) if isinstance(e, JsonObj) else _as_json_types(e)
+                for e in (o._hide_list() if isinstance(o, JsonObj) else o)]
+    elif isinstance(o, Decimal):
+        return remove_empty_items(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def _as_json_key(k: Any) -> str:
+    """ The string that json uses for dictionary key k """
+    return str.__str__(k) if isinstance(k, str) else json.dumps(k)
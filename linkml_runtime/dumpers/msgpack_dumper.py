@@ -0,0 +1,67 @@
+from typing import Iterable, BinaryIO
+
+from linkml_runtime.dumpers.dumper_root import Dumper
+from linkml_runtime.dumpers.json_dumper import JSONDumper
+from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE
+from linkml_runtime.utils.yamlutils import YAMLRoot
+
+
+def import_msgpack():
+    """ Return the msgpack module, with a useful message if it isn't installed """
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError('The msgpack package must be installed to read or write MessagePack data') from e
+    return msgpack
+
+
+class MessagePackDumper(Dumper):
+    """
+    Binary output in MessagePack format
+
+    The content is exactly what JSONDumper emits -- empty values are removed, enums are reduced to their codes and
+    Decimals become ints or floats -- in a more compact form that is much faster to parse.  Requires the msgpack
+    package.
+    """
+
+    def dump(self, element: YAMLRoot, to_file: str, contexts: CONTEXTS_PARAM_TYPE = None,
+             inject_type: bool = True, **kwargs) -> None:
+        """
+        Write element as MessagePack to to_file
+        :param element: LinkML object to be emitted
+        :param to_file: file to write to
+        :param contexts: JSON-LD context(s) -- see JSONDumper.dumps
+        :param inject_type: if True (default), add a @type at the top level
+        :param kwargs: other dumpers' arguments, which are accepted and ignored
+        """
+        with open(to_file, 'wb') as output_file:
+            output_file.write(self.dumps(element, contexts=contexts, inject_type=inject_type))
+
+    def dumps(self, element: YAMLRoot, contexts: CONTEXTS_PARAM_TYPE = None, inject_type: bool = True) -> bytes:
+        """
+        Return element as a MessagePack image
+        :param element: LinkML object to be emitted
+        :param contexts: JSON-LD context(s) -- see JSONDumper.dumps
+        :param inject_type: if True (default), add a @type at the top level
+        :return: MessagePack encoding of the JSON representation of element
+        """
+        msgpack = import_msgpack()
+        return msgpack.packb(JSONDumper().to_dict(element, contexts, inject_type=inject_type), use_bin_type=True)
+
+    def dump_stream(self, elements: Iterable[YAMLRoot], stream: BinaryIO, contexts: CONTEXTS_PARAM_TYPE = None,
+                    inject_type: bool = True) -> None:
+        """
+        Write a sequence of objects to an open binary stream, one MessagePack object after another
+
+        Each element is converted and written as it is reached, so elements can be a generator.  Read the result
+        with MessagePackLoader.load_iter.
+        :param elements: LinkML objects to be emitted
+        :param stream: binary stream to write to
+        :param contexts: JSON-LD context(s) -- see JSONDumper.dumps
+        :param inject_type: if True (default), add a @type to each object
+        """
+        msgpack = import_msgpack()
+        packer = msgpack.Packer(use_bin_type=True)
+        json_dumper = JSONDumper()
+        for element in elements:
+            stream.write(packer.pack(json_dumper.to_dict(element, contexts, inject_type=inject_type)))
@@ -0,0 +1,121 @@
+import io
+from typing import Union, Iterable, Iterator, List, Dict, Any, BinaryIO, Optional
+
+from linkml_runtime.dumpers.dumper_root import Dumper
+from linkml_runtime.linkml_model.meta import SlotDefinitionName, SchemaDefinition, ClassDefinitionName
+from linkml_runtime.utils.arrowutils import import_pyarrow, get_arrow_schema, arrow_row_converter
+from linkml_runtime.utils.csvutils import get_schemaview
+from linkml_runtime.utils.schemaplans import SchemaPlans
+from linkml_runtime.utils.schemaview import SchemaView
+from linkml_runtime.utils.yamlutils import YAMLRoot
+
+# Rows per Parquet row group (and per Arrow record batch)
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+
+class _ArrowPlans(SchemaPlans):
+    """ Arrow schemas for the classes of one schema view.  Kept by the dumper -- see ParquetDumper._arrow_schema """
+    def __init__(self, schemaview: SchemaView):
+        super().__init__(schemaview)
+        self.schemas: Dict[ClassDefinitionName, "pyarrow.Schema"] = {}
+
+
+class ParquetDumper(Dumper):
+    """
+    Columnar output of the rows in a container's index slot as Apache Arrow tables or Parquet files
+
+    The Arrow schema is derived from the induced slots of the index slot's range -- see arrowutils.get_arrow_schema.
+    Requires the pyarrow package.
+    """
+    # Arrow schemas for the schemaview most recently dumped with
+    _plans: Optional[_ArrowPlans] = None
+
+    def dump(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], to_file: Union[str, BinaryIO],
+             index_slot: SlotDefinitionName = None,
+             schema: SchemaDefinition = None,
+             schemaview: SchemaView = None,
+             row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+             **kwargs) -> None:
+        """
+        Write element as a Parquet file
+
+        Rows are converted and written one row group at a time, so element can be a generator of row objects.
+
+        :param element: container object whose index_slot holds the rows, or an iterable of row objects
+        :param to_file: file name or binary stream to write to
+        :param index_slot: slot in the container that holds the rows.  Determines the row class
+        :param schema: schema describing the rows
+        :param schemaview: alternative to schema
+        :param row_group_size: number of rows per row group
+        :param kwargs: additional arguments for pyarrow.parquet.ParquetWriter (e.g. compression)
+        """
+        pa = import_pyarrow()
+        arrow_schema = self._arrow_schema(index_slot, schema, schemaview)
+        with pa.parquet.ParquetWriter(to_file, arrow_schema, **kwargs) as writer:
+            for batch in self._batches(element, index_slot, arrow_schema, row_group_size):
+                writer.write_table(pa.Table.from_batches([batch]), row_group_size=row_group_size)
+
+    def dumps(self, element: Union[YAMLRoot, Iterable[YAMLRoot]],
+              index_slot: SlotDefinitionName = None,
+              schema: SchemaDefinition = None,
+              schemaview: SchemaView = None,
+              row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+              **kwargs) -> bytes:
+        """
+        Return element as a Parquet image.  See dump for the arguments
+
+        :return: Parquet file contents
+        """
+        output = io.BytesIO()
+        self.dump(element, output, index_slot=index_slot, schema=schema, schemaview=schemaview,
+                  row_group_size=row_group_size, **kwargs)
+        return output.getvalue()
+
+    def to_table(self, element: Union[YAMLRoot, Iterable[YAMLRoot]],
+                 index_slot: SlotDefinitionName = None,
+                 schema: SchemaDefinition = None,
+                 schemaview: SchemaView = None,
+                 batch_size: int = DEFAULT_ROW_GROUP_SIZE) -> "pyarrow.Table":
+        """
+        Return element as an Arrow table
+
+        :param element: container object whose index_slot holds the rows, or an iterable of row objects
+        :param index_slot: slot in the container that holds the rows.  Determines the row class
+        :param schema: schema describing the rows
+        :param schemaview: alternative to schema
+        :param batch_size: number of rows per record batch
+        :return: table with one row per object
+        """
+        pa = import_pyarrow()
+        arrow_schema = self._arrow_schema(index_slot, schema, schemaview)
+        return pa.Table.from_batches(list(self._batches(element, index_slot, arrow_schema, batch_size)),
+                                     schema=arrow_schema)
+
+    def _batches(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], index_slot: SlotDefinitionName,
+                 arrow_schema: "pyarrow.Schema", batch_size: int) -> Iterator["pyarrow.RecordBatch"]:
+        pa = import_pyarrow()
+        convert = arrow_row_converter(arrow_schema)
+        rows: List[Dict[str, Any]] = []
+        for obj in self.index_slot_rows(element, index_slot):
+            rows.append(convert(obj))
+            if len(rows) >= batch_size:
+                yield pa.RecordBatch.from_pylist(rows, schema=arrow_schema)
+                rows = []
+        if rows:
+            yield pa.RecordBatch.from_pylist(rows, schema=arrow_schema)
+
+    def _arrow_schema(self, index_slot: SlotDefinitionName, schema: SchemaDefinition,
+                      schemaview: SchemaView) -> "pyarrow.Schema":
+        """ Return the Arrow schema for the rows, building new plans if schemaview or its namespaces have changed """
+        if schemaview is None:
+            schemaview = get_schemaview(schema)
+        slot = schemaview.get_slot(index_slot) if index_slot is not None else None
+        if slot is None or slot.range not in schemaview.all_classes():
+            raise ValueError(f'Index slot {index_slot} must have a class as its range')
+        plans = self._plans
+        if plans is None or not plans.is_current(schemaview):
+            plans = self._plans = _ArrowPlans(schemaview)
+        arrow_schema = plans.schemas.get(slot.range)
+        if arrow_schema is None:
+            arrow_schema = plans.schemas[slot.range] = get_arrow_schema(schemaview, slot.range)
+        return arrow_schema
@@ -1,15 +1,15 @@
-import json
 from typing import Optional
 
-from hbreader import hbread
 from pyld.jsonld import expand
 from rdflib import Graph
 from rdflib_pyld_compat import rdflib_graph_from_pyld_jsonld
 
 
 from linkml_runtime.dumpers.dumper_root import Dumper
-from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE, CONTEXT_TYPE
+from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE, CONTEXT_TYPE, load_context
 from linkml_runtime.utils.formatutils import remove_empty_items
+from linkml_runtime.utils.jsonld_context import UnsupportedJSONLD, json_to_rdf, compile_contexts
+from linkml_runtime.utils.url_cache import pyld_document_loader
 from linkml_runtime.utils.yamlutils import YAMLRoot
 
 
@@ -17,6 +17,9 @@ class RDFDumper(Dumper):
     def as_rdf_graph(self, element: YAMLRoot, contexts: CONTEXTS_PARAM_TYPE, namespaces: CONTEXT_TYPE = None) -> Graph:
         """
         Convert element into an RDF graph guided by the context(s) in contexts
+
+        The contexts are compiled and the triples generated straight from the JSON image of element.  pyld
+        expansion is only used if the contexts or element need a JSON-LD feature that the compiler doesn't cover
         :param element: element to represent in RDF
         :param contexts: JSON-LD context(s) in the form of:
             * file name
@@ -32,16 +35,22 @@ class RDFDumper(Dumper):
         if contexts is None:
             raise Exception(f'Must pass in JSON-LD context via contexts parameter')
         if isinstance(contexts, list):
-            inp_contexts = [json.loads(hbread(c)) for c in contexts]
+            inp_contexts = [load_context(c) for c in contexts]
         else:
-            inp_contexts = json.loads(hbread(contexts))
+            inp_contexts = load_context(contexts)
 
         from linkml_runtime.dumpers import json_dumper
-        rdf_jsonld = expand(json_dumper.dumps(element), options=dict(expandContext=inp_contexts))
-        g = rdflib_graph_from_pyld_jsonld(rdf_jsonld)
+        try:
+            # rdflib_graph_from_pyld_jsonld reduces every literal to its lexical form, so we do the same
+            g = json_to_rdf(json_dumper.to_dict(element, inject_type=True), compile_contexts(contexts),
+                            typed_literals=False)
+        except UnsupportedJSONLD:
+            rdf_jsonld = expand(json_dumper.dumps(element),
+                                options=dict(expandContext=inp_contexts, documentLoader=pyld_document_loader))
+            g = rdflib_graph_from_pyld_jsonld(rdf_jsonld)
 
         if namespaces is not None:
-            ns_source = json.loads(hbread(namespaces))
+            ns_source = load_context(namespaces)
         else:
             ns_source = inp_contexts
 
@@ -87,5 +96,5 @@ class RDFDumper(Dumper):
         :param fmt: rdf format
         :return: rdflib Graph containing element
         """
-        return self.as_rdf_graph(remove_empty_items(element, hide_protected_keys=True), contexts).\
+        return self.as_rdf_graph(remove_empty_items(element, hide_protected_keys=True, share_unchanged=True), contexts).\
             serialize(format=fmt).decode()
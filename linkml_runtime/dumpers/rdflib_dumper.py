@@ -1,6 +1,9 @@
 import logging
 from abc import abstractmethod
-from typing import Optional, Any, Dict
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import StringIO
+from typing import Optional, Any, Dict, Union, Iterable, TextIO, Tuple
 
 from rdflib import Graph, URIRef
 from rdflib.term import Node, BNode, Literal
@@ -8,9 +11,156 @@ from rdflib.namespace import RDF
 
 
 from linkml_runtime.dumpers.dumper_root import Dumper
+from linkml_runtime.utils.schemaplans import SchemaPlans
 from linkml_runtime.utils.schemaview import SchemaView, ElementName, PermissibleValue, PermissibleValueText
+from linkml_runtime.utils.term_interner import TermInterner
 from linkml_runtime.utils.yamlutils import YAMLRoot
 
+# Formats that dump writes a triple at a time rather than through an rdflib Graph
+STREAMING_FORMATS = {'nt', 'ntriples', 'nt11', 'nquads'}
+
+# Number of recently written triples that NTriplesWriter remembers to suppress duplicates
+DEFAULT_DEDUP_WINDOW = 64 * 1024
+
+
+class NTriplesWriter:
+    """
+    Graph stand-in that writes each triple added to it straight to a stream as an N-Triples (or, with a graph name,
+    N-Quads) line
+
+    Nothing but the dedup window is held in memory, so the output can be larger than RAM.  A triple that is added
+    again within dedup_window triples of its previous appearance is dropped.  Duplicates further apart are written
+    again, which doesn't change the meaning of the output
+    """
+    def __init__(self, stream: TextIO, graph_name: Optional[str] = None, dedup_window: int = DEFAULT_DEDUP_WINDOW):
+        """
+        :param stream: text stream to write to
+        :param graph_name: IRI of the graph to write N-Quads for.  None means N-Triples
+        :param dedup_window: number of recent triples to check for duplicates.  0 turns checking off
+        """
+        self.stream = stream
+        self.graph_suffix = f' {URIRef(graph_name).n3()} .\n' if graph_name else ' .\n'
+        self.dedup_window = dedup_window
+        self._recent: OrderedDict = OrderedDict()
+        self.n_triples = 0
+
+    def add(self, triple: Tuple[Node, Node, Node]) -> None:
+        if self.dedup_window:
+            if triple in self._recent:
+                self._recent.move_to_end(triple)
+                return
+            self._recent[triple] = None
+            if len(self._recent) > self.dedup_window:
+                self._recent.popitem(last=False)
+        s, p, o = triple
+        self.stream.write(f'{s.n3()} {p.n3()} {_nt_term(o)}{self.graph_suffix}')
+        self.n_triples += 1
+
+
+def _nt_term(node: Node) -> str:
+    """ N-Triples representation of node """
+    if not isinstance(node, Literal):
+        return node.n3()
+    lexical = '"' + node.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"').replace('\r', '\\r') + '"'
+    if node.language:
+        return f'{lexical}@{node.language}'
+    if node.datatype:
+        return f'{lexical}^^<{node.datatype}>'
+    return lexical
+
+
+@dataclass
+class _SlotEmitPlan:
+    """ How the values of one attribute of one class are emitted """
+    mapped: bool                    # False if the attribute isn't in the schema's slot name map
+    predicate: Optional[URIRef]     # None for identifier slots, which aren't emitted
+    range: Optional[ElementName]
+    designates_type: bool
+
+
+class _ClassEmitPlan:
+    """ The parts of the schema inject_triples needs for instances of one class.  Slot plans are built on first use """
+    def __init__(self, plans: "_EmitPlans", class_name: ElementName):
+        schemaview = plans.schemaview
+        self.plans = plans
+        self.class_name = class_name
+        id_slot = schemaview.get_identifier_slot(class_name)
+        self.id_slot_name = id_slot.name if id_slot is not None else None
+        self.type_uri = URIRef(schemaview.get_uri(class_name, expand=True))
+        self.slots: Dict[str, _SlotEmitPlan] = {}
+
+    def slot_plan(self, attr_name: str) -> _SlotEmitPlan:
+        plan = self.slots.get(attr_name)
+        if plan is None:
+            schemaview = self.plans.schemaview
+            slot_name_map = self.plans.slot_name_map
+            mapped = attr_name in slot_name_map
+            slot = schemaview.induced_slot(slot_name_map[attr_name].name if mapped else attr_name, self.class_name)
+            plan = _SlotEmitPlan(mapped=mapped,
+                                 predicate=None if slot.identifier else URIRef(schemaview.get_uri(slot, expand=True)),
+                                 range=slot.range,
+                                 designates_type=bool(slot.designates_type))
+            self.slots[attr_name] = plan
+        return plan
+
+
+class _EmitPlans(SchemaPlans):
+    """
+    Everything inject_triples needs from a schema, with the rdflib nodes it emits for schema elements built once
+    rather than for every value.  Kept by the dumper -- see RDFLibDumper._emit_plans
+    """
+    def __init__(self, schemaview: SchemaView):
+        super().__init__(schemaview)
+        self.enums = schemaview.all_enums()
+        self.types = schemaview.all_types()
+        self.slot_name_map = schemaview.slot_name_mappings()
+        self.classes: Dict[ElementName, _ClassEmitPlan] = {}
+        self.enum_text_nodes: Dict[Tuple[ElementName, str], Node] = {}
+        self.meaning_nodes: Dict[str, URIRef] = {}
+        self.datatypes: Dict[ElementName, Tuple[Optional[str], Optional[URIRef]]] = {}
+
+    def class_plan(self, class_name: ElementName) -> _ClassEmitPlan:
+        plan = self.classes.get(class_name)
+        if plan is None:
+            plan = self.classes[class_name] = _ClassEmitPlan(self, class_name)
+        return plan
+
+    def enum_node(self, enum_name: ElementName, element: Any, terms: TermInterner) -> Node:
+        """ Node for a permissible value: its meaning if it has one, otherwise its text as a Literal """
+        if isinstance(element, PermissibleValueText):
+            key = (enum_name, element)
+            node = self.enum_text_nodes.get(key)
+            if node is None:
+                pv = self.schemaview.get_enum(enum_name).permissible_values[element]
+                node = self.enum_text_nodes[key] = self._pv_node(pv, terms)
+            return node
+        return self._pv_node(element.code, terms)
+
+    def _pv_node(self, pv: PermissibleValue, terms: TermInterner) -> Node:
+        if pv.meaning is None:
+            return terms.literal(pv.text)
+        node = self.meaning_nodes.get(pv.meaning)
+        if node is None:
+            node = self.meaning_nodes[pv.meaning] = URIRef(self.schemaview.expand_curie(pv.meaning))
+        return node
+
+    def type_node(self, type_name: ElementName, element: Any, terms: TermInterner) -> Node:
+        """ Node for a value of a type """
+        try:
+            dt_uri, datatype = self.datatypes[type_name]
+        except KeyError:
+            dt_uri = self.schemaview.get_type(type_name).uri
+            datatype = self.namespaces.uri_for(dt_uri) \
+                if dt_uri and dt_uri not in ('rdfs:Resource', 'xsd:string') else None
+            self.datatypes[type_name] = dt_uri, datatype
+        if datatype is not None:
+            return terms.literal(element, datatype=datatype)
+        if dt_uri == 'rdfs:Resource':
+            return terms.uri(self.schemaview.expand_curie(element))
+        if not dt_uri:
+            logging.warning(f'No datatype specified for : {type_name}, using plain Literal')
+        return terms.literal(element)
+
 
 class RDFLibDumper(Dumper):
     """
@@ -21,6 +171,9 @@ class RDFLibDumper(Dumper):
     This requires a SchemaView object
 
     """
+    # Plans for the schemaview most recently dumped with
+    _plans: Optional[_EmitPlans] = None
+
     def as_rdf_graph(self, element: YAMLRoot, schemaview: SchemaView, prefix_map: Dict[str, str] = None) -> Graph:
         """
         Dumps from element to an rdflib Graph,
@@ -33,60 +186,57 @@ class RDFLibDumper(Dumper):
         """
         g = Graph()
         logging.debug(f'PREFIXMAP={prefix_map}')
-        if prefix_map:
-            for k, v in prefix_map.items():
-                schemaview.namespaces()[k] = v
-                g.namespace_manager.bind(k, URIRef(v))
-        self.inject_triples(element, schemaview, g)
+        self._add_prefixes(schemaview, prefix_map, g)
+        self.inject_triples(element, schemaview, g, terms=TermInterner())
         return g
 
-    def inject_triples(self, element: Any, schemaview: SchemaView, graph: Graph, target_type: ElementName = None) -> Node:
+    def inject_triples(self, element: Any, schemaview: SchemaView, graph: Union[Graph, NTriplesWriter],
+                       target_type: ElementName = None, terms: Optional[TermInterner] = None) -> Node:
         """
         Inject triples from conversion of element into a Graph
 
         :param element: element to represent in RDF
         :param schemaview:
-        :param graph:
+        :param graph: rdflib Graph, or anything else with an add(triple) method such as NTriplesWriter
         :param target_type:
+        :param terms: interner that the IRIs and literals of the triples are drawn from.  Pass the same one to
+        each call that adds to the same graph so that they share nodes
         :return: root node as rdflib URIRef, BNode, or Literal
         """
-        namespaces = schemaview.namespaces()
-        slot_name_map = schemaview.slot_name_mappings()
+        return self._inject_triples(element, self._emit_plans(schemaview), graph, target_type, terms or TermInterner())
+
+    @staticmethod
+    def _add_prefixes(schemaview: SchemaView, prefix_map: Optional[Dict[str, str]],
+                      graph: Optional[Graph] = None) -> None:
+        """ Add prefix_map to the namespaces that identifiers are expanded with, and bind its prefixes in graph """
+        if prefix_map:
+            for k, v in prefix_map.items():
+                schemaview.namespaces()[k] = v
+                if graph is not None:
+                    graph.namespace_manager.bind(k, URIRef(v))
+
+    def _emit_plans(self, schemaview: SchemaView) -> _EmitPlans:
+        """ Return the emit plans for schemaview, building new ones if it or its namespaces have changed """
+        plans = self._plans
+        if plans is None or not plans.is_current(schemaview):
+            plans = self._plans = _EmitPlans(schemaview)
+        return plans
+
+    def _inject_triples(self, element: Any, plans: "_EmitPlans", graph: Union[Graph, NTriplesWriter],
+                        target_type: Optional[ElementName], terms: TermInterner) -> Node:
         logging.debug(f'CONVERT: {element} // {type(element)} // {target_type}')
-        if target_type in schemaview.all_enums():
-            if isinstance(element, PermissibleValueText):
-                e = schemaview.get_enum(target_type)
-                element = e.permissible_values[element]
-            else:
-                element = element.code
-            element: PermissibleValue
-            if element.meaning is not None:
-                return URIRef(schemaview.expand_curie(element.meaning))
-            else:
-                return Literal(element.text)
-        if target_type in schemaview.all_types():
-            t = schemaview.get_type(target_type)
-            dt_uri = t.uri
-            if dt_uri:
-                if dt_uri == 'rdfs:Resource':
-                    return URIRef(schemaview.expand_curie(element))
-                elif dt_uri == 'xsd:string':
-                    return Literal(element)
-                else:
-                    return Literal(element, datatype=namespaces.uri_for(dt_uri))
-            else:
-                logging.warning(f'No datatype specified for : {t.name}, using plain Literal')
-                return Literal(element)
+        if target_type in plans.enums:
+            return plans.enum_node(target_type, element, terms)
+        if target_type in plans.types:
+            return plans.type_node(target_type, element, terms)
         element_vars = {k: v for k, v in vars(element).items() if not k.startswith('_')}
         if len(element_vars) == 0:
-            return URIRef(schemaview.expand_curie(str(element)))
-        element_type = type(element)
-        cn = element_type.class_name
-        id_slot = schemaview.get_identifier_slot(cn)
-        if id_slot is not None:
-            element_id = getattr(element, id_slot.name)
-            logging.debug(f'ELEMENT_ID={element_id} // {id_slot.name}')
-            element_uri = namespaces.uri_for(element_id)
+            return terms.uri(plans.schemaview.expand_curie(str(element)))
+        class_plan = plans.class_plan(type(element).class_name)
+        if class_plan.id_slot_name is not None:
+            element_id = getattr(element, class_plan.id_slot_name)
+            logging.debug(f'ELEMENT_ID={element_id} // {class_plan.id_slot_name}')
+            element_uri = terms.uri(plans.namespaces.uri_for(element_id))
         else:
             element_uri = BNode()
         type_added = False
@@ -97,22 +247,21 @@ class RDFLibDumper(Dumper):
                 vs = v_or_list.values()
             else:
                 vs = [v_or_list]
+            slot_plan = None
             for v in vs:
                 if v is None:
                     continue
-                if k in slot_name_map:
-                    k = slot_name_map[k].name
-                else:
+                if slot_plan is None:
+                    slot_plan = class_plan.slot_plan(k)
+                if not slot_plan.mapped:
                     logging.error(f'Slot {k} not in name map')
-                slot = schemaview.induced_slot(k, cn)
-                if not slot.identifier:
-                    slot_uri = URIRef(schemaview.get_uri(slot, expand=True))
-                    v_node = self.inject_triples(v, schemaview, graph, slot.range)
-                    graph.add((element_uri, slot_uri, v_node))
-                    if slot.designates_type:
+                if slot_plan.predicate is not None:
+                    v_node = self._inject_triples(v, plans, graph, slot_plan.range, terms)
+                    graph.add((element_uri, slot_plan.predicate, v_node))
+                    if slot_plan.designates_type:
                         type_added = True
         if not type_added:
-            graph.add((element_uri, RDF.type, URIRef(schemaview.get_uri(cn, expand=True))))
+            graph.add((element_uri, RDF.type, class_plan.type_uri))
         return element_uri
 
     def dump(self, element: YAMLRoot,
@@ -129,7 +278,41 @@ class RDFLibDumper(Dumper):
         :param prefix_map:
         :return:
         """
-        super().dump(element, to_file, schemaview=schemaview, fmt=fmt, prefix_map=prefix_map)
+        if fmt in STREAMING_FORMATS:
+            with open(to_file, 'w', encoding='utf-8') as output_file:
+                self.dump_stream(element, output_file, schemaview, fmt=fmt, prefix_map=prefix_map, **args)
+        else:
+            super().dump(element, to_file, schemaview=schemaview, fmt=fmt, prefix_map=prefix_map)
+
+    def dump_stream(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], stream: TextIO, schemaview: SchemaView,
+                    fmt: str = 'nt', prefix_map: Dict[str, str] = None, graph_name: Optional[str] = None,
+                    dedup_window: int = DEFAULT_DEDUP_WINDOW) -> int:
+        """
+        Write element to stream as N-Triples or N-Quads without building an rdflib Graph
+
+        Triples are produced by inject_triples and written as they are generated, so memory use doesn't grow with
+        the size of the output.
+
+        :param element: element to represent in RDF, or an iterable (e.g. a generator) of elements
+        :param stream: text stream to write to
+        :param schemaview:
+        :param fmt: one of STREAMING_FORMATS
+        :param prefix_map: additional prefixes for the CURIEs in element.  The output itself has full IRIs
+        :param graph_name: graph IRI for N-Quads output.  None writes the quads to the default graph
+        :param dedup_window: see NTriplesWriter
+        :return: number of triples written
+        """
+        if fmt not in STREAMING_FORMATS:
+            raise ValueError(f'{fmt} is not a line based format: use one of {sorted(STREAMING_FORMATS)}')
+        if graph_name is not None and fmt != 'nquads':
+            raise ValueError('A graph_name can only be given for nquads output')
+        self._add_prefixes(schemaview, prefix_map)
+        writer = NTriplesWriter(stream, graph_name=graph_name, dedup_window=dedup_window)
+        terms = TermInterner()
+        plans = self._emit_plans(schemaview)
+        for e in [element] if isinstance(element, YAMLRoot) else element:
+            self._inject_triples(e, plans, writer, None, terms)
+        return writer.n_triples
 
     def dumps(self, element: YAMLRoot, schemaview: SchemaView = None,
               fmt: Optional[str] = 'turtle', prefix_map: Dict[str, str] = None) -> str:
@@ -140,8 +323,13 @@ class RDFLibDumper(Dumper):
         :param schemaview:
         :param fmt:
         :param prefix_map:
-        :return: serialization of rdflib Graph containing element
+        :return: serialization of rdflib Graph containing element.  Line based formats (STREAMING_FORMATS) are
+        written by dump_stream, as dump writes them
         """
+        if fmt in STREAMING_FORMATS:
+            output = StringIO()
+            self.dump_stream(element, output, schemaview, fmt=fmt, prefix_map=prefix_map)
+            return output.getvalue()
         return self.as_rdf_graph(element, schemaview, prefix_map=prefix_map).\
             serialize(format=fmt).decode()
 
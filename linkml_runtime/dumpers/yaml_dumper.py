@@ -1,4 +1,5 @@
 from decimal import Decimal
+from typing import Iterable, TextIO, Union, Type
 
 import yaml
 
@@ -6,11 +7,52 @@ from linkml_runtime.dumpers.dumper_root import Dumper
 from linkml_runtime.utils.formatutils import remove_empty_items
 from linkml_runtime.utils.yamlutils import YAMLRoot
 
+# The libyaml emitter, if PyYAML was built with it
+FastSafeDumper: Type[yaml.SafeDumper] = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
 class YAMLDumper(Dumper):
 
-    def dumps(self, element: YAMLRoot, **kwargs) -> str:
-        """ Return element formatted as a YAML string """
+    def dump(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], to_file: str, **kwargs) -> None:
+        """
+        Write element as YAML to to_file
+        :param element: LinkML object to be emitted
+        :param to_file: file to write to
+        :param kwargs: additional arguments for dump_stream
+        """
+        with open(to_file, 'w') as output_file:
+            self.dump_stream(element, output_file, **kwargs)
+
+    def dumps(self, element: YAMLRoot, fast: bool = False, **kwargs) -> str:
+        """
+        Return element formatted as a YAML string
+        :param element: LinkML object to be emitted
+        :param fast: if True, use the libyaml emitter when it is available
+        :param kwargs: additional arguments for yaml.dump
+        """
         # Internal note: remove_empty_items will also convert Decimals to int/float;
         # this is necessary until https://github.com/yaml/pyyaml/pull/372 is merged
-        return yaml.dump(remove_empty_items(element, hide_protected_keys=True),
-                                            Dumper=yaml.SafeDumper, sort_keys=False, **kwargs)
+        return yaml.dump(remove_empty_items(element, hide_protected_keys=True, share_unchanged=True),
+                         Dumper=self._dumper(fast), sort_keys=False, **kwargs)
+
+    def dump_stream(self, element: Union[YAMLRoot, Iterable[YAMLRoot]], stream: TextIO, fast: bool = False,
+                    multi_document: bool = False, **kwargs) -> None:
+        """
+        Write element as YAML to an open stream
+        :param element: LinkML object to be emitted.  A collection of objects if multi_document is True
+        :param stream: stream to write to
+        :param fast: if True, use the libyaml emitter when it is available
+        :param multi_document: if True, write each item in element as a separate YAML document.  Items are
+        converted one at a time, so element can be a generator
+        :param kwargs: additional arguments for yaml.dump / yaml.dump_all
+        """
+        if multi_document:
+            yaml.dump_all((remove_empty_items(e, hide_protected_keys=True, share_unchanged=True) for e in element),
+                          stream, Dumper=self._dumper(fast), sort_keys=False, **kwargs)
+        else:
+            yaml.dump(remove_empty_items(element, hide_protected_keys=True, share_unchanged=True),
+                      stream, Dumper=self._dumper(fast), sort_keys=False, **kwargs)
+
+    @staticmethod
+    def _dumper(fast: bool) -> Type[yaml.SafeDumper]:
+        return FastSafeDumper if fast else yaml.SafeDumper
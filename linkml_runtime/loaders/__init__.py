@@ -3,9 +3,13 @@ from linkml_runtime.loaders.rdf_loader import RDFLoader
 from linkml_runtime.loaders.rdflib_loader import RDFLibLoader
 from linkml_runtime.loaders.yaml_loader import YAMLLoader
 from linkml_runtime.loaders.csv_loader import CSVLoader
+from linkml_runtime.loaders.parquet_loader import ParquetLoader
+from linkml_runtime.loaders.msgpack_loader import MessagePackLoader
 
 json_loader = JSONLoader()
 rdf_loader = RDFLoader()
 rdflib_loader = RDFLibLoader()
 yaml_loader = YAMLLoader()
 csv_loader = CSVLoader()
+parquet_loader = ParquetLoader()
+msgpack_loader = MessagePackLoader()
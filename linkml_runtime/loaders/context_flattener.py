@@ -1,13 +1,54 @@
 import json
 import os
-from typing import List, Optional, Union
+import threading
+from copy import deepcopy
+from typing import List, Optional, Union, Dict, Tuple
+
+from linkml_runtime.utils.context_utils import load_context, context_source_key, register_derived_cache, \
+    sources_unchanged
+
+# Flattened contexts, along with the files that went into them
+_flattened: Dict[Tuple[str, str], Tuple[List[Tuple[str, Tuple]], dict]] = {}
+_flattened_lock = threading.Lock()
+
+
+def _clear_flattened() -> None:
+    with _flattened_lock:
+        _flattened.clear()
+
+
+register_derived_cache(_clear_flattened)
 
 
 def flatten_dict(ctxt: str, base: str, seen: Optional[List[str]] = None) -> dict:
+    """
+    Return the context in file ctxt with all of the contexts it references inlined
+
+    Top level results are cached for the life of the process, and recomputed when any of the files involved change.
+
+    :param ctxt: context file name, relative to base
+    :param base: directory holding the contexts
+    :param seen: contexts that are being flattened further up, to break reference cycles
+    :return: flattened context
+    """
+    if seen is not None:
+        return _flatten_dict(ctxt, base, seen, [])
+    key = (ctxt, base)
+    with _flattened_lock:
+        entry = _flattened.get(key)
+    if entry is None or not sources_unchanged(entry[0]):
+        sources = []
+        entry = (sources, _flatten_dict(ctxt, base, [], sources))
+        with _flattened_lock:
+            _flattened[key] = entry
+    return deepcopy(entry[1])
+
+
+def _flatten_dict(ctxt: str, base: str, seen: List[str], sources: List[Tuple[str, Tuple]]) -> dict:
 
     def map_context(ctxt_ent: Union[str, dict, list], seen: List[str]) -> Union[dict, list]:
         if isinstance(ctxt_ent, str):
-            ent_dict = flatten_dict(ctxt_ent, base, seen)
+            ent_dict = _flatten_dict(ctxt_ent, base, seen, sources)
             return ent_dict['@context'] if '@context' in ent_dict else ent_dict
         elif isinstance(ctxt_ent, list):
             return [map_context(clent, seen) for clent in ctxt_ent]
@@ -27,13 +68,12 @@ def flatten_dict(ctxt: str, base: str, seen: Optional[List[str]] = None) -> dict
                 rval[k] = v
         return rval
 
-    if seen is None:
-        seen = []
-    elif ctxt in seen:
+    if ctxt in seen:
         return {}
     seen.append(ctxt)
-    with open(os.path.join(base, ctxt)) as f:
-        rval = map_dict(json.load(f), seen)
+    fname = os.path.join(base, ctxt)
+    sources.append((fname, context_source_key(fname)))
+    rval = map_dict(load_context(fname), seen)
     seen.pop()
     return rval
 
@@ -1,44 +1,254 @@
-from json_flattener import unflatten_from_csv, KeyConfig, GlobalConfig, Serializer
+import csv
 import json
-from typing import Type, Union, List
-from linkml_runtime.utils.yamlutils import YAMLRoot
+import pickle
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from io import StringIO
+from typing import Type, Union, List, Iterator, Optional, Dict, Any, Tuple, TextIO
+
+import yaml
+from hbreader import default_str_tester
+from json_flattener import GlobalConfig, Serializer
 
 from linkml_runtime.loaders.loader_root import Loader
-from linkml_runtime.loaders.json_loader import JSONLoader
-from linkml_runtime.linkml_model.meta import SlotDefinitionName, SchemaDefinition, ClassDefinition
+from linkml_runtime.linkml_model.meta import SlotDefinitionName, SchemaDefinition
 from linkml_runtime.utils.yamlutils import YAMLRoot
+from linkml_runtime.utils.schemaplans import SchemaPlans
 from linkml_runtime.utils.schemaview import SchemaView
-from linkml_runtime.utils.csvutils import get_configmap
+from linkml_runtime.utils.csvutils import get_configmap, get_schemaview
+from linkml_runtime.utils.fileutils import local_file_name, open_text
+
+
+@dataclass
+class _FieldPlan:
+    """ How to reassemble one top level slot from its flattened columns """
+    name: str
+    serialized: List[Tuple[str, Serializer]] = field(default_factory=list)
+    flatten: bool = False
+    is_list: bool = False
+    mappings: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class _RowPlan:
+    """
+    Everything needed to turn a CSV row into an object, worked out once from the header and the configmap rather than
+    once per row.  This follows json_flattener.unflatten_from_csv.
+    """
+    columns: List[Tuple[str, bool, bool]]        # column name, is a list by configuration, is serialized
+    fields: List[_FieldPlan]
+    inner_delimiter: str
+    list_markers: Tuple[str, str]
+
+    @classmethod
+    def build(cls, header: List[str], config: GlobalConfig) -> "_RowPlan":
+        fields = []
+        serialized_columns = set()
+        for fname, kconfig in config.key_configs.items():
+            fplan = _FieldPlan(fname, flatten=kconfig.flatten, is_list=kconfig.is_list,
+                               mappings=list(kconfig.mappings.items()) if kconfig.mappings else [])
+            for serializer in kconfig.serializers:
+                col = f'{fname}{config.sep}{serializer.name}'
+                fplan.serialized.append((col, serializer))
+                serialized_columns.add(col)
+            fields.append(fplan)
+        columns = []
+        for col in header:
+            kconfig = config.key_configs.get(col)
+            columns.append((col, kconfig is not None and kconfig.is_list, col in serialized_columns))
+        return cls(columns, fields, config.csv_inner_delimiter, config.csv_list_markers)
+
+    def unflatten(self, row: List[str]) -> Dict[str, Any]:
+        """ Convert one row of column values into a (JSON) object """
+        lo, lc = self.list_markers
+        obj = {}
+        for (col, is_list, serialized), v in zip(self.columns, row):
+            v = v.replace('\\n', '\n').replace('\\t', '\t')
+            if not serialized and (is_list or (lo != '' and lc != '' and v.startswith(lo) and v.endswith(lc))):
+                if lo != '':
+                    if not v.startswith(lo):
+                        raise ValueError(f'Expected start-of-list marker {lo} in {col}={v}')
+                    v = v[len(lo):]
+                if lc != '':
+                    if not v.endswith(lc):
+                        raise ValueError(f'Expected end-of-list marker {lc} in {col}={v}')
+                    v = v[:-len(lc)]
+                obj[col] = [_csv_value(e) for e in v.split(self.inner_delimiter)]
+            else:
+                v = _csv_value(v)
+                if v is not None:
+                    obj[col] = v
+
+        for fplan in self.fields:
+            for col, serializer in fplan.serialized:
+                serialized_v = obj.pop(col, None)
+                if serialized_v is not None:
+                    if serializer == Serializer.yaml:
+                        obj[fplan.name] = yaml.safe_load(serialized_v)
+                    elif serializer == Serializer.json:
+                        obj[fplan.name] = json.loads(serialized_v)
+                    elif serializer == Serializer.pickle:
+                        obj[fplan.name] = pickle.loads(serialized_v)
+                    else:
+                        raise ValueError(f'unknown serializer: {serializer}')
+            if not fplan.flatten:
+                continue
+            if not fplan.is_list:
+                # foo_bar == "..." --> foo.bar
+                inner_obj = {k: obj.pop(col) for k, col in fplan.mappings if col in obj}
+                if fplan.name not in obj:
+                    obj[fplan.name] = inner_obj
+            else:
+                # foo_bar == [...] --> foo = [bar1, ...], ignoring null values and empty lists
+                actual = [(k, col) for k, col in fplan.mappings
+                          if isinstance(obj.get(col), list) and len(obj[col]) > 0]
+                if actual:
+                    inner_objs = [{} for _ in obj[actual[0][1]]]
+                    for k, col in actual:
+                        for inner_obj, v in zip(inner_objs, obj[col]):
+                            if v is not None:
+                                inner_obj[k] = v
+                    if fplan.name not in obj:
+                        obj[fplan.name] = inner_objs
+                for _, col in fplan.mappings:
+                    obj.pop(col, None)
+        return obj
+
+
+class _RowPlans(SchemaPlans):
+    """ Row plans for one schema view, reused for files with the same header.  Kept by the loader -- see
+    CSVLoader._row_plan """
+    def __init__(self, schemaview: SchemaView):
+        super().__init__(schemaview)
+        self.rows: Dict[Tuple, _RowPlan] = {}
+
+
+def _csv_value(x: str) -> Optional[Any]:
+    if x == '':
+        return None
+    try:
+        return int(x)
+    except ValueError:
+        try:
+            return float(x)
+        except ValueError:
+            return x
+
 
 class CSVLoader(Loader):
+    # Row plans for the schemaview most recently loaded with
+    _plans: Optional[_RowPlans] = None
 
     def load_any(self, *args, **kwargs) -> Union[YAMLRoot, List[YAMLRoot]]:
         return self.load(*args, **kwargs)
 
-
     def loads(self, input,
               target_class: Type[YAMLRoot],
               index_slot: SlotDefinitionName = None,
               schema: SchemaDefinition = None,
               schemaview: SchemaView = None,
-              **kwargs) -> str:
-        if schemaview is None:
-            schemaview = SchemaView(schema)
-        configmap = get_configmap(schemaview, index_slot)
-        config = GlobalConfig(key_configs=configmap)
-        objs = unflatten_from_csv(input, config=config, **kwargs)
-        return JSONLoader().loads(json.dumps({index_slot: objs}), target_class=target_class)
+              **kwargs) -> YAMLRoot:
+        return self.load(input, target_class, index_slot=index_slot, schema=schema, schemaview=schemaview, **kwargs)
 
-    def load(self, source: str,
+    def load(self, source: Union[str, TextIO],
              target_class: Type[YAMLRoot],
              index_slot: SlotDefinitionName = None,
              schema: SchemaDefinition = None,
              schemaview: SchemaView = None,
-             **kwargs) -> str:
+             **kwargs) -> YAMLRoot:
+        """
+        Load a CSV/TSV file as an instance of target_class
+
+        :param source: file name, open file or CSV text
+        :param target_class: class of the container object
+        :param index_slot: slot in target_class that holds the rows
+        :param schema: schema to interpret the columns with
+        :param schemaview: alternative to schema
+        :param kwargs: GlobalConfig settings (e.g. csv_delimiter)
+        :return: instance of target_class
+        """
+        if schemaview is None:
+            schemaview = get_schemaview(schema)
+        # The container builds its own row objects, so we hand it plain dictionaries
+        return target_class(**{index_slot: list(self._iter_rows(source, schemaview, index_slot, **kwargs))})
+
+    def load_iter(self, source: Union[str, TextIO],
+                  target_class: Type[YAMLRoot],
+                  index_slot: SlotDefinitionName = None,
+                  schema: SchemaDefinition = None,
+                  schemaview: SchemaView = None,
+                  batch_size: Optional[int] = None,
+                  **kwargs) -> Iterator[Union[YAMLRoot, List[YAMLRoot]]]:
+        """
+        Load a CSV/TSV file one row at a time
+
+        Each row is unflattened and turned into an instance of the range of index_slot as it is read, so the file is
+        never held in memory as a whole.
+
+        :param source: file name, open file or CSV text
+        :param target_class: class of the container object.  The row class is found in the same module
+        :param index_slot: slot in target_class that holds the rows
+        :param schema: schema to interpret the columns with
+        :param schemaview: alternative to schema
+        :param batch_size: if present, yield lists of up to batch_size objects rather than individual objects
+        :param kwargs: GlobalConfig settings (e.g. csv_delimiter)
+        :return: row objects, or batches thereof
+        """
         if schemaview is None:
-            schemaview = SchemaView(schema)
-        configmap = get_configmap(schemaview, index_slot)
-        config = GlobalConfig(key_configs=configmap)
-        print(f'Loading from {source}')
-        objs = unflatten_from_csv(source, config=config, **kwargs)
-        return JSONLoader().loads(json.dumps({index_slot: objs}), target_class=target_class)
\ No newline at end of file
+            schemaview = get_schemaview(schema)
+        row_class = self.index_slot_class(schemaview, target_class, index_slot)
+        batch = []
+        for row in self._iter_rows(source, schemaview, index_slot, **kwargs):
+            obj = row_class(**row)
+            if batch_size is None:
+                yield obj
+            else:
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _iter_rows(self, source: Union[str, TextIO], schemaview: SchemaView, index_slot: SlotDefinitionName,
+                   **kwargs) -> Iterator[Dict[str, Any]]:
+        """ Generate the unflattened, cleaned rows in source """
+        config = GlobalConfig(**kwargs)
+        with self._open(source, config.csv_delimiter) as instream:
+            reader = csv.reader(instream, delimiter=config.csv_delimiter, quoting=csv.QUOTE_NONE, escapechar='\\')
+            header = next(reader, None)
+            if header is None:
+                return
+            plan = self._row_plan(schemaview, index_slot, header, config)
+            for row in reader:
+                if row:
+                    yield self.json_clean(plan.unflatten(row))
+
+    def _row_plan(self, schemaview: SchemaView, index_slot: SlotDefinitionName, header: List[str],
+                  config: GlobalConfig) -> _RowPlan:
+        """ Return the row plan for header, building new plans if schemaview or its namespaces have changed """
+        plans = self._plans
+        if plans is None or not plans.is_current(schemaview):
+            plans = self._plans = _RowPlans(schemaview)
+        key = (index_slot, tuple(header), config.sep, config.csv_inner_delimiter, tuple(config.csv_list_markers))
+        plan = plans.rows.get(key)
+        if plan is None:
+            row_config = GlobalConfig(key_configs=get_configmap(schemaview, index_slot, config.sep), sep=config.sep,
+                                      csv_inner_delimiter=config.csv_inner_delimiter,
+                                      csv_list_markers=tuple(config.csv_list_markers))
+            plan = plans.rows[key] = _RowPlan.build(header, row_config)
+        return plan
+
+    @staticmethod
+    @contextmanager
+    def _open(source: Union[str, TextIO], delimiter: str) -> Iterator[TextIO]:
+        if not isinstance(source, str):
+            yield source
+        else:
+            fname = local_file_name(source)
+            if fname is None and (default_str_tester(source) or delimiter in source):
+                # Already read in (e.g. by aload).  A missing file is left to open_text to report
+                yield StringIO(source)
+            else:
+                with open_text(fname or source) as f:
+                    yield f
@@ -13,17 +13,38 @@ class JSONLoader(Loader):
     def load_any(self, source: Union[str, dict, TextIO], target_class: Type[YAMLRoot], *, base_dir: Optional[str] = None,
              metadata: Optional[FileInfo] = None, **_) -> Union[YAMLRoot, List[YAMLRoot]]:
         def loader(data: Union[str, dict], _: FileInfo) -> Optional[Dict]:
-            data_as_dict = json.loads(data) if isinstance(data, str) else data
+            if not isinstance(data, str):
+                return self._clean_root(data, target_class)
+            # Clean as we decode.  The root object is the last one handed to the hook, so we hang on to the @type
+            # of each object before it is stripped and check the final one.
+            root_type = [None]
+
+            def object_hook(obj: dict) -> dict:
+                root_type[0] = obj.get('@type')
+                return self.json_clean_hook(obj)
+
+            data_as_dict = json.loads(data, object_hook=object_hook)
             if isinstance(data_as_dict, list):
-                return self.json_clean(data_as_dict)
-            typ = data_as_dict.pop('@type', None)
-            if typ and typ != target_class.__name__:
-                logging.warning(f"Warning: input type mismatch. Expected: {target_class.__name__}, Actual: {typ}")
-            return self.json_clean(data_as_dict)
+                self._clean_lists([data_as_dict])
+            else:
+                self._check_type(root_type[0], target_class)
+            return data_as_dict
 
         if not metadata:
             metadata = FileInfo()
         if base_dir and not metadata.base_path:
             metadata.base_path = base_dir
+        # The json module has no incremental decoder, so files are read whole rather than streamed to the loader
         return self.load_source(source, loader, target_class,
                                 accept_header="application/ld+json, application/json, text/json", metadata=metadata)
+
+    def _clean_root(self, data_as_dict: Union[dict, list], target_class: Type[YAMLRoot]) -> Union[dict, list]:
+        """ Clean an already parsed JSON document, checking the type of a root object against target_class """
+        if isinstance(data_as_dict, dict):
+            self._check_type(data_as_dict.pop('@type', None), target_class)
+        return self.json_clean(data_as_dict)
+
+    @staticmethod
+    def _check_type(typ: Optional[str], target_class: Type[YAMLRoot]) -> None:
+        if typ and typ != target_class.__name__:
+            logging.warning(f"Warning: input type mismatch. Expected: {target_class.__name__}, Actual: {typ}")
@@ -1,10 +1,48 @@
+import asyncio
+import sys
+import traceback
 from abc import ABC, abstractmethod
-from typing import TextIO, Union, Optional, Callable, Dict, Type, Any, List
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from functools import partial
+from dataclasses import dataclass
+from typing import TextIO, Union, Optional, Callable, Dict, Type, Any, List, Iterable, Iterator
 
-from hbreader import FileInfo, hbread
-from jsonasobj2 import as_dict, JsonObj
+from hbreader import FileInfo
+from jsonasobj2 import JsonObj
 
-from linkml_runtime.utils.yamlutils import YAMLRoot
+from linkml_runtime.utils.formatutils import camelcase
+from linkml_runtime.utils.fileutils import local_file_name, open_text
+from linkml_runtime.utils.url_cache import read_source
+from linkml_runtime.utils.yamlutils import YAMLRoot, as_kwargs
+
+
+@dataclass
+class LoadResult:
+    """
+    The outcome of loading one source in a batch (see Loader.load_many)
+    """
+    source: str
+    result: Optional[Union[YAMLRoot, List[YAMLRoot]]] = None
+    error: Optional[str] = None     # repr of the exception followed by its traceback
+
+
+def _load_one(loader: "Loader", source: str, target_class: Type[YAMLRoot], kwargs: Dict[str, Any]) -> LoadResult:
+    """
+    Load a single source for load_many.  Module level so that it can be sent to a worker process.  The error is
+    reported as text, as not every exception survives being pickled back from a worker
+    """
+    try:
+        return LoadResult(source, result=loader.load_any(source, target_class, **kwargs))
+    except Exception as e:
+        return LoadResult(source, error=f'{e!r}\n{traceback.format_exc()}')
+
+
+class _EmptiedDict(dict):
+    """ A dictionary that json_clean_hook emptied.  Unlike one that was empty in the input, it is kept """
+
+
+def _is_empty(o: Any) -> bool:
+    return o is None or o == [] or (o == {} and not isinstance(o, _EmptiedDict))
 
 
 class Loader(ABC):
@@ -14,39 +52,104 @@ class Loader(ABC):
         """
         Remove empty values and JSON-LD relics from an input file
 
+        The structure is cleaned in place, parents before children: an entry is removed if it is empty to begin
+        with, but one that only becomes empty once its own contents are removed is kept.  The walk uses an explicit
+        stack, so it is linear in the size of the input and is not bounded by the recursion limit.
+
         :param inp: JSON-LD representation
         :return: JSON representation
         """
-        def _is_empty(o) -> bool:
-            return o is None or o == [] or o == {}
+        todo = [inp]
+        while todo:
+            node = todo.pop()
+            if isinstance(node, list):
+                Loader._clean_node(node)
+                todo.extend(node)
+            elif isinstance(node, dict):
+                Loader._clean_node(node)
+                todo.extend(node.values())
+        return inp
 
+    @staticmethod
+    def json_clean_hook(inp: dict) -> dict:
+        """
+        A json.loads object_hook that applies json_clean as the document is decoded, e.g.:
+
+            json.loads(text, object_hook=Loader.json_clean_hook)
+
+        The decoder hands us each dictionary after its contents have been decoded (and hooked), so we only have to
+        clean the dictionary itself and any lists nested directly below it.  A dictionary that the hook empties is
+        returned as an _EmptiedDict, which tells the hook for its parent to keep it, as json_clean would.  Note that a
+        list at the root of the document is not passed to the hook and still needs to be cleaned by the caller
+        (see _clean_lists).
+
+        :param inp: dictionary produced by the JSON decoder
+        :return: inp with empty values and JSON-LD relics removed
+        """
+        was_empty = not inp
+        Loader._clean_node(inp)
+        Loader._clean_lists(v for v in inp.values() if isinstance(v, list))
+        return _EmptiedDict() if not inp and not was_empty else inp
+
+    @staticmethod
+    def _clean_lists(lists: Iterable[list]) -> None:
+        """
+        Clean lists, and the lists nested in them, parents before children.  Dictionaries in them are left alone,
+        as json_clean_hook has already dealt with them
+
+        :param lists: lists to clean in place
+        """
+        todo = list(lists)
+        while todo:
+            node = todo.pop()
+            Loader._clean_node(node)
+            todo.extend(e for e in node if isinstance(e, list))
+
+    @staticmethod
+    def _clean_node(inp: Union[list, dict]) -> None:
+        """ Remove empty entries (and, for dictionaries, JSON-LD keys) from one level of inp, in place """
         if isinstance(inp, list):
-            for e in [inp_e for inp_e in inp if _is_empty(inp_e)]:
-                del(inp[e])
-            for e in inp:
-                Loader.json_clean(e)
-        elif isinstance(inp, dict):
-            for k, v in list(inp.items()):
-                if k.startswith('@') or _is_empty(v):
-                    del(inp[k])
-                else:
-                    Loader.json_clean(v)
-        return inp
+            if any(_is_empty(e) for e in inp):
+                inp[:] = [e for e in inp if not _is_empty(e)]
+        else:
+            for k in [k for k, v in inp.items() if k.startswith('@') or _is_empty(v)]:
+                del inp[k]
+
+    @staticmethod
+    def index_slot_class(schemaview: "SchemaView", target_class: Type[YAMLRoot], index_slot: str) -> Type[YAMLRoot]:
+        """
+        Return the python class for the range of index_slot, for loaders of tabular data
+
+        :param schemaview: view over the schema that target_class was generated from
+        :param target_class: container class.  The row class is looked up in the same module
+        :param index_slot: slot in target_class that holds the rows
+        :return: row class
+        """
+        slot = schemaview.get_slot(index_slot)
+        row_class = getattr(sys.modules[target_class.__module__], camelcase(slot.range), None)
+        if row_class is None:
+            raise ValueError(f'{target_class.__module__} has no class for {index_slot} range: {slot.range}')
+        return row_class
 
     def load_source(self,
                     source: Union[str, dict, TextIO],
                     loader: Callable[[Union[str, Dict], FileInfo], Optional[Union[Dict, List]]],
                     target_class: Type[YAMLRoot],
                     accept_header: Optional[str] = "text/plain, application/yaml;q=0.9",
-                    metadata: Optional[FileInfo] = None) -> Optional[Union[YAMLRoot, List[YAMLRoot]]]:
+                    metadata: Optional[FileInfo] = None,
+                    streaming: bool = False) -> Optional[Union[YAMLRoot, List[YAMLRoot]]]:
         """ Base loader - convert a file, url, string, open file handle or dictionary into an instance
         of target_class
 
+        Local files may be gzip or zstd compressed.
+
         :param source: URL, file name, block of text, Existing Object or open file handle
         :param loader: Take a stringified image or a dictionary and return a loadable dictionary
         :param target_class: Destination class
         :param accept_header: Accept header to use if doing a request
         :param metadata: Metadata about the source.  Filled in as we go along
+        :param streaming: True means that loader also accepts an open text stream, in which case local files are
+        passed to it unread
 
         :return: Instance of the target class if loader worked
         """
@@ -54,18 +157,21 @@ class Loader(ABC):
         # Makes coding easier down the line if we've got this, even if it is strictly internal
         if metadata is None:
             metadata = FileInfo()
-        if not isinstance(source, dict):
-            data = hbread(source, metadata, metadata.base_path, accept_header)
+        fname = local_file_name(source, metadata.base_path)
+        if fname:
+            with open_text(fname, metadata) as stream:
+                data_as_dict = loader(stream if streaming else stream.read(), metadata)
         else:
-            data = source
-        data_as_dict = loader(data, metadata)
+            data = read_source(source, metadata, metadata.base_path, accept_header) if not isinstance(source, dict) \
+                else source
+            data_as_dict = loader(data, metadata)
         if data_as_dict:
             if isinstance(data_as_dict, list):
-                return [target_class(**as_dict(x)) for x in data_as_dict]
+                return [target_class(**as_kwargs(x)) for x in data_as_dict]
             elif isinstance(data_as_dict, dict):
                 return target_class(**data_as_dict)
             elif isinstance(data_as_dict, JsonObj):
-                return [target_class(**as_dict(x)) for x in data_as_dict]
+                return [target_class(**as_kwargs(x)) for x in data_as_dict]
             else:
                 raise ValueError(f'Unexpected type {data_as_dict}')
         else:
@@ -124,3 +230,59 @@ class Loader(ABC):
         :return: instance of taarget_class
         """
         return self.load(source, target_class, metadata=metadata)
+
+    def load_many(self, sources: Iterable[str], target_class: Type[YAMLRoot], *, workers: Optional[int] = None,
+                  ordered: bool = True, chunksize: int = 1, **kwargs) -> Iterator[LoadResult]:
+        """
+        Load each of sources as an instance (or list of instances) of target_class
+
+        Errors are reported per source in the error field of the corresponding LoadResult rather than being raised,
+        so one bad file does not abort the batch.
+
+        :param sources: file names or URLs to load
+        :param target_class: destination class
+        :param workers: number of worker processes.  None or 1 loads sequentially in this process
+        :param ordered: True means results are returned in the order of sources, False means as they are completed
+        :param chunksize: number of sources handed to a worker at a time when ordered is True
+        :param kwargs: additional arguments passed to load_any
+        :return: iterator over a LoadResult for each source
+        """
+        if not workers or workers == 1:
+            for source in sources:
+                yield _load_one(self, source, target_class, kwargs)
+            return
+        sources = list(sources)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if ordered:
+                yield from executor.map(_load_one, [self] * len(sources), sources, [target_class] * len(sources),
+                                        [kwargs] * len(sources), chunksize=chunksize)
+            else:
+                futures = [executor.submit(_load_one, self, source, target_class, kwargs) for source in sources]
+                for future in as_completed(futures):
+                    yield future.result()
+
+    async def aload(self, source: Union[str, dict, TextIO], target_class: Type[YAMLRoot], *,
+                    base_dir: Optional[str] = None, metadata: Optional[FileInfo] = None,
+                    executor: Optional[Executor] = None, **kwargs) -> Union[YAMLRoot, List[YAMLRoot]]:
+        """
+        Asynchronous form of load_any
+
+        The whole load, including reading the source, is run in executor so the event loop isn't blocked.  Reading
+        goes through load_any, so compressed and binary inputs are handled as they are by load.
+
+        :param source: source file/text/url to load
+        :param target_class: destination class
+        :param base_dir: scoping directory for source if it is a file or url
+        :param metadata: metadata about the source.  Filled in as the source is read, unless executor runs in
+        another process
+        :param executor: executor for the load.  None means the loop's default executor
+        :param kwargs: additional arguments passed to load_any
+        :return: instance of target_class, or list of instances of target_class
+        """
+        loop = asyncio.get_running_loop()
+        if base_dir is not None:
+            kwargs['base_dir'] = base_dir
+        if metadata is not None:
+            kwargs['metadata'] = metadata
+        return await loop.run_in_executor(executor, partial(self.load_any, source, target_class=target_class,
+                                                            **kwargs))
@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from typing import Union, Optional, Type, List, Iterator, BinaryIO, Callable, Any, Tuple
+
+from hbreader import FileInfo
+
+from linkml_runtime.dumpers.msgpack_dumper import import_msgpack
+from linkml_runtime.loaders.json_loader import JSONLoader
+from linkml_runtime.utils.fileutils import local_file_name, open_binary
+from linkml_runtime.utils.yamlutils import YAMLRoot, as_kwargs
+
+
+class MessagePackLoader(JSONLoader):
+    """
+    Load objects written by MessagePackDumper
+
+    Decoded objects are cleaned and type checked exactly as JSONLoader does for JSON.  Requires the msgpack package.
+    """
+
+    def load_any(self, source: Union[str, bytes, dict, BinaryIO], target_class: Type[YAMLRoot], *,
+                 base_dir: Optional[str] = None, metadata: Optional[FileInfo] = None,
+                 **_) -> Union[YAMLRoot, List[YAMLRoot]]:
+        """
+        Load a MessagePack image
+
+        :param source: file name, MessagePack image, open binary file or an already decoded dictionary
+        :param target_class: class to load
+        :param base_dir: base directory for relative file names
+        :param metadata: not used
+        :return: instance (or list of instances) of target_class
+        """
+        if isinstance(source, dict):
+            data = self._clean_root(source, target_class)
+        else:
+            msgpack = import_msgpack()
+            hook, check = self._hook(target_class)
+            with self._open(source, base_dir) as stream:
+                data = msgpack.unpackb(stream.read() if stream else source, raw=False, strict_map_key=False,
+                                       object_hook=hook)
+            if isinstance(data, list):
+                self._clean_lists([data])
+            else:
+                check()
+        if not data:
+            return None
+        if isinstance(data, list):
+            return [target_class(**as_kwargs(x)) for x in data]
+        return target_class(**data)
+
+    def loads(self, source: bytes, target_class: Type[YAMLRoot], *, metadata: Optional[FileInfo] = None,
+              **_) -> YAMLRoot:
+        """ Load the MessagePack image in source """
+        return self.load(source, target_class, metadata=metadata)
+
+    def load_iter(self, source: Union[str, bytes, BinaryIO], target_class: Type[YAMLRoot], *,
+                  base_dir: Optional[str] = None) -> Iterator[YAMLRoot]:
+        """
+        Load a sequence of objects written by MessagePackDumper.dump_stream, one object at a time
+
+        :param source: file name, MessagePack image or open binary file
+        :param target_class: class of each object
+        :param base_dir: base directory for relative file names
+        :return: instances of target_class
+        """
+        msgpack = import_msgpack()
+        hook, check = self._hook(target_class)
+        with self._open(source, base_dir) as stream:
+            unpacker = msgpack.Unpacker(stream, raw=False, strict_map_key=False, object_hook=hook)
+            if stream is None:
+                unpacker.feed(source)
+            for data in unpacker:
+                check()
+                if data:
+                    yield target_class(**data)
+
+    def _hook(self, target_class: Type[YAMLRoot]) -> Tuple[Callable[[dict], dict], Callable[[], None]]:
+        """
+        Return a decoder object_hook that cleans each map as it is decoded and a function that checks the @type of
+        the most recently decoded root object.  As with JSON, the root is the last map handed to the hook
+        """
+        root_type = [None]
+
+        def object_hook(obj: dict) -> dict:
+            root_type[0] = obj.get('@type')
+            return self.json_clean_hook(obj)
+
+        def check() -> None:
+            self._check_type(root_type[0], target_class)
+            root_type[0] = None
+        return object_hook, check
+
+    @staticmethod
+    @contextmanager
+    def _open(source: Union[str, bytes, BinaryIO], base_dir: Optional[str]) -> Iterator[Optional[Any]]:
+        """
+        Yield an open binary stream for source, or None if source is the MessagePack image itself.  gzip and zstd
+        compressed files are decompressed as they are read
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            yield None
+        elif isinstance(source, str):
+            fname = local_file_name(source, base_dir)
+            if fname is None:
+                raise FileNotFoundError(f'{source}: MessagePack input must be a local file, an image or a stream')
+            with open_binary(fname) as f:
+                yield f
+        else:
+            yield source
@@ -0,0 +1,97 @@
+from typing import Type, Union, List, Iterator, Optional, Dict, Any
+
+from linkml_runtime.loaders.loader_root import Loader
+from linkml_runtime.linkml_model.meta import SlotDefinitionName, SchemaDefinition
+from linkml_runtime.utils.arrowutils import import_pyarrow, from_arrow_rows
+from linkml_runtime.utils.csvutils import get_schemaview
+from linkml_runtime.utils.schemaview import SchemaView
+from linkml_runtime.utils.yamlutils import YAMLRoot
+
+# Rows read per record batch
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+
+class ParquetLoader(Loader):
+    """
+    Load the rows of a container's index slot from Parquet files or Arrow tables written by ParquetDumper
+
+    Requires the pyarrow package.
+    """
+
+    def load_any(self, *args, **kwargs) -> Union[YAMLRoot, List[YAMLRoot]]:
+        return self.load(*args, **kwargs)
+
+    def loads(self, source: bytes, target_class: Type[YAMLRoot], **kwargs) -> YAMLRoot:
+        """ Load the Parquet image in source.  See load """
+        pa = import_pyarrow()
+        return self.load(pa.BufferReader(source), target_class, **kwargs)
+
+    def load(self, source: Union[str, "pyarrow.Table", Any],
+             target_class: Type[YAMLRoot],
+             index_slot: SlotDefinitionName = None,
+             schema: SchemaDefinition = None,
+             schemaview: SchemaView = None,
+             **kwargs) -> YAMLRoot:
+        """
+        Load a Parquet file as an instance of target_class
+
+        :param source: Parquet file name or open file, or an Arrow table
+        :param target_class: class of the container object
+        :param index_slot: slot in target_class that holds the rows
+        :param schema: not needed, as the file carries its own schema.  Accepted for compatibility with CSVLoader
+        :param schemaview: not needed -- see schema
+        :param kwargs: additional arguments for pyarrow.parquet.ParquetFile
+        :return: instance of target_class
+        """
+        # The container builds its own row objects, so we hand it plain dictionaries
+        return target_class(**{index_slot: list(self._iter_rows(source, DEFAULT_BATCH_SIZE, **kwargs))})
+
+    def load_iter(self, source: Union[str, "pyarrow.Table", Any],
+                  target_class: Type[YAMLRoot],
+                  index_slot: SlotDefinitionName = None,
+                  schema: SchemaDefinition = None,
+                  schemaview: SchemaView = None,
+                  batch_size: Optional[int] = None,
+                  **kwargs) -> Iterator[Union[YAMLRoot, List[YAMLRoot]]]:
+        """
+        Load a Parquet file one record batch at a time
+
+        :param source: Parquet file name or open file, or an Arrow table
+        :param target_class: class of the container object.  The row class is found in the same module
+        :param index_slot: slot in target_class that holds the rows
+        :param schema: schema describing the rows
+        :param schemaview: alternative to schema
+        :param batch_size: if present, yield lists of up to batch_size objects rather than individual objects
+        :param kwargs: additional arguments for pyarrow.parquet.ParquetFile
+        :return: row objects, or batches thereof
+        """
+        if schemaview is None:
+            schemaview = get_schemaview(schema)
+        row_class = self.index_slot_class(schemaview, target_class, index_slot)
+        batch = []
+        for row in self._iter_rows(source, batch_size or DEFAULT_BATCH_SIZE, **kwargs):
+            obj = row_class(**row)
+            if batch_size is None:
+                yield obj
+            else:
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _iter_rows(self, source: Union[str, "pyarrow.Table", Any], batch_size: int,
+                   **kwargs) -> Iterator[Dict[str, Any]]:
+        """ Generate the cleaned rows in source """
+        pa = import_pyarrow()
+        if isinstance(source, pa.Table):
+            arrow_schema = source.schema
+            batches = source.to_batches(max_chunksize=batch_size)
+        else:
+            parquet_file = pa.parquet.ParquetFile(source, **kwargs)
+            arrow_schema = parquet_file.schema_arrow
+            batches = parquet_file.iter_batches(batch_size=batch_size)
+        for record_batch in batches:
+            for row in from_arrow_rows(record_batch.to_pylist(), arrow_schema):
+                yield self.json_clean(row)
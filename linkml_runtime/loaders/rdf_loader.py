@@ -1,9 +1,13 @@
-from typing import Union, TextIO, Optional, Type, List
+from typing import Union, TextIO, Optional, Type, List, Dict
 
-from hbreader import FileInfo
+from hbreader import FileInfo, default_str_tester
 
 from linkml_runtime.loaders.loader_root import Loader
-from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE
+from linkml_runtime.loaders.rdflib_loader import RDFLibLoader
+from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE, load_context
+from linkml_runtime.utils.fileutils import local_file_name
+from linkml_runtime.utils.schemaview import SchemaView
+from linkml_runtime.utils.url_cache import pyld_document_loader, source_url
 from linkml_runtime.utils.yamlutils import YAMLRoot
 from pyld import jsonld
 from rdflib import Graph
@@ -15,6 +19,11 @@ from linkml_runtime.loaders.requests_ssl_patch import no_ssl_verification
 RDF_MIME_TYPES = "application/x-turtle;q=0.9, application/rdf+n3;q=0.8, application/rdf+xml;q=0.5, text/plain;q=0.1"
 
 
+def _is_rdf_text(source: str) -> bool:
+    """ True if source is RDF text rather than a file name or URL.  URLs never contain whitespace """
+    return default_str_tester(source) or any(c.isspace() for c in source.strip())
+
+
 class RDFLoader(Loader):
 
     def load_any(self, *args, **kwargs) -> Union[YAMLRoot, List[YAMLRoot]]:
@@ -23,9 +32,15 @@ class RDFLoader(Loader):
 
     def load(self, source: Union[str, TextIO, Graph], target_class: Type[YAMLRoot], *, base_dir: Optional[str] = None,
              contexts: CONTEXTS_PARAM_TYPE = None, fmt: Optional[str] = 'turtle',
-             metadata: Optional[FileInfo] = None) -> YAMLRoot:
+             metadata: Optional[FileInfo] = None, schemaview: Optional[SchemaView] = None,
+             prefix_map: Optional[Dict[str, str]] = None) -> YAMLRoot:
         """
         Load the RDF in source into the python target_class structure
+
+        If a schemaview is supplied, RDF sources are constructed directly from the graph under the guidance of the
+        schema (see RDFLibLoader), which is much faster than converting the graph to JSON-LD and framing it.  JSON-LD
+        text and context-only loads still go through pyld framing.
+
         :param source: RDF data source. Can be a URL, a file name, an RDF string, an open handle or an existing graph
         :param base_dir: Base directory that can be used if file name or URL.  This is copied into metadata if present
         :param target_class: LinkML class to load the RDF into
@@ -33,8 +48,27 @@ class RDFLoader(Loader):
         optional because, if source is in JSON-LD format, it is possible that the contexts are already there
         :param fmt: format of source if it isn't an existing Graph
         :param metadata: source information. Used by some loaders to record where information came from
+        :param schemaview: schema that target_class was generated from.  contexts are not used if this is supplied
+        and source is not JSON-LD text
+        :param prefix_map: additional prefixes for the identifiers in source.  Only used with schemaview
         :return: Instance of target_class
         """
+        if schemaview is not None and (isinstance(source, Graph) or fmt != 'json-ld'):
+            if not isinstance(source, Graph):
+                fname = local_file_name(source, base_dir)
+                if fname:
+                    source = fname
+                elif isinstance(source, str) and not _is_rdf_text(source):
+                    source = source_url(source, base_dir) or source
+                else:
+                    # RDF text is parsed here: RDFLibLoader can only tell text that spans several lines from a file name
+                    g = Graph()
+                    g.parse(data=source if isinstance(source, str) else source.read(), format=fmt)
+                    source = g
+            # See the note on SSL verification below
+            with no_ssl_verification():
+                return RDFLibLoader().load(source, target_class, schemaview=schemaview, prefix_map=prefix_map,
+                                          fmt=fmt, metadata=metadata)
 
         def loader(data: Union[str, dict], _: FileInfo) -> Optional[dict]:
             """
@@ -59,7 +93,7 @@ class RDFLoader(Loader):
                 # TODO: figure out what to do base options below
                 # TODO: determine whether jsonld.frame can handle something other than string input
                 # frame = {'@context': contexts, '@type': f'{target_class.__name__}'}
-                data_as_dict = jsonld.frame(data, contexts)
+                data_as_dict = jsonld.frame(data, frame, options=dict(documentLoader=pyld_document_loader))
             else:
                 data_as_dict = data
             typ = data_as_dict.pop('@type', None)
@@ -71,6 +105,9 @@ class RDFLoader(Loader):
                 print(f"Warning: input type mismatch. Expected: {target_class.__name__}, Actual: {typ}")
             return self.json_clean(data_as_dict)
 
+        # The frame is read and parsed once per process, rather than by pyld on every load
+        frame = contexts if contexts is None or isinstance(contexts, list) else load_context(contexts)
+
         if not metadata:
             metadata = FileInfo()
         if base_dir and not metadata.base_path:
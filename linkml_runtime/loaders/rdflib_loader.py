@@ -1,17 +1,33 @@
 import logging
+import multiprocessing
+import os
+import shelve
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.context import BaseContext
 from copy import copy
-from dataclasses import dataclass
-from typing import Optional, Any, Dict, Type, Union, TextIO, List, Tuple, Set
+from dataclasses import dataclass, replace
+from itertools import count
+from io import StringIO
+from typing import Optional, Any, Dict, Type, Union, TextIO, List, Tuple, Set, Callable, Iterable, Iterator
 
 from hbreader import FileInfo
 from rdflib import Graph, URIRef
 from rdflib.term import Node, BNode, Literal
 from rdflib.namespace import RDF
+from rdflib.plugins.parsers.nquads import NQuadsParser
+from rdflib.plugins.parsers.ntriples import ParseError
 
 from linkml_runtime import MappingError, DataNotFoundError
 from linkml_runtime.linkml_model import ClassDefinitionName, TypeDefinition, EnumDefinition, ClassDefinition
 from linkml_runtime.loaders.loader_root import Loader
+from linkml_runtime.utils.fileutils import local_file_name, compression_type, open_text, open_binary
 from linkml_runtime.utils.formatutils import underscore
+from linkml_runtime.utils.namespaces import Namespaces
+from linkml_runtime.utils.url_cache import source_url, get_url_cache, read_source
+from linkml_runtime.utils.schemaplans import SchemaPlans
 from linkml_runtime.utils.schemaview import SchemaView, SlotDefinition
 from linkml_runtime.utils.yamlutils import YAMLRoot
 
@@ -22,17 +38,249 @@ ANYDICT = Dict[str, Any]
 class Pointer:
     obj: str
 
+
+@dataclass
+class _SlotRule:
+    """ How the objects of one predicate are loaded into subjects of one class """
+    slot_name: str
+    multivalued: bool
+    inlined: bool
+    range: Optional[str]
+    range_elements: List[ClassDefinitionName]
+    range_class: Optional[ClassDefinitionName]
+    # permissible value meaning -> (position, text), for enum ranges
+    enum_meanings: Dict[Optional[str], Tuple[int, str]]
+
+
+class _ClassRules:
+    """
+    Dispatch table for the triples of subjects of one class
+
+    A rule is built the first time its predicate is seen and is kept for the lifetime of the table, so processing a
+    triple is a dictionary lookup rather than a walk over the schema.  Tables are shared through _LoadPlans.
+    """
+    def __init__(self, plans: "_LoadPlans", class_name: ClassDefinitionName):
+        schemaview = plans.schemaview
+        self.plans = plans
+        self.class_name = class_name
+        type_designator_slot = schemaview.get_type_designator_slot(class_name)
+        self.type_designator = URIRef(schemaview.get_uri(type_designator_slot, expand=True)) \
+            if type_designator_slot else None
+        self.id_slot = schemaview.get_identifier_slot(class_name)
+        self.rules: Dict[URIRef, Optional[_SlotRule]] = {}
+
+    def rule(self, predicate: URIRef) -> Optional[_SlotRule]:
+        """ Return the rule for predicate, or None if predicate doesn't map to a slot """
+        try:
+            return self.rules[predicate]
+        except KeyError:
+            pass
+        schemaview = self.plans.schemaview
+        slot = self.plans.predicate_slots().get(predicate)
+        if slot is not None:
+            slot = schemaview.induced_slot(slot.name, self.class_name)
+            range_elements = schemaview.slot_applicable_range_elements(slot)
+            enum_meanings = {}
+            if EnumDefinition.class_name in range_elements:
+                e = schemaview.get_enum(slot.range)
+                for i, pv in enumerate(e.permissible_values.values() if e else []):
+                    enum_meanings.setdefault(pv.meaning, (i, pv.text))
+            slot = _SlotRule(slot_name=underscore(slot.name),
+                             multivalued=bool(slot.multivalued),
+                             inlined=schemaview.is_inlined(slot),
+                             range=slot.range,
+                             range_elements=range_elements,
+                             range_class=ClassDefinitionName(slot.range)
+                             if slot.range in schemaview.all_classes() else None,
+                             enum_meanings=enum_meanings)
+        self.rules[predicate] = slot
+        return slot
+
+
+class _LoadPlans(SchemaPlans):
+    """ The dispatch tables for the classes of one schema.  Kept by the loader -- see RDFLibLoader._load_plans """
+    def __init__(self, schemaview: SchemaView):
+        super().__init__(schemaview)
+        self._predicate_slots: Optional[Dict[URIRef, SlotDefinition]] = None
+        self.classes: Dict[ClassDefinitionName, _ClassRules] = {}
+
+    def predicate_slots(self) -> Dict[URIRef, SlotDefinition]:
+        """ Lookup table for RDF predicates -> slots """
+        if self._predicate_slots is None:
+            schemaview = self.schemaview
+            self._predicate_slots = {URIRef(schemaview.get_uri(s, expand=True)): s
+                                     for s in schemaview.all_slots().values()}
+        return self._predicate_slots
+
+    def class_rules(self, class_name: ClassDefinitionName) -> _ClassRules:
+        """ Return the dispatch table for class_name """
+        rules = self.classes.get(class_name)
+        if rules is None:
+            rules = self.classes[class_name] = _ClassRules(self, class_name)
+        return rules
+
+
+# Formats that load_iter reads a line at a time
+LINE_FORMATS = {'nt', 'ntriples', 'nt11', 'nquads'}
+
+# Number of subjects whose triples load_iter holds in memory before it spills the least recently used ones to disk
+DEFAULT_MAX_IN_MEMORY_SUBJECTS = 64 * 1024
+
+class _SourceBNodes(dict):
+    """
+    Blank node context for rdflib's N-Triples parser that maps each label to the BNode with that label.  The parser
+    otherwise remembers a fresh BNode for every label it has seen
+    """
+    def get(self, label: str, default: Any = None) -> str:
+        return label
+
+
+class _LineParser:
+    """
+    Parses one line of N-Triples or N-Quads at a time with rdflib's N-Quads parser, which also reads N-Triples.  The
+    graph of a quad is ignored.  This object is the parser's sink
+    """
+    identifier = None
+
+    def __init__(self):
+        self.parser = NQuadsParser(sink=self, bnode_context=_SourceBNodes())
+        self.triple: Optional[Tuple[VALID_SUBJECT, URIRef, Node]] = None
+
+    def get_context(self, _: Any) -> "_LineParser":
+        return self
+
+    def add(self, triple: Tuple[VALID_SUBJECT, URIRef, Node]) -> None:
+        self.triple = triple
+
+    def parse(self, line: str) -> Optional[Tuple[VALID_SUBJECT, URIRef, Node]]:
+        """
+        :return: triple, or None for blank and comment lines
+        """
+        self.triple = None
+        self.parser.line = line.strip()
+        try:
+            self.parser.parseline()
+        except ParseError as e:
+            raise ValueError(f'Invalid N-Triples line: {line!r}') from e
+        return self.triple
+
+
+class _SubjectIndex:
+    """
+    (predicate, object) pairs by subject.  The most recently used subjects are held in memory and the rest are
+    spilled to a temporary shelf on disk
+    """
+    def __init__(self, max_in_memory: int):
+        self.max_in_memory = max_in_memory
+        self.recent: OrderedDict = OrderedDict()
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+        self._spilled: Optional[shelve.Shelf] = None
+
+    def get(self, subject: VALID_SUBJECT) -> Optional[List[Tuple[Node, Node]]]:
+        pairs = self.recent.get(subject)
+        if pairs is not None:
+            self.recent.move_to_end(subject)
+        elif self._spilled is not None:
+            pairs = self._spilled.get(subject.n3())
+            if pairs is not None:
+                self._put(subject, pairs)
+        return pairs
+
+    def add(self, subject: VALID_SUBJECT, pairs: List[Tuple[Node, Node]]) -> None:
+        """ Add pairs to those of subject.  As in a Graph, repeated triples are only kept once """
+        existing = self.get(subject)
+        self._put(subject, list(dict.fromkeys(existing + pairs if existing else pairs)))
+
+    def discard(self, subject: VALID_SUBJECT) -> None:
+        if self.recent.pop(subject, None) is None and self._spilled is not None:
+            self._spilled.pop(subject.n3(), None)
+
+    def _put(self, subject: VALID_SUBJECT, pairs: List[Tuple[Node, Node]]) -> None:
+        self.recent[subject] = pairs
+        self.recent.move_to_end(subject)
+        while len(self.recent) > self.max_in_memory:
+            if self._spilled is None:
+                self._tmpdir = tempfile.TemporaryDirectory()
+                self._spilled = shelve.open(os.path.join(self._tmpdir.name, 'subjects'))
+            old_subject, old_pairs = self.recent.popitem(last=False)
+            self._spilled[old_subject.n3()] = old_pairs
+
+    def close(self) -> None:
+        if self._spilled is not None:
+            self._spilled.close()
+            self._tmpdir.cleanup()
+            self._spilled = self._tmpdir = None
+
+
+@dataclass
+class _PendingRoot:
+    """ A root subject whose inlined objects haven't all been read yet """
+    subject: VALID_SUBJECT
+    members: Dict[VALID_SUBJECT, ClassDefinitionName]    # root and the nodes inlined under it, with their classes
+    missing: Set[VALID_SUBJECT]                           # members with no triples yet
+    seq: int                                              # order of appearance among the roots
+
+
+@dataclass
+class _WalkJob:
+    """ Everything a from_rdf_graph worker process needs to construct the objects under a set of roots """
+    loader: "RDFLibLoader"
+    graph: Optional[Graph]
+    schemaview: SchemaView
+    target_class: Type[YAMLRoot]
+    namespaces: Namespaces
+    uri_to_class_map: Dict[str, ClassDefinition]
+    cast_literals: bool
+    ignore_unmapped_predicates: bool
+    report_visited: bool
+
+
+_walk_job: Optional[_WalkJob] = None
+
+
+def _init_walk_worker(job: _WalkJob, graph_nt: Optional[str]) -> None:
+    """ Process pool initializer.  A forked worker inherits the graph, any other gets it as N-Triples """
+    global _walk_job
+    if graph_nt is not None:
+        job.graph = Graph()
+        job.graph.parse(data=graph_nt, format='nt')
+    _walk_job = job
+
+
+def _walk_roots(root_subjects: List[VALID_SUBJECT]) -> Tuple[List[YAMLRoot], Set[URIRef], Optional[Set[VALID_SUBJECT]]]:
+    """
+    Construct the instances for root_subjects in a worker process
+
+    :return: instances, unmapped predicates, and the subjects visited if the job asks for them
+    """
+    job = _walk_job
+    unmapped_predicates = set()
+    root_dicts, obj_map, _ = \
+        job.loader._walk(root_subjects, job.target_class.class_name, job.schemaview, job.namespaces,
+                         job.uri_to_class_map, job.graph.predicate_objects, job.cast_literals,
+                         job.ignore_unmapped_predicates, unmapped_predicates)
+    job.loader._resolve_pointers(root_dicts, obj_map)
+    return [job.target_class(**x) for x in root_dicts], unmapped_predicates, \
+        set(obj_map) if job.report_visited else None
+
+
 class RDFLibLoader(Loader):
     """
     Loads objects from rdflib Graphs into the python target_class structure
 
     Note: this is a more complete replacement for rdf_loader
     """
+    # Dispatch tables for the schemaview most recently loaded with
+    _plans: Optional[_LoadPlans] = None
+
     def from_rdf_graph(self, graph: Graph, schemaview: SchemaView, target_class: Type[YAMLRoot],
                        prefix_map: Dict[str, str] = None,
                        cast_literals: bool = True,
                        allow_unprocessed_triples: bool = True,
-                       ignore_unmapped_predicates: bool = False) -> List[YAMLRoot]:
+                       ignore_unmapped_predicates: bool = False,
+                       workers: Optional[int] = None,
+                       chunksize: Optional[int] = None,
+                       mp_context: Optional[BaseContext] = None) -> List[YAMLRoot]:
         """
         Loads objects from graph into lists of the python target_class structure,
         recursively walking RDF graph from instances of target_class.
@@ -41,10 +289,94 @@ class RDFLibLoader(Loader):
         :param schemaview: schema to which graph conforms
         :param target_class: class which root nodes should instantiate
         :param prefix_map: additional prefix mappings for data objects
+        :param allow_unprocessed_triples: if False then triples not reachable from a root node raise an error.  If
+        True, unprocessed triples are only counted when INFO logging is enabled
         :param ignore_unmapped_predicates: if True then a predicate that has no mapping to a slot does not raise an error
+        :param workers: number of worker processes to divide the root subjects between.  None or 1 loads sequentially
+        in this process.  The result is the same either way
+        :param chunksize: number of root subjects handed to a worker at a time.  Defaults to a quarter of each worker's
+        share
+        :param mp_context: multiprocessing context to start the workers with.  Defaults to multiprocessing's default
+        context
         :return: all instances of target class type
         """
-        namespaces = schemaview.namespaces()
+        uri_to_class_map = self._uri_to_class_map(schemaview)
+        namespaces = self._namespaces(schemaview, prefix_map)
+        if prefix_map:
+            for k, v in prefix_map.items():
+                graph.namespace_manager.bind(k, URIRef(v))
+        # Step 1: Create stub root dict-objects
+        target_class_uriref: URIRef = target_class.class_class_uri
+        root_subjects: List[VALID_SUBJECT] = list(graph.subjects(RDF.type, target_class_uriref))
+        logging.debug(f'ROOTS = {root_subjects}')
+        # Step 2: walk RDF graph starting from root subjects, constructing dict tree
+        unmapped_predicates = set()
+        check_unprocessed = not allow_unprocessed_triples or logging.getLogger().isEnabledFor(logging.INFO)
+        if workers and workers > 1 and len(root_subjects) > 1:
+            job = _WalkJob(self, graph, schemaview, target_class, namespaces, uri_to_class_map, cast_literals,
+                           ignore_unmapped_predicates, check_unprocessed)
+            objs, obj_map = self._walk_in_pool(job, root_subjects, workers, chunksize, unmapped_predicates,
+                                               mp_context)
+            n_processed_triples = sum(1 for s in obj_map for _ in graph.predicate_objects(s)) \
+                if check_unprocessed else 0
+        else:
+            objs = None
+            root_dicts, obj_map, n_processed_triples = \
+                self._walk(root_subjects, target_class.class_name, schemaview, namespaces, uri_to_class_map,
+                           graph.predicate_objects, cast_literals, ignore_unmapped_predicates, unmapped_predicates)
+        if unmapped_predicates:
+            logging.info(f'Unmapped predicated: {unmapped_predicates}')
+        if check_unprocessed:
+            # Every triple of a visited subject is processed, so the unprocessed triples are those of the subjects
+            # that were never reached.  They can be counted and listed without holding all the triples in memory
+            n_unprocessed_triples = len(graph) - n_processed_triples
+            logging.info(f'Triple processed = {n_processed_triples}, unprocessed = {n_unprocessed_triples}')
+            if n_unprocessed_triples > 0 and not allow_unprocessed_triples:
+                for t in graph.triples((None, None, None)):
+                    if t[0] not in obj_map:
+                        logging.warning(f'  Unprocessed: {t}')
+                raise ValueError(f'Unprocessed triples: {n_unprocessed_triples}')
+        if objs is not None:
+            return objs
+        # Step 3: replace inline pointers with object dicts
+        self._resolve_pointers(root_dicts, obj_map)
+        # Final step: translate dicts into instances of target_class
+        return [target_class(**x) for x in root_dicts]
+
+    @staticmethod
+    def _walk_in_pool(job: _WalkJob, root_subjects: List[VALID_SUBJECT], workers: int, chunksize: Optional[int],
+                      unmapped_predicates: Set[URIRef],
+                      mp_context: Optional[BaseContext] = None) -> Tuple[List[YAMLRoot], Set[VALID_SUBJECT]]:
+        """
+        Construct the instances for root_subjects in a pool of worker processes, each taking a contiguous slice of
+        root_subjects at a time
+
+        :return: the instances, in the order that a sequential walk produces them, and the subjects visited (if
+        job.report_visited)
+        """
+        if not chunksize:
+            chunksize = max(1, -(-len(root_subjects) // (workers * 4)))
+        chunks = [root_subjects[i:i + chunksize] for i in range(0, len(root_subjects), chunksize)]
+        context = mp_context or multiprocessing.get_context()
+        if context.get_start_method() == 'fork':
+            initargs = (job, None)
+        else:
+            initargs = (replace(job, graph=None), job.graph.serialize(format='nt'))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_walk_worker,
+                                 initargs=initargs) as executor:
+            results = list(executor.map(_walk_roots, chunks))
+        # A sequential walk visits the roots last to first
+        objs = []
+        visited = set()
+        for chunk_objs, chunk_unmapped, chunk_visited in reversed(results):
+            objs += chunk_objs
+            unmapped_predicates.update(chunk_unmapped)
+            if chunk_visited:
+                visited.update(chunk_visited)
+        return objs, visited
+
+    @staticmethod
+    def _uri_to_class_map(schemaview: SchemaView) -> Dict[str, ClassDefinition]:
         uri_to_class_map = {}
         for cn, c in schemaview.all_classes().items():
             uri = schemaview.get_uri(c, expand=True)
@@ -55,118 +387,153 @@ class RDFLibLoader(Loader):
                 else:
                     logging.error(f'Inconsistent URI to class map: {uri} -> {c2.name}, {c.name}')
             uri_to_class_map[uri] = c
+        return uri_to_class_map
+
+    @staticmethod
+    def _namespaces(schemaview: SchemaView, prefix_map: Optional[Dict[str, str]]) -> Namespaces:
+        """
+        Return the namespaces used to compact identifiers and references: the schema's, with prefix_map added.
+
+        This is the object that schemaview.namespaces() returns, so the prefixes are added to it, as they always have
+        been.  Passing it along explicitly means that worker processes, which have their own schemaview, compact
+        identifiers with the same prefixes.
+        """
+        namespaces = schemaview.namespaces()
         # data prefix map: supplements or overrides existing schema prefix map
         if prefix_map:
             for k, v in prefix_map.items():
                 namespaces[k] = v
-                graph.namespace_manager.bind(k, URIRef(v))
-        # Step 1: Create stub root dict-objects
-        target_class_uriref: URIRef = target_class.class_class_uri
-        root_dicts: List[ANYDICT] = []
-        root_subjects: List[VALID_SUBJECT] = list(graph.subjects(RDF.type, target_class_uriref))
-        logging.debug(f'ROOTS = {root_subjects}')
-        # Step 2: walk RDF graph starting from root subjects, constructing dict tree
+        return namespaces
+
+    def _load_plans(self, schemaview: SchemaView) -> _LoadPlans:
+        """ Return the dispatch tables for schemaview, building new ones if it or its namespaces have changed """
+        plans = self._plans
+        if plans is None or not plans.is_current(schemaview):
+            plans = self._plans = _LoadPlans(schemaview)
+        return plans
+
+    @staticmethod
+    def _subject_class(subject: VALID_SUBJECT, subject_class: ClassDefinitionName, plans: _LoadPlans,
+                       uri_to_class_map: Dict[str, ClassDefinition],
+                       pairs: List[Tuple[Node, Node]]) -> Tuple[ClassDefinitionName, _ClassRules]:
+        """ Return the class of subject, which its type designator (if any) can narrow, and the rules for it """
+        class_rules = plans.class_rules(subject_class)
+        if class_rules.type_designator:
+            type_vals = [o for p, o in pairs if p == class_rules.type_designator]
+            if len(type_vals) > 0:
+                type_classes = [uri_to_class_map[str(x)] for x in type_vals]
+                if len(type_classes) > 1:
+                    raise ValueError(f'Ambiguous types for {subject} == {type_classes}')
+                logging.info(f'Replacing {subject_class} with {type_classes}')
+                subject_class = type_classes[0].name
+                class_rules = plans.class_rules(subject_class)
+        return subject_class, class_rules
+
+    def _walk(self, root_subjects: List[VALID_SUBJECT], root_class: ClassDefinitionName, schemaview: SchemaView,
+              namespaces: Namespaces, uri_to_class_map: Dict[str, ClassDefinition],
+              predicate_objects: Callable[[VALID_SUBJECT], Iterable[Tuple[Node, Node]]],
+              cast_literals: bool, ignore_unmapped_predicates: bool,
+              unmapped_predicates: Set[URIRef]) -> Tuple[List[ANYDICT], Dict[VALID_SUBJECT, ANYDICT], int]:
+        """
+        Walk the triples reachable from root_subjects, constructing a dict tree
+
+        :param predicate_objects: function returning the (predicate, object) pairs of a subject
+        :param unmapped_predicates: collects predicates that don't map to slots
+        :return: root dicts, map from each visited node to its dict, and number of triples processed
+        """
         node_tuples_to_visit: List[Tuple[VALID_SUBJECT, ClassDefinitionName]]  ## nodes and their type still to visit
-        node_tuples_to_visit = [(subject, target_class.class_name) for subject in root_subjects]
-        uri_to_slot: Dict[str, SlotDefinition]  ## lookup table for RDF predicates -> slots
-        uri_to_slot = {URIRef(schemaview.get_uri(s, expand=True)): s for s in schemaview.all_slots().values()}
+        node_tuples_to_visit = [(subject, root_class) for subject in root_subjects]
+        root_dicts: List[ANYDICT] = []
+        root_set = set(root_subjects)
         processed: Set[VALID_SUBJECT] = set()  ## track nodes already visited, or already scheduled
         for n, _ in node_tuples_to_visit:
             processed.add(n)
         obj_map: Dict[VALID_SUBJECT, ANYDICT] = {}  ## map from an RDF node to its dict representation
-        unmapped_predicates = set()
-        processed_triples: Set[Tuple] = set()
+        n_processed_triples = 0
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        plans = self._load_plans(schemaview)
         while len(node_tuples_to_visit) > 0:
             subject, subject_class = node_tuples_to_visit.pop()
             processed.add(subject)
-            dict_obj = self._get_id_dict(subject, schemaview, subject_class)
-            if subject in root_subjects:
+            first_visit = subject not in obj_map
+            dict_obj = self._get_id_dict(subject, schemaview, subject_class, namespaces, plans)
+            if subject in root_set:
                 root_dicts.append(dict_obj)
             obj_map[subject] = dict_obj
-            type_designator_slot = schemaview.get_type_designator_slot(subject_class)
-            if type_designator_slot:
-                td_iri = schemaview.get_uri(type_designator_slot, expand=True)
-                type_vals = list(graph.objects(subject, URIRef(td_iri)))
-                if len(type_vals) > 0:
-                    type_classes = [uri_to_class_map[str(x)] for x in type_vals]
-                    if len(type_classes) > 1:
-                        raise ValueError(f'Ambiguous types for {subject} == {type_classes}')
-                    logging.info(f'Replacing {subject_class} with {type_classes}')
-                    subject_class = type_classes[0].name
+            pairs = list(predicate_objects(subject))
+            subject_class, class_rules = \
+                self._subject_class(subject, subject_class, plans, uri_to_class_map, pairs)
             # process all triples for this node
-            for (_, p, o) in graph.triples((subject, None, None)):
-                processed_triples.add((subject,p,o))
-                logging.debug(f' Processing triple {subject} {p} {o}, subject type = {subject_class}')
+            for p, o in pairs:
+                if first_visit:
+                    n_processed_triples += 1
+                if debug:
+                    logging.debug(f' Processing triple {subject} {p} {o}, subject type = {subject_class}')
                 if p == RDF.type:
-                    logging.debug(f'Ignoring RDF.type for {subject} {o}, we automatically infer this from {subject_class}')
-                elif p not in uri_to_slot:
+                    if debug:
+                        logging.debug(f'Ignoring RDF.type for {subject} {o}, we automatically infer this from {subject_class}')
+                    continue
+                rule = class_rules.rule(p)
+                if rule is None:
                     if ignore_unmapped_predicates:
                         unmapped_predicates.add(p)
                     else:
                         raise MappingError(f'No pred for {p} {type(p)}')
+                    continue
+                range_applicable_elements = rule.range_elements
+                slot_name = rule.slot_name
+                if isinstance(o, Literal):
+                    if EnumDefinition.class_name in range_applicable_elements:
+                        if debug:
+                            logging.debug(f'Assuming no meaning assigned for value {o} for Enum {rule.range}')
+                    elif TypeDefinition.class_name not in range_applicable_elements:
+                        raise ValueError(f'Cannot map Literal {o} to a slot {slot_name} whose range {rule.range} is not a type;')
+                    v = o.value
+                elif isinstance(o, BNode):
+                    if not rule.inlined:
+                        logging.error(f'blank nodes should be inlined; {slot_name}={o} in {subject}')
+                    v = Pointer(o)
                 else:
-                    slot = schemaview.induced_slot(uri_to_slot[p].name, subject_class)
-                    range_applicable_elements = schemaview.slot_applicable_range_elements(slot)
-                    is_inlined = schemaview.is_inlined(slot)
-                    slot_name = underscore(slot.name)
-                    if isinstance(o, Literal):
-                        if EnumDefinition.class_name in range_applicable_elements:
-                            logging.debug(f'Assuming no meaning assigned for value {o} for Enum {slot.range}')
-                        elif TypeDefinition.class_name not in range_applicable_elements:
-                            raise ValueError(f'Cannot map Literal {o} to a slot {slot.name} whose range {slot.range} is not a type;')
-                        v = o.value
-                    elif isinstance(o, BNode):
-                        if not is_inlined:
-                            logging.error(f'blank nodes should be inlined; {slot_name}={o} in {subject}')
-                        v = Pointer(o)
-                    else:
-                        if ClassDefinition.class_name in range_applicable_elements:
+                    if ClassDefinition.class_name in range_applicable_elements:
+                        v = namespaces.curie_for(o)
+                        if v is None:
+                            logging.debug(f'No CURIE for {p}={o} in {subject} [{subject_class}]')
+                            v = str(o)
+                    elif EnumDefinition.class_name in range_applicable_elements:
+                        # if a PV has a meaning URI declared, map this
+                        # back to a text representation
+                        v = namespaces.curie_for(o)
+                        matches = [rule.enum_meanings[m] for m in (v, str(o)) if m in rule.enum_meanings]
+                        if matches:
+                            v = min(matches)[1]
+                    elif TypeDefinition.class_name in range_applicable_elements:
+                        if cast_literals:
                             v = namespaces.curie_for(o)
                             if v is None:
-                                logging.debug(f'No CURIE for {p}={o} in {subject} [{subject_class}]')
                                 v = str(o)
-                        elif EnumDefinition.class_name in range_applicable_elements:
-                            # if a PV has a meaning URI declared, map this
-                            # back to a text representation
-                            v = namespaces.curie_for(o)
-                            e = schemaview.get_enum(slot.range)
-                            for pv in e.permissible_values.values():
-                                if v == pv.meaning or str(o) == pv.meaning:
-                                    v = pv.text
-                                    break
-                        elif TypeDefinition.class_name in range_applicable_elements:
-                            if cast_literals:
-                                v = namespaces.curie_for(o)
-                                if v is None:
-                                    v = str(o)
-                                logging.debug(f'Casting {o} to string')
-                            else:
-                                raise ValueError(f'Expected literal value ({range_applicable_elements}) for {slot_name}={o}')
-                        if is_inlined:
-                            # the object of the triple may not yet be processed;
-                            # we store a pointer to o, and then replace this later
-                            v = Pointer(o)
-                    if slot.multivalued:
-                        if slot_name not in dict_obj:
-                            dict_obj[slot_name] = []
-                        dict_obj[slot_name].append(v)
-                    else:
-                        dict_obj[slot_name] = v
-                    if o not in processed:
-                        # if o instantiates a class, add to list of nodes to be visited.
-                        # force type based on range constraint
-                        if slot.range in schemaview.all_classes():
-                            node_tuples_to_visit.append((o, ClassDefinitionName(slot.range)))
-        if unmapped_predicates:
-            logging.info(f'Unmapped predicated: {unmapped_predicates}')
-        unprocessed_triples = set(graph.triples((None, None, None))) - processed_triples
-        logging.info(f'Triple processed = {len(processed_triples)}, unprocessed = {len(unprocessed_triples)}')
-        if len(unprocessed_triples) > 0:
-            if not allow_unprocessed_triples:
-                for t in unprocessed_triples:
-                    logging.warning(f'  Unprocessed: {t}')
-                raise ValueError(f'Unprocessed triples: {len(unprocessed_triples)}')
-        # Step 2: replace inline pointers with object dicts
+                            logging.debug(f'Casting {o} to string')
+                        else:
+                            raise ValueError(f'Expected literal value ({range_applicable_elements}) for {slot_name}={o}')
+                    if rule.inlined:
+                        # the object of the triple may not yet be processed;
+                        # we store a pointer to o, and then replace this later
+                        v = Pointer(o)
+                if rule.multivalued:
+                    if slot_name not in dict_obj:
+                        dict_obj[slot_name] = []
+                    dict_obj[slot_name].append(v)
+                else:
+                    dict_obj[slot_name] = v
+                if o not in processed:
+                    # if o instantiates a class, add to list of nodes to be visited.
+                    # force type based on range constraint
+                    if rule.range_class:
+                        node_tuples_to_visit.append((o, rule.range_class))
+        return root_dicts, obj_map, n_processed_triples
+
+    @staticmethod
+    def _resolve_pointers(root_dicts: List[ANYDICT], obj_map: Dict[VALID_SUBJECT, ANYDICT]) -> None:
+        """ Replace the inline pointers in the dict trees under root_dicts with the dicts they point to """
         def repl(v):
             if isinstance(v, Pointer):
                 v2 = obj_map[v.obj]
@@ -192,13 +559,19 @@ class RDFLibLoader(Loader):
                     if isinstance(v, dict):
                         objs_to_visit.append(v)
                 obj[k] = v
-        # Final step: translate dicts into instances of target_class
-        return [target_class(**x) for x in root_dicts]
 
-    def _get_id_dict(self, node: VALID_SUBJECT, schemaview: SchemaView, cn: ClassDefinitionName) -> ANYDICT:
-        id_slot = schemaview.get_identifier_slot(cn)
+    def _get_id_dict(self, node: VALID_SUBJECT, schemaview: SchemaView, cn: ClassDefinitionName,
+                     namespaces: Optional[Namespaces] = None, plans: Optional[_LoadPlans] = None) -> ANYDICT:
+        """
+        Return the stub dictionary for node as an instance of cn
+
+        :param namespaces: namespaces to compact node with.  Defaults to schemaview.namespaces().  from_rdf_graph
+        passes the result of _namespaces, which is the same object once a prefix_map has been added to it
+        :param plans: dispatch tables for schemaview, if the caller already has them
+        """
+        id_slot = (plans or self._load_plans(schemaview)).class_rules(cn).id_slot
         if not isinstance(node, BNode):
-            id_val = schemaview.namespaces().curie_for(node)
+            id_val = (schemaview.namespaces() if namespaces is None else namespaces).curie_for(node)
             if id_val == None:
                 id_val = str(node)
             return {id_slot.name: id_val}
@@ -233,8 +606,15 @@ class RDFLibLoader(Loader):
             g = source
         else:
             g = Graph()
+            fname = local_file_name(source)
             if '\n' in source:
                 g.parse(data=source, format=fmt)
+            elif fname and compression_type(fname):
+                # rdflib reads the decompressed stream itself, line by line for the line based formats
+                with open_binary(fname) as f:
+                    g.parse(source=f, format=fmt)
+            elif get_url_cache() is not None and source_url(source):
+                g.parse(data=read_source(source), format=fmt)
             else:
                 g.parse(source, format=fmt)
         objs = self.from_rdf_graph(g, schemaview=schemaview, target_class=target_class, prefix_map=prefix_map, **kwargs)
@@ -242,6 +622,157 @@ class RDFLibLoader(Loader):
             raise DataNotFoundError(f'Got {len(objs)} of type {target_class} from source, expected exactly 1')
         return objs[0]
 
+    def load_iter(self, source: Union[str, TextIO], target_class: Type[YAMLRoot], *,
+                  schemaview: SchemaView,
+                  prefix_map: Dict[str, str] = None,
+                  fmt: str = 'nt',
+                  grouped: bool = True,
+                  cast_literals: bool = True,
+                  ignore_unmapped_predicates: bool = False,
+                  max_in_memory_subjects: int = DEFAULT_MAX_IN_MEMORY_SUBJECTS) -> Iterator[YAMLRoot]:
+        """
+        Load the instances of target_class in an N-Triples or N-Quads source one at a time, without building an rdflib
+        Graph
+
+        If the triples are grouped by subject (as they are in sorted output), each instance is yielded as soon as the
+        triples of all the objects inlined under it have been read.  Otherwise (grouped=False) the instances are
+        yielded once the whole source has been read.  Either way, triples that have been read are indexed by subject,
+        with all but the max_in_memory_subjects most recently used subjects spilled to a temporary file.  When the
+        triples are grouped, the triples of an instance and of the objects inlined under it are dropped once it has
+        been yielded.
+
+        Unlike from_rdf_graph, triples that can't be reached from a root are not reported.
+
+        :param source: file name, text or open text stream
+        :param target_class: class which root nodes should instantiate
+        :param schemaview: schema to which the source conforms
+        :param prefix_map: additional prefix mappings for data objects
+        :param fmt: one of LINE_FORMATS
+        :param grouped: True means that all the triples of a subject are on consecutive lines.  A subject that
+        reappears after it has been used, or an object inlined under a root after it was loaded as part of another
+        root, raises a ValueError
+        :param cast_literals: see from_rdf_graph
+        :param ignore_unmapped_predicates: see from_rdf_graph
+        :param max_in_memory_subjects: number of subjects whose triples are held in memory
+        :return: instances of target_class
+        """
+        if fmt not in LINE_FORMATS:
+            raise ValueError(f'{fmt} is not a line based format: use one of {sorted(LINE_FORMATS)}')
+        uri_to_class_map = self._uri_to_class_map(schemaview)
+        namespaces = self._namespaces(schemaview, prefix_map)
+        plans = self._load_plans(schemaview)
+        target_class_uriref = URIRef(target_class.class_class_uri)
+        index = _SubjectIndex(max_in_memory_subjects)
+        pending: Dict[VALID_SUBJECT, _PendingRoot] = {}         # in order of appearance
+        sequence = count()
+        watchers: Dict[VALID_SUBJECT, Set[VALID_SUBJECT]] = {}  # node -> pending roots that it is a member of
+        used: Set[VALID_SUBJECT] = set()                        # roots and their members that have been yielded
+        unmapped_predicates = set()
+
+        def explore(root: _PendingRoot, subject: VALID_SUBJECT, subject_class: ClassDefinitionName) -> None:
+            """ Add subject and whatever is inlined under it to the members of root """
+            to_visit = [(subject, subject_class)]
+            while to_visit:
+                subject, subject_class = to_visit.pop()
+                if subject in used:
+                    raise ValueError(f'{subject} is inlined under {root.subject} and under a root that has already '
+                                     f'been loaded. Use grouped=False')
+                root.members[subject] = subject_class
+                watchers.setdefault(subject, set()).add(root.subject)
+                pairs = index.get(subject)
+                if pairs is None:
+                    root.missing.add(subject)
+                    continue
+                root.missing.discard(subject)
+                _, class_rules = self._subject_class(subject, subject_class, plans, uri_to_class_map, pairs)
+                for p, o in pairs:
+                    rule = class_rules.rule(p) if p != RDF.type else None
+                    if rule is not None and rule.range_class and o not in root.members and \
+                            (rule.inlined or isinstance(o, BNode)):
+                        to_visit.append((o, rule.range_class))
+
+        def build(root: _PendingRoot) -> YAMLRoot:
+            """ Construct the instance for root.  Objects that are referenced rather than inlined aren't walked """
+            del pending[root.subject]
+            root_dicts, obj_map, _ = \
+                self._walk([root.subject], target_class.class_name, schemaview, namespaces, uri_to_class_map,
+                           lambda s: (index.get(s) or []) if s in root.members else [], cast_literals, ignore_unmapped_predicates,
+                           unmapped_predicates)
+            self._resolve_pointers(root_dicts, obj_map)
+            for member in root.members:
+                roots = watchers.get(member)
+                if roots is not None:
+                    roots.discard(root.subject)
+                    if roots:
+                        # Also inlined under a root that is still pending
+                        continue
+                    del watchers[member]
+                if grouped:
+                    # No root that has been read needs the triples of member again
+                    used.add(member)
+                    index.discard(member)
+            return target_class(**root_dicts[0])
+
+        def add_group(subject: VALID_SUBJECT, pairs: List[Tuple[Node, Node]]) -> Iterator[YAMLRoot]:
+            """ Index the triples of subject, yielding any instances that are now complete """
+            if subject in used:
+                raise ValueError(f'Triples for {subject} appear after it has been loaded: the source is not grouped '
+                                 f'by subject. Use grouped=False')
+            index.add(subject, pairs)
+            # Only the roots explored here can have become complete.  Any others were yielded as soon as they were
+            complete: Dict[VALID_SUBJECT, _PendingRoot] = {}
+            if (RDF.type, target_class_uriref) in pairs and subject not in pending:
+                root = pending[subject] = _PendingRoot(subject, {}, set(), next(sequence))
+                if grouped:
+                    explore(root, subject, target_class.class_name)
+                    if not root.missing:
+                        complete[subject] = root
+            if grouped:
+                for root_subject in list(watchers.get(subject, ())):
+                    root = pending[root_subject]
+                    explore(root, subject, root.members[subject])
+                    if not root.missing:
+                        complete[root_subject] = root
+                for root in sorted(complete.values(), key=lambda r: r.seq):
+                    yield build(root)
+
+        try:
+            with self._open_lines(source) as lines:
+                subject, pairs = None, []
+                parser = _LineParser()
+                for line in lines:
+                    triple = parser.parse(line)
+                    if triple is None:
+                        continue
+                    if triple[0] != subject:
+                        if subject is not None:
+                            yield from add_group(subject, pairs)
+                        subject, pairs = triple[0], []
+                    pairs.append((triple[1], triple[2]))
+                if subject is not None:
+                    yield from add_group(subject, pairs)
+            for root in list(pending.values()):
+                if not grouped:
+                    explore(root, root.subject, target_class.class_name)
+                yield build(root)
+        finally:
+            index.close()
+        if unmapped_predicates:
+            logging.info(f'Unmapped predicated: {unmapped_predicates}')
+
+    @staticmethod
+    @contextmanager
+    def _open_lines(source: Union[str, TextIO]) -> Iterator[TextIO]:
+        if not isinstance(source, str):
+            yield source
+        elif '\n' in source:
+            yield StringIO(source)
+        elif local_file_name(source):
+            with open_text(local_file_name(source)) as f:
+                yield f
+        else:
+            yield StringIO(read_source(source))
+
     def loads(self, source: str, **kwargs) -> YAMLRoot:
         return self.load(source, **kwargs)
 
@@ -15,15 +15,17 @@ class YAMLLoader(Loader):
 
     def load_any(self, source: Union[str, dict, TextIO], target_class: Type[YAMLRoot], *, base_dir: Optional[str] = None,
                  metadata: Optional[FileInfo] = None, **_) -> Union[YAMLRoot, List[YAMLRoot]]:
-        def loader(data: Union[str, dict], _: FileInfo) -> Optional[Dict]:
-            return yaml.load(StringIO(data), DupCheckYamlLoader) if isinstance(data, str) else data
+        def loader(data: Union[str, dict, TextIO], _: FileInfo) -> Optional[Dict]:
+            if isinstance(data, str):
+                data = StringIO(data)
+            return yaml.load(data, DupCheckYamlLoader) if hasattr(data, 'read') else data
 
         if not metadata:
             metadata = FileInfo()
         if base_dir and not metadata.base_path:
             metadata.base_path = base_dir
         return self.load_source(source, loader, target_class, accept_header="text/yaml, application/yaml;q=0.9",
-                                metadata=metadata)
+                                metadata=metadata, streaming=True)
 
     def loads_any(self, source: str, target_class: Type[YAMLRoot], *, metadata: Optional[FileInfo] = None, **_) -> Union[YAMLRoot, List[YAMLRoot]]:
         """
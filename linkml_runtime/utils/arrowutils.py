@@ -0,0 +1,193 @@
+"""
+Apache Arrow schemas for LinkML classes, and the conversions between JSON style objects and Arrow rows
+
+pyarrow is an optional dependency.  It is imported when it is first needed.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple, Iterable, Iterator, Callable
+
+from linkml_runtime.linkml_model.meta import ClassDefinitionName, SlotDefinition
+from linkml_runtime.utils.formatutils import underscore
+from linkml_runtime.utils.schemaview import SchemaView
+
+# Field metadata.  JSON_FIELD marks values (or list items) held as JSON text, which we use for inlined classes that
+# recursively contain themselves.  KEY_FIELD names the key of a class that is inlined as a dictionary.
+JSON_FIELD = b'linkml_json'
+KEY_FIELD = b'linkml_key'
+
+# Arrow types for the python base types of the LinkML types.  Anything else is stored as a string.  Decimals are
+# stored as float64, as the rows are written from JSON style objects in which decimals are already floats -- so the
+# mapping is as lossy as JSON output, no more
+_BASE_TYPES = {'int': 'int64', 'Bool': 'bool_', 'float': 'float64', 'Decimal': 'float64'}
+
+
+def import_pyarrow():
+    """ Return the pyarrow module, with a useful message if it isn't installed """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError('The pyarrow package must be installed to read or write Arrow or Parquet data') from e
+    return pyarrow
+
+
+def get_arrow_schema(schemaview: SchemaView, class_name: ClassDefinitionName) -> "pyarrow.Schema":
+    """
+    Return the Arrow schema for instances of class_name
+
+    There is one field per induced slot.  Types map to Arrow integers, floats and booleans where possible and to
+    strings otherwise, multivalued slots become list fields and inlined objects become structs.  References to
+    objects that aren't inlined are stored as their identifiers.  Decimals become (lossy) float64 fields.
+
+    :param schemaview: view over the schema
+    :param class_name: class to describe
+    :return: Arrow schema
+    """
+    pa = import_pyarrow()
+    return pa.schema(_class_fields(schemaview, class_name, ()))
+
+
+def _class_fields(schemaview: SchemaView, class_name: ClassDefinitionName,
+                  path: Tuple[ClassDefinitionName, ...]) -> List["pyarrow.Field"]:
+    return [_slot_field(schemaview, schemaview.induced_slot(sn, class_name), path + (class_name,))
+            for sn in schemaview.class_slots(class_name)]
+
+
+def _slot_field(schemaview: SchemaView, slot: SlotDefinition,
+                path: Tuple[ClassDefinitionName, ...]) -> "pyarrow.Field":
+    pa = import_pyarrow()
+    metadata = {}
+    rng = slot.range
+    if rng in schemaview.all_classes() and schemaview.is_inlined(slot):
+        if rng in path:
+            item_type = pa.string()
+            metadata[JSON_FIELD] = b'true'
+        else:
+            item_type = pa.struct(_class_fields(schemaview, rng, path))
+        if slot.multivalued and not slot.inlined_as_list:
+            key_slot = schemaview.get_identifier_slot(rng, use_key=True)
+            if key_slot is not None:
+                metadata[KEY_FIELD] = underscore(key_slot.name).encode()
+    else:
+        item_type = _arrow_type(schemaview, rng)
+    return pa.field(underscore(slot.alias or slot.name), pa.list_(item_type) if slot.multivalued else item_type,
+                    metadata=metadata or None)
+
+
+def _arrow_type(schemaview: SchemaView, type_name: Optional[str]) -> "pyarrow.DataType":
+    """ Return the Arrow type for a LinkML type, following typeof to the underlying python base type """
+    pa = import_pyarrow()
+    all_types = schemaview.all_types()
+    seen = set()
+    while type_name in all_types and type_name not in seen:
+        seen.add(type_name)
+        typ = all_types[type_name]
+        if typ.base:
+            return getattr(pa, _BASE_TYPES.get(typ.base, 'string'))()
+        type_name = typ.typeof
+    return pa.string()
+
+
+def arrow_row_converter(schema: "pyarrow.Schema") -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Return a function that converts a JSON style object (e.g. from JSONDumper.to_dict) into a row that pyarrow can
+    convert using schema.  The work of interpreting the schema is done once, here, rather than for every row
+
+    :param schema: schema from get_arrow_schema
+    :return: conversion function
+    """
+    converters = [(f.name, _value_converter(f)) for f in schema]
+
+    def convert(obj: Dict[str, Any]) -> Dict[str, Any]:
+        row = {}
+        for name, conv in converters:
+            v = obj.get(name)
+            row[name] = v if conv is None or v is None else conv(v)
+        return row
+    return convert
+
+
+def _value_converter(field: "pyarrow.Field") -> Optional[Callable[[Any], Any]]:
+    """ Return the conversion function for (non-null) values of field, or None if values can be used as is """
+    pa = import_pyarrow()
+    metadata = field.metadata or {}
+    typ = field.type
+    if pa.types.is_list(typ):
+        key_name = metadata.get(KEY_FIELD, b'').decode()
+        item_conv = json.dumps if JSON_FIELD in metadata else _value_converter(typ.value_field)
+
+        def convert_list(value: Any) -> List[Any]:
+            if isinstance(value, dict):
+                # A class inlined as a dictionary
+                entries = []
+                for k, v in value.items():
+                    if key_name and not isinstance(v, dict):
+                        v = {key_name: k}
+                    elif key_name and key_name not in v:
+                        v = dict(v, **{key_name: k})
+                    entries.append(v)
+                value = entries
+            elif not isinstance(value, list):
+                value = [value]
+            return value if item_conv is None else [None if v is None else item_conv(v) for v in value]
+        return convert_list
+    if JSON_FIELD in metadata:
+        return json.dumps
+    if pa.types.is_struct(typ):
+        convert_fields = arrow_row_converter(pa.schema(list(typ)))
+
+        def convert_struct(value: Any) -> Dict[str, Any]:
+            if not isinstance(value, dict):
+                raise ValueError(f'{field.name}: expected an inlined object, got {value!r}')
+            return convert_fields(value)
+        return convert_struct
+    return None
+
+
+def from_arrow_rows(rows: Iterable[Dict[str, Any]], schema: "pyarrow.Schema") -> Iterator[Dict[str, Any]]:
+    """
+    Reverse of the conversion done by arrow_row_converter.  Null values are left in place for the loader to remove
+
+    :param rows: rows, as from pyarrow.RecordBatch.to_pylist
+    :param schema: schema that the rows were written with
+    :return: JSON style objects
+    """
+    json_fields = _json_paths(schema)
+    for row in rows:
+        for path in json_fields:
+            _decode_json(row, path)
+        yield row
+
+
+def _json_paths(schema: "pyarrow.Schema") -> List[Tuple[str, ...]]:
+    """ Return the paths to all JSON encoded fields in schema """
+    pa = import_pyarrow()
+    paths = []
+
+    def visit(field: "pyarrow.Field", path: Tuple[str, ...]) -> None:
+        path = path + (field.name,)
+        if JSON_FIELD in (field.metadata or {}):
+            paths.append(path)
+            return
+        typ = field.type
+        if pa.types.is_list(typ):
+            typ = typ.value_type
+        if pa.types.is_struct(typ):
+            for f in typ:
+                visit(f, path)
+
+    for f in schema:
+        visit(f, ())
+    return paths
+
+
+def _decode_json(node: Any, path: Tuple[str, ...]) -> None:
+    if isinstance(node, list):
+        for e in node:
+            _decode_json(e, path)
+    elif isinstance(node, dict) and path[0] in node and node[path[0]] is not None:
+        if len(path) > 1:
+            _decode_json(node[path[0]], path[1:])
+        else:
+            v = node[path[0]]
+            node[path[0]] = [json.loads(e) for e in v] if isinstance(v, list) else json.loads(v)
@@ -1,14 +1,107 @@
 import json
 import os
+import threading
+from collections import OrderedDict
 from io import TextIOWrapper
-from typing import Optional, Union, List, Any, Dict
+from typing import Optional, Union, List, Any, Dict, Tuple, Callable
 
 import yaml
-from jsonasobj2 import JsonObj, loads
+from jsonasobj2 import JsonObj, as_dict
+
+from linkml_runtime.utils.url_cache import read_source, source_url
 
 CONTEXT_TYPE = Union[str, dict, JsonObj]
 CONTEXTS_PARAM_TYPE = Optional[Union[CONTEXT_TYPE, List[CONTEXT_TYPE]]]
 
+CONTEXT_CACHE_SIZE = 128
+JSONLD_ACCEPT_HEADER = 'application/ld+json, application/json'
+
+_context_cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+_context_cache_lock = threading.Lock()
+_derived_cache_clearers: List[Callable[[], None]] = []
+
+
+def context_source_key(source: str, base_path: Optional[str] = None) -> Tuple:
+    """
+    Identify the current version of a context source
+
+    :param source: JSON text, file name, file:// URI or URL
+    :param base_path: base that a relative source is resolved against
+    :return: key that changes when the content of source may have changed -- the text itself, the URL, or the
+    absolute path along with the file modification time and size
+    """
+    if source.strip().startswith(('{', '[')):
+        return 'text', source
+    url = source_url(source, base_path) if not source.startswith('file://') else None
+    if url is not None:
+        return 'url', url
+    path = source[7:] if source.startswith('file://') else source
+    path = os.path.abspath(os.path.join(base_path, path) if base_path else path)
+    st = os.stat(path)
+    return 'file', path, st.st_mtime_ns, st.st_size
+
+
+def load_context(source: CONTEXT_TYPE, base_path: Optional[str] = None) -> Any:
+    """
+    Return the parsed JSON of a JSON-LD context document
+
+    Documents are read and parsed once per process.  A file is read again when its modification time or size
+    changes.  URLs are fetched once (through the URL cache, if one is installed) until :func:`clear_context_cache`.
+    The result is shared between callers, so must not be modified.
+
+    :param source: JSON text, file name, file:// URI, URL, or an already parsed dict or JsonObj
+    :param base_path: base that a relative source is resolved against
+    :return: parsed JSON
+    """
+    if isinstance(source, JsonObj):
+        return as_dict(source)
+    if not isinstance(source, str):
+        return source
+    key = context_source_key(source, base_path)
+    with _context_cache_lock:
+        if key in _context_cache:
+            _context_cache.move_to_end(key)
+            return _context_cache[key]
+    if key[0] == 'text':
+        doc = json.loads(source)
+    else:
+        doc = json.loads(read_source(key[1], base_path=base_path, accept_header=JSONLD_ACCEPT_HEADER))
+    with _context_cache_lock:
+        _context_cache[key] = doc
+        while len(_context_cache) > CONTEXT_CACHE_SIZE:
+            _context_cache.popitem(last=False)
+    return doc
+
+
+def sources_unchanged(sources: List[Tuple[str, Tuple]]) -> bool:
+    """ True if none of the context sources, given as (source, context_source_key(source)) pairs, have changed """
+    try:
+        return all(context_source_key(source) == key for source, key in sources)
+    except OSError:
+        return False
+
+
+def clear_context_cache() -> None:
+    """ Forget all the context documents that load_context has read, along with anything derived from them """
+    with _context_cache_lock:
+        _context_cache.clear()
+    for clear in _derived_cache_clearers:
+        clear()
+
+
+def register_derived_cache(clear: Callable[[], None]) -> None:
+    """ Register the clear function of a cache of things derived from context documents """
+    _derived_cache_clearers.append(clear)
+
+
+def _as_json_obj(v: Any) -> Any:
+    """ A JsonObj copy of parsed JSON v, as jsonasobj2.loads would have returned it """
+    if isinstance(v, dict):
+        return JsonObj(**{k: _as_json_obj(e) for k, e in v.items()})
+    elif isinstance(v, list):
+        return [_as_json_obj(e) for e in v]
+    return v
+
 
 def merge_contexts(contexts: CONTEXTS_PARAM_TYPE = None, base: Optional[Any] = None) -> JsonObj:
     """ Take a list of JSON-LD contexts, which can be one of:
@@ -38,7 +131,7 @@ def merge_contexts(contexts: CONTEXTS_PARAM_TYPE = None, base: Optional[Any] = N
         if isinstance(context, str):
             # One of filename, URL or json text
             if context.strip().startswith("{"):
-                context = loads(context)
+                context = _as_json_obj(load_context(context))
             elif '://' not in context:
                 context = to_file_uri(context)
         elif not isinstance(context, (JsonObj, str)):
@@ -1,10 +1,47 @@
+import logging
+import os
+from collections import OrderedDict
+from typing import Union, Any, Dict
+
 from json_flattener import KeyConfig, GlobalConfig, Serializer
 from json_flattener.flattener import CONFIGMAP
 from linkml_runtime.linkml_model.meta import SlotDefinitionName, SchemaDefinition, \
     SlotDefinition, ClassDefinition, ClassDefinitionName
 from linkml_runtime.utils.schemaview import SchemaView
 
-def get_configmap(schemaview: SchemaView, index_slot: SlotDefinitionName) -> CONFIGMAP:
+# Number of schema views that get_schemaview keeps
+SCHEMAVIEW_CACHE_SIZE = 16
+
+_schemaview_cache: Dict[Any, SchemaView] = OrderedDict()
+
+
+def get_schemaview(schema: Union[str, SchemaDefinition]) -> SchemaView:
+    """
+    Return a SchemaView over schema, reusing the view from earlier calls with the same schema
+
+    The SCHEMAVIEW_CACHE_SIZE most recently used views are kept.  Views over schema files are rebuilt if the file
+    changes.  Note that, as with any SchemaView, changes made to the schema object itself are only seen if
+    set_modified is called on the view.
+
+    :param schema: schema or schema file name
+    :return: view over schema
+    """
+    if isinstance(schema, str):
+        key = (os.path.abspath(schema), os.path.getmtime(schema)) if os.path.exists(schema) else schema
+    else:
+        # A cached view holds on to its schema, so the id can't be reused by another schema while it is cached
+        key = id(schema)
+    schemaview = _schemaview_cache.get(key)
+    if schemaview is None or (not isinstance(schema, str) and schemaview.schema is not schema):
+        schemaview = _schemaview_cache[key] = SchemaView(schema)
+        while len(_schemaview_cache) > SCHEMAVIEW_CACHE_SIZE:
+            _schemaview_cache.popitem(last=False)
+    else:
+        _schemaview_cache.move_to_end(key)
+    return schemaview
+
+
+def get_configmap(schemaview: SchemaView, index_slot: SlotDefinitionName, sep: str = '_') -> CONFIGMAP:
     """
     Generates a configuration that specifies mapping between a CSV and a JSON structure
 
@@ -12,6 +49,7 @@ def get_configmap(schemaview: SchemaView, index_slot: SlotDefinitionName) -> CON
 
     :param schemaview: LinkML schema view over schema
     :param index_slot: key that indexes the top level object
+    :param sep: separator between the outer and inner slot names in flattened columns
     :return: mapping between top level keys and denormalization configurations
     """
     if index_slot is not None and schemaview is not None:
@@ -19,14 +57,14 @@ def get_configmap(schemaview: SchemaView, index_slot: SlotDefinitionName) -> CON
         if slot.range is not None and slot.range in schemaview.all_classes():
             cm = {}
             for sn in schemaview.class_slots(slot.range):
-                config = _get_key_config(schemaview, slot.range, sn)
+                config = _get_key_config(schemaview, slot.range, sn, sep)
                 if config is not None:
                     cm[sn] = config
             return cm
         else:
-            logging.warn(f'Index slot range not to class: {slot.range}')
+            logging.warning(f'Index slot range not to class: {slot.range}')
     else:
-        logging.warn(f'Index slot or schema not specified')
+        logging.warning(f'Index slot or schema not specified')
     return {}
 
 def _get_key_config(schemaview: SchemaView, tgt_cls: ClassDefinitionName, sn: SlotDefinitionName, sep='_'):
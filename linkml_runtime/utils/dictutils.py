@@ -1,4 +1,3 @@
-import json
 from typing import Dict
 
 from linkml_runtime.dumpers import json_dumper
@@ -11,5 +10,4 @@ def as_simple_dict(element: YAMLRoot) -> Dict:
     :param element: element to return
     :return: simple python dictionary
     """
-    obj = json_dumper.dumps(element=element, inject_type=False)
-    return json.loads(obj)
+    return json_dumper.to_dict(element)
@@ -0,0 +1,94 @@
+import codecs
+import gzip
+import io
+import mmap
+import os
+import time
+from typing import Optional, TextIO, Any, BinaryIO
+
+from hbreader import FileInfo, HBType, detect_type
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Uncompressed files at least this size are read through a memory map rather than a regular file handle
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def local_file_name(source: Any, base_path: Optional[str] = None) -> Optional[str]:
+    """
+    Return the absolute path of source if it names an existing local file
+
+    :param source: file name, URL, block of text or anything else a loader might be handed
+    :param base_path: directory that relative file names are resolved against
+    :return: absolute file name or None if source isn't a local file
+    """
+    if not isinstance(source, str) or detect_type(source, base_path) is not HBType.FILENAME:
+        return None
+    fname = os.path.abspath(source if not base_path or os.path.isabs(source) else os.path.join(base_path, source))
+    return fname if os.path.isfile(fname) else None
+
+
+def compression_type(fname: str) -> Optional[str]:
+    """
+    Determine how fname is compressed from its leading magic bytes.  The file extension is not consulted, so
+    mislabeled files are still read correctly
+
+    :param fname: name of file to test
+    :return: 'gzip', 'zstd' or None if fname is not compressed
+    """
+    with open(fname, 'rb') as f:
+        magic = f.read(len(ZSTD_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if magic == ZSTD_MAGIC:
+        return 'zstd'
+    return None
+
+
+def open_binary(fname: str) -> BinaryIO:
+    """
+    Open fname for binary reads, decompressing gzip and zstd files on the fly (zstd requires the zstandard package)
+
+    :param fname: name of file to open
+    :return: open binary stream.  The caller is responsible for closing it
+    """
+    ctype = compression_type(fname)
+    if ctype == 'gzip':
+        return gzip.open(fname, 'rb')
+    if ctype == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError(f'{fname}: the zstandard package must be installed to read zstd compressed files')
+        return zstandard.ZstdDecompressor().stream_reader(open(fname, 'rb'), closefd=True)
+    return open(fname, 'rb')
+
+
+def open_text(fname: str, open_info: Optional[FileInfo] = None, encoding: str = 'utf-8') -> TextIO:
+    """
+    Open fname for streaming text reads
+
+    gzip and zstd files are decompressed on the fly (zstd requires the zstandard package).  Large uncompressed files
+    are memory mapped and decoded incrementally, so a caller that reads the stream piecemeal never holds the raw text
+    as a single string.
+
+    :param fname: name of file to open
+    :param open_info: filled in with what we learn about the file, as hbreader does
+    :param encoding: text encoding
+    :return: open text stream.  The caller is responsible for closing it
+    """
+    fname = os.path.abspath(fname)
+    if open_info is not None:
+        fstat = os.stat(fname)
+        open_info.source_file = fname
+        open_info.source_file_date = time.ctime(fstat.st_mtime)
+        open_info.source_file_size = fstat.st_size
+        open_info.base_path = os.path.dirname(fname)
+    if compression_type(fname):
+        return io.TextIOWrapper(open_binary(fname), encoding=encoding)
+    if os.path.getsize(fname) >= MMAP_THRESHOLD:
+        with open(fname, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return codecs.getreader(encoding)(mapped)
+    return open(fname, encoding=encoding)
@@ -111,7 +111,8 @@ def is_empty(v: Any) -> bool:
     return v is None or (isinstance(v, (dict, list)) and not v) or (isinstance(v, JsonObj) and not as_dict(v))
 
 
-def remove_empty_items(obj: Any, hide_protected_keys: bool = False, inside: bool = False) -> Any:
+def remove_empty_items(obj: Any, hide_protected_keys: bool = False, inside: bool = False,
+                       share_unchanged: bool = False) -> Any:
     """
     Recursively iterate over obj removing any empty internal entries.  Note:  this returns a _copy_ of obj of we are
     dealing with a list or a dictionary.
@@ -138,40 +139,101 @@ def remove_empty_items(obj: Any, hide_protected_keys: bool = False, inside: bool
     - JSON: https://bugs.python.org/issue16535, https://stackoverflow.com/questions/1960516/python-json-serialize-a-decimal-object
     - YAML: https://stackoverflow.com/questions/21695705/dump-an-python-object-as-yaml-file/51261042, https://github.com/yaml/pyyaml/pull/372
 
+    The tree is walked with an explicit stack, so deeply nested structures don't run into the recursion limit.
+
     :param obj: Object to be tweaked
     :param hide_protected_keys: True means remove keys that begin with an underscore
     :param inside: Keep from removing the outermost container
+    :param share_unchanged: True means that plain lists and dictionaries that have nothing removed or converted are
+    returned as is rather than copied.  Only use this if the result is not going to be modified
     :return: copy of obj with empty items removed or None if obj itself is "empty"
     """
-    if is_list(obj):
-        # for discussion of logic, see: https://github.com/linkml/linkml-runtime/issues/42
-        obj_list = [e for e in [remove_empty_items(l, hide_protected_keys=hide_protected_keys, inside=True)
-                                for l in obj if l != '_root'] if not is_empty(e)]
-        return obj_list if not inside or not is_empty(obj_list) else None
-    elif is_dict(obj):
-        obj_dict = {k: v for k, v in [(k2, remove_empty_items(v2, hide_protected_keys=hide_protected_keys, inside=True))
-                                      for k2, v2 in items(obj)] if not is_empty(v)}
-
-        # https://github.com/linkml/linkml/issues/119
-        # Remove the additional level of nesting with enums
-        if len(obj_dict) == 1 and list(obj_dict.keys())[0] == '_code':
-            enum_text = list(obj_dict.values())[0].get('text', None)
-            if enum_text is not None:
-                return enum_text
-        if hide_protected_keys and len(obj_dict) == 1 and str(list(obj_dict.keys())[0]).startswith('_'):
-            inner_element = list(obj_dict.values())[0]
-            if isinstance(inner_element, dict):
-                obj_dict = inner_element
-        return obj_dict if not inside or not is_empty(obj_dict) else None
-    elif is_empty(obj):
-        return None
-    elif isinstance(obj, Decimal):
-        # note that attempting to implement https://bugs.python.org/issue16535
-        # will not work for yaml serializations
-        v = str(obj)
-        if '.' in v and not v.endswith('.0'):
-            return float(obj)
-        else:
-            return int(obj)
-    else:
-        return obj
+    def clean_leaf(o: Any) -> Any:
+        if isinstance(o, Decimal):
+            # note that attempting to implement https://bugs.python.org/issue16535
+            # will not work for yaml serializations
+            v = str(o)
+            if '.' in v and not v.endswith('.0'):
+                return float(o)
+            else:
+                return int(o)
+        return o
+
+    def open_frame(o: Any) -> list:
+        # A frame is [source, entry iterator, output, is list, unchanged, pending key, pending child]
+        if isinstance(o, JsonObj):
+            src = o._hide_list()
+            if isinstance(src, list):
+                return [src, iter(src), [], True, False, None, None]
+            return [src, o._items(), {}, False, False, None, None]
+        # Only plain containers can be returned as is
+        if isinstance(o, list):
+            return [o, iter(o), [], True, share_unchanged, None, None]
+        return [o, iter(o.items()), {}, False, share_unchanged, None, None]
+
+    def close_frame(frame: list) -> Any:
+        src, _, out, frame_is_list, unchanged, _, _ = frame
+        if not frame_is_list and len(out) == 1:
+            k, v = next(iter(out.items()))
+            # https://github.com/linkml/linkml/issues/119
+            # Remove the additional level of nesting with enums
+            if k == '_code':
+                enum_text = v.get('text', None) if isinstance(v, dict) else None
+                if enum_text is not None:
+                    return enum_text
+            if hide_protected_keys and str(k).startswith('_') and isinstance(v, dict):
+                return v
+        return src if unchanged else out
+
+    containers = (list, dict, JsonObj)
+    if not isinstance(obj, containers):
+        return clean_leaf(obj)
+    stack = [open_frame(obj)]
+    while True:
+        frame = stack[-1]
+        out = frame[2]
+        frame_is_list = frame[3]
+        opened = None
+        for entry in frame[1]:
+            if frame_is_list:
+                # for discussion of logic, see: https://github.com/linkml/linkml-runtime/issues/42
+                key, child = None, entry
+                if child.__class__ is str and child == '_root':
+                    frame[4] = False
+                    continue
+            else:
+                key, child = entry
+            if isinstance(child, containers):
+                frame[5] = key
+                frame[6] = child
+                opened = open_frame(child)
+                break
+            # Cleaned values never include JsonObjs, so we don't need the full is_empty test
+            if child is None:
+                frame[4] = False
+                continue
+            value = clean_leaf(child)
+            if value is not child:
+                frame[4] = False
+            if frame_is_list:
+                out.append(value)
+            else:
+                out[key] = value
+        if opened is not None:
+            stack.append(opened)
+            continue
+
+        # All entries have been cleaned -- pass the result up to the parent
+        stack.pop()
+        value = close_frame(frame)
+        empty = value is None or (isinstance(value, (dict, list)) and not value)
+        if not stack:
+            return None if inside and empty else value
+        parent = stack[-1]
+        if empty or value is not parent[6]:
+            parent[4] = False
+        if not empty:
+            if parent[3]:
+                parent[2].append(value)
+            else:
+                parent[2][parent[5]] = value
@@ -0,0 +1,600 @@
+"""
+Compiled JSON-LD contexts, and the generation of RDF from JSON documents with them
+
+A :class:`CompiledContext` is the result of running JSON-LD 1.1 context processing over a context: the term
+definitions with their IRIs and type coercions already expanded, along with the vocabulary mapping, base and default
+language.  :func:`json_to_rdf` uses one to turn a JSON document straight into triples.  The resulting graph is the
+one that pyld ``expand`` followed by ``to_rdf`` produces, but no expanded document is ever built.
+
+Only the parts of JSON-LD that LinkML generated contexts and JSON use are covered.  Anything else (reverse
+properties, index, language and id maps, @nest, @graph, @import, @json, ...) raises :class:`UnsupportedJSONLD`, so
+that the caller can fall back to pyld.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Any, Dict, List, Tuple, Iterator, Union, FrozenSet
+from urllib.parse import urljoin
+
+from rdflib import Graph, BNode, Literal, RDF, XSD
+from rdflib.term import Node
+
+from linkml_runtime.utils.context_utils import CONTEXTS_PARAM_TYPE, CONTEXT_CACHE_SIZE, load_context, \
+    context_source_key, register_derived_cache, sources_unchanged
+from linkml_runtime.utils.term_interner import TermInterner
+
+KEYWORDS = frozenset({'@base', '@container', '@context', '@direction', '@graph', '@id', '@import', '@included',
+                      '@index', '@json', '@language', '@list', '@nest', '@none', '@prefix', '@propagate',
+                      '@protected', '@reverse', '@set', '@type', '@value', '@version', '@vocab'})
+TERM_KEYS = frozenset({'@id', '@type', '@container', '@context', '@language', '@prefix', '@protected'})
+
+ABSOLUTE_IRI_RE = re.compile(r'^([A-Za-z][A-Za-z0-9+\-.]*|_):[^\s]*$')
+KEYWORD_FORM_RE = re.compile(r'^@[a-zA-Z]+$')
+PREFIX_IRI_RE = re.compile(r'.*[:/?#\[\]@]$')
+DOUBLE_EXP_RE = re.compile(r'(\d)0*E\+?0*(\d)')
+
+XSD_STRING = str(XSD.string)
+XSD_DOUBLE = str(XSD.double)
+
+
+class UnsupportedJSONLD(Exception):
+    """ The context or document uses a part of JSON-LD that isn't compiled """
+    pass
+
+
+class _NotSet:
+    """ Marks a term definition entry that is absent, as distinct from one that is null """
+    def __repr__(self) -> str:
+        return 'NOT_SET'
+
+
+NOT_SET = _NotSet()
+
+
+@dataclass
+class TermDefinition:
+    """ A processed term definition """
+    iri: Optional[str]                          # expanded IRI or keyword.  None if the term is explicitly unmapped
+    type: Optional[str] = None                  # @id, @vocab, @none or the expanded datatype IRI
+    container: FrozenSet[str] = frozenset()
+    context: Any = NOT_SET                      # property or type scoped context
+    base_url: Optional[str] = None              # where context came from
+    language: Any = NOT_SET                     # language for string values, None for no language
+    prefix: bool = False                        # term can be used as the prefix of a compact IRI
+
+
+def is_absolute_iri(v: str) -> bool:
+    return bool(ABSOLUTE_IRI_RE.match(v))
+
+
+class CompiledContext:
+    """
+    An active JSON-LD context.  Contexts are immutable once built: processing a local context on top of one returns
+    a new CompiledContext, and the results for scoped contexts are remembered so that each is compiled only once
+    """
+    def __init__(self, base: Optional[str] = None, vocab: Optional[str] = None, language: Optional[str] = None,
+                 terms: Optional[Dict[str, TermDefinition]] = None, previous: Optional["CompiledContext"] = None,
+                 document_base: Optional[str] = None) -> None:
+        self.base = base
+        self.document_base = document_base
+        self.vocab = vocab
+        self.language = language
+        self.terms: Dict[str, TermDefinition] = terms if terms is not None else {}
+        self.previous = previous
+        self.sources: List[Tuple[str, Tuple]] = []     # context documents loaded in building this context
+        self._vocab_iris: Dict[str, Optional[str]] = {}
+        self._derived: Dict[Tuple[int, Optional[str], bool], Tuple[Any, "CompiledContext"]] = {}
+
+    @classmethod
+    def compile(cls, context: Any, base_url: Optional[str] = None,
+                document_base: Optional[str] = None) -> "CompiledContext":
+        """
+        Compile context
+
+        :param context: JSON-LD context: a context map, the URL or file name of a context document, a document
+        containing an @context entry, None, or a list of any of these
+        :param base_url: location that relative context references in context are resolved against
+        :param document_base: base IRI of the documents the context will be applied to.  As with pyld, relative IRIs
+        in a document are only resolved (against this or an @base) when it is given
+        :return: compiled context
+        """
+        return cls(base=document_base, document_base=document_base).process(context, base_url)
+
+    def copy(self) -> "CompiledContext":
+        return CompiledContext(self.base, self.vocab, self.language, dict(self.terms), self.previous,
+                               self.document_base)
+
+    def scoped(self, context: Any, base_url: Optional[str], propagate: bool = True) -> "CompiledContext":
+        """ The result of processing a property or type scoped context on top of this one, compiled the first time """
+        key = (id(context), base_url, propagate)
+        entry = self._derived.get(key)
+        if entry is None or entry[0] is not context:
+            entry = self._derived[key] = (context, self.process(context, base_url, propagate))
+        return entry[1]
+
+    def process(self, local_context: Any, base_url: Optional[str] = None, propagate: bool = True) -> "CompiledContext":
+        """
+        The JSON-LD context processing algorithm
+
+        :param local_context: context to process on top of this one
+        :param base_url: location that relative context references are resolved against
+        :param propagate: False means the result is reverted to this context on entering a new node object
+        :return: new active context
+        """
+        if isinstance(local_context, dict) and '@propagate' in local_context:
+            propagate = bool(local_context['@propagate'])
+        result = self.copy()
+        if not propagate and result.previous is None:
+            result.previous = self
+        sources = []
+        for ctx, ctx_base_url, remote in _resolve_contexts(local_context, base_url, [], sources):
+            if ctx is None:
+                result = CompiledContext(base=self.document_base, previous=None if propagate else result,
+                                         document_base=self.document_base)
+                continue
+            if not isinstance(ctx, dict):
+                raise UnsupportedJSONLD(f'Invalid local context: {ctx!r}')
+            result._vocab_iris = {}
+            for k in ('@import', '@direction'):
+                if ctx.get(k) is not None:
+                    raise UnsupportedJSONLD(f'{k} is not supported')
+            if '@base' in ctx and not remote:
+                base = ctx['@base']
+                if base is None or is_absolute_iri(base):
+                    result.base = base
+                elif result.base is not None:
+                    result.base = urljoin(result.base, base)
+                else:
+                    raise UnsupportedJSONLD(f'Relative @base {base} with no base to resolve it against')
+            if '@vocab' in ctx:
+                vocab = ctx['@vocab']
+                result.vocab = None if vocab is None else result.expand_iri(vocab, vocab=True, document_relative=True)
+            if '@language' in ctx:
+                language = ctx['@language']
+                result.language = None if language is None else language.lower()
+            defined: Dict[str, bool] = {}
+            for term in ctx:
+                if term not in ('@base', '@vocab', '@language', '@version', '@propagate', '@protected', '@import',
+                                '@direction'):
+                    result._define_term(ctx, term, defined, ctx_base_url)
+        result.sources = sources
+        return result
+
+    def _define_term(self, ctx: Dict[str, Any], term: str, defined: Dict[str, bool],
+                     base_url: Optional[str]) -> None:
+        """ Create the term definition for term in local context ctx """
+        if term in defined:
+            if defined[term]:
+                return
+            raise UnsupportedJSONLD(f'Cyclic IRI mapping for {term}')
+        defined[term] = False
+        value = ctx[term]
+        if term == '@type' and isinstance(value, dict) and set(value) <= {'@container', '@protected'}:
+            defined[term] = True
+            return
+        if term in KEYWORDS or not term:
+            raise UnsupportedJSONLD(f'Keyword {term} cannot be redefined')
+        if KEYWORD_FORM_RE.match(term):
+            # Terms that look like keywords are ignored
+            defined[term] = True
+            return
+        self.terms.pop(term, None)
+        simple_term = isinstance(value, str)
+        if value is None or simple_term:
+            value = {'@id': value}
+        elif not isinstance(value, dict):
+            raise UnsupportedJSONLD(f'Invalid term definition for {term}: {value!r}')
+        unsupported = set(value) - TERM_KEYS
+        if unsupported:
+            raise UnsupportedJSONLD(f'{", ".join(sorted(unsupported))} in the definition of {term} is not supported')
+
+        td = TermDefinition(iri=None)
+        if '@id' in value and value['@id'] != term:
+            iri = value['@id']
+            if iri is not None:
+                if not isinstance(iri, str):
+                    raise UnsupportedJSONLD(f'Invalid IRI mapping for {term}: {iri!r}')
+                if iri not in KEYWORDS and KEYWORD_FORM_RE.match(iri):
+                    defined[term] = True
+                    return
+                td.iri = self.expand_iri(iri, vocab=True, local=ctx, defined=defined, base_url=base_url)
+                if td.iri is None or td.iri == '@context' or \
+                        (td.iri not in KEYWORDS and not is_absolute_iri(td.iri)):
+                    raise UnsupportedJSONLD(f'Invalid IRI mapping for {term}: {iri}')
+                td.prefix = simple_term and ':' not in term and bool(PREFIX_IRI_RE.match(td.iri))
+        elif ':' in term[1:]:
+            prefix, suffix = term.split(':', 1)
+            if prefix in ctx:
+                self._define_term(ctx, prefix, defined, base_url)
+            prefix_td = self.terms.get(prefix)
+            td.iri = prefix_td.iri + suffix if prefix_td is not None and prefix_td.iri is not None else term
+        elif self.vocab is not None:
+            td.iri = self.vocab + term
+        else:
+            raise UnsupportedJSONLD(f'Relative term definition for {term} without a vocabulary mapping')
+
+        if '@prefix' in value:
+            if ':' in term or '/' in term:
+                raise UnsupportedJSONLD(f'@prefix is not allowed on {term}')
+            td.prefix = bool(value['@prefix'])
+        if '@type' in value:
+            typ = value['@type']
+            if not isinstance(typ, str) or typ == '@json':
+                raise UnsupportedJSONLD(f'Type mapping {typ!r} for {term} is not supported')
+            if typ not in ('@id', '@vocab', '@none'):
+                typ = self.expand_iri(typ, vocab=True, local=ctx, defined=defined, base_url=base_url)
+                if typ is None or not is_absolute_iri(typ):
+                    raise UnsupportedJSONLD(f'Invalid type mapping for {term}: {value["@type"]}')
+            td.type = typ
+        if '@container' in value:
+            container = value['@container']
+            container = frozenset(container if isinstance(container, list) else [container])
+            if not container <= {'@set', '@list'} or len(container) > 1:
+                raise UnsupportedJSONLD(f'Container {value["@container"]} for {term} is not supported')
+            td.container = container
+        if '@context' in value:
+            td.context = value['@context']
+            td.base_url = base_url
+        if '@language' in value and '@type' not in value:
+            language = value['@language']
+            td.language = None if language is None else language.lower()
+        self.terms[term] = td
+        defined[term] = True
+
+    def expand_iri(self, value: Optional[str], vocab: bool = False, document_relative: bool = False,
+                   local: Optional[Dict[str, Any]] = None, defined: Optional[Dict[str, bool]] = None,
+                   base_url: Optional[str] = None) -> Optional[str]:
+        """
+        IRI expansion
+
+        :param value: string to expand
+        :param vocab: True means value is relative to the vocabulary: terms and @vocab apply
+        :param document_relative: True means a relative value is resolved against the base
+        :param local: local context being processed, whose terms are defined on demand
+        :param defined: definition state of the terms in local
+        :param base_url: location of local
+        :return: expanded IRI, keyword, or None if value is null or explicitly unmapped
+        """
+        if local is None and vocab:
+            if value in self._vocab_iris:
+                return self._vocab_iris[value]
+            rval = self._expand_iri(value, True, document_relative, None, None, None)
+            if not document_relative:
+                self._vocab_iris[value] = rval
+            return rval
+        return self._expand_iri(value, vocab, document_relative, local, defined, base_url)
+
+    def _expand_iri(self, value: Optional[str], vocab: bool, document_relative: bool,
+                    local: Optional[Dict[str, Any]], defined: Optional[Dict[str, bool]],
+                    base_url: Optional[str]) -> Optional[str]:
+        if value is None or value in KEYWORDS:
+            return value
+        if KEYWORD_FORM_RE.match(value):
+            return None
+        if local is not None and value in local and not defined.get(value):
+            self._define_term(local, value, defined, base_url)
+        if vocab and value in self.terms:
+            return self.terms[value].iri
+        if ':' in value[1:]:
+            prefix, suffix = value.split(':', 1)
+            if prefix == '_' or suffix.startswith('//'):
+                return value
+            if local is not None and prefix in local and not defined.get(prefix):
+                self._define_term(local, prefix, defined, base_url)
+            prefix_td = self.terms.get(prefix)
+            if prefix_td is not None and prefix_td.iri is not None and prefix_td.prefix:
+                return prefix_td.iri + suffix
+            if is_absolute_iri(value):
+                return value
+        if vocab and self.vocab is not None:
+            return self.vocab + value
+        if document_relative and self.document_base is not None and self.base is not None:
+            return urljoin(self.base, value)
+        return value
+
+
+def _context_location(ref: str, base_url: Optional[str]) -> str:
+    """ Resolve a context reference against the location of the context that contains it """
+    if not base_url or '://' in ref or os.path.isabs(ref):
+        return ref
+    return urljoin(base_url, ref) if '://' in base_url else os.path.join(os.path.dirname(base_url), ref)
+
+
+def _resolve_contexts(context: Any, base_url: Optional[str], seen: List[str],
+                      sources: List[Tuple[str, Tuple]]) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str], bool]]:
+    """
+    Flatten context into the context maps it consists of, loading referenced contexts
+
+    :param sources: collects the location and version of each context document loaded
+    :return: iterator over (context map or None, location of the map, True if the map came from a remote context)
+    """
+    for ctx in context if isinstance(context, list) else [context]:
+        if isinstance(ctx, str) and not ctx.strip().startswith(('{', '[')):
+            location = _context_location(ctx, base_url)
+            if location in seen:
+                raise UnsupportedJSONLD(f'Recursive context inclusion: {location}')
+            doc = load_context(location)
+            sources.append((location, context_source_key(location)))
+            if not isinstance(doc, dict) or '@context' not in doc:
+                raise UnsupportedJSONLD(f'{location} is not a JSON-LD context document')
+            for rval in _resolve_contexts(doc['@context'], location, seen + [location], sources):
+                yield rval[0], rval[1], True
+        else:
+            if ctx is not None and not isinstance(ctx, dict):
+                # JSON text or JsonObj
+                ctx = load_context(ctx)
+            if isinstance(ctx, list) or (isinstance(ctx, dict) and '@context' in ctx):
+                yield from _resolve_contexts(ctx if isinstance(ctx, list) else ctx['@context'], base_url, seen,
+                                             sources)
+            else:
+                yield ctx, base_url, bool(seen)
+
+
+_compiled_cache: "OrderedDict[Tuple, CompiledContext]" = OrderedDict()
+_compiled_cache_lock = threading.Lock()
+
+
+def _clear_compiled_cache() -> None:
+    with _compiled_cache_lock:
+        _compiled_cache.clear()
+
+
+register_derived_cache(_clear_compiled_cache)
+
+
+def compile_contexts(contexts: CONTEXTS_PARAM_TYPE, base_url: Optional[str] = None) -> CompiledContext:
+    """
+    Compile contexts, using the process wide cache of compiled contexts
+
+    A cached context is used as long as none of the context files that went into it have changed.
+
+    :param contexts: JSON-LD context(s) in the form of a file name, URL, JSON string, dict or JsonObj, or a list of
+    these
+    :param base_url: location that relative context references in contexts are resolved against
+    :return: compiled context
+    """
+    key = [base_url]
+    for c in contexts if isinstance(contexts, list) else [contexts]:
+        if c is None or isinstance(c, str):
+            key.append(c if c is None else context_source_key(c))
+        else:
+            key.append(('json', json.dumps(load_context(c), sort_keys=True)))
+    key = tuple(key)
+    with _compiled_cache_lock:
+        compiled = _compiled_cache.get(key)
+    if compiled is not None and sources_unchanged(compiled.sources):
+        with _compiled_cache_lock:
+            if key in _compiled_cache:
+                _compiled_cache.move_to_end(key)
+        return compiled
+    compiled = CompiledContext.compile(contexts, base_url)
+    with _compiled_cache_lock:
+        _compiled_cache[key] = compiled
+        while len(_compiled_cache) > CONTEXT_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+    return compiled
+
+
+def _literal(value: Union[str, int, float, bool], datatype: Optional[str], language: Optional[str], typed: bool,
+             terms: TermInterner) -> Literal:
+    """
+    The RDF literal for a JSON value, following the JSON-LD to RDF rules for native types
+
+    :param typed: False means return the plain literal with the lexical form, as rdflib_pyld_compat does
+    :param terms: interner to draw the literal from
+    """
+    if isinstance(value, bool):
+        value, datatype = 'true' if value else 'false', datatype or str(XSD.boolean)
+    elif isinstance(value, float) or (isinstance(value, int) and datatype == XSD_DOUBLE):
+        value, datatype = DOUBLE_EXP_RE.sub(r'\1E\2', '%1.15E' % value), datatype or XSD_DOUBLE
+    elif isinstance(value, int):
+        value, datatype = str(value), datatype or str(XSD.integer)
+    if not typed:
+        return terms.literal(value)
+    if language is not None and datatype is None:
+        return terms.literal(value, lang=language)
+    return terms.literal(value, datatype=datatype if datatype != XSD_STRING else None)
+
+
+class _TripleEmitter:
+    """ Generates the triples of a JSON document, in the manner of JSON-LD expansion followed by to_rdf """
+    def __init__(self, graph: Graph, typed_literals: bool, terms: TermInterner) -> None:
+        self.add = graph.add
+        self.typed_literals = typed_literals
+        self.terms = terms
+        self.bnodes: Dict[str, BNode] = {}
+
+    def node_ref(self, iri: Optional[str]) -> Optional[Node]:
+        """ Subject or object node for an expanded IRI.  Relative IRIs aren't valid RDF, so give None """
+        if iri is None:
+            return None
+        if iri.startswith('_:'):
+            if iri not in self.bnodes:
+                self.bnodes[iri] = BNode()
+            return self.bnodes[iri]
+        return self.terms.uri(iri) if is_absolute_iri(iri) else None
+
+    def document(self, doc: Any, ctx: CompiledContext) -> None:
+        for element in doc if isinstance(doc, list) else [doc]:
+            if isinstance(element, list):
+                self.document(element, ctx)
+            elif isinstance(element, dict):
+                self.map_value(element, ctx, None, top=True)
+
+    def values(self, value: Any, ctx: CompiledContext, key: Optional[str], in_list: bool = False) -> List[Node]:
+        """
+        The RDF objects for the value of property key
+
+        :param value: JSON value
+        :param ctx: context that key was interpreted in
+        :param key: the property
+        :param in_list: True if value is an item of a list
+        :return: objects for value, with the triples of any nodes in it already emitted
+        """
+        if value is None:
+            return []
+        term = ctx.terms.get(key) if key is not None else None
+        if isinstance(value, list):
+            if in_list:
+                raise UnsupportedJSONLD('Lists of lists are not supported')
+            if term is not None and '@list' in term.container:
+                return [self.rdf_list(value, ctx, key)]
+            rval = []
+            for v in value:
+                rval += self.values(v, ctx, key)
+            return rval
+        if isinstance(value, dict):
+            obj = self.map_value(value, ctx, key)
+            return obj if isinstance(obj, list) else [] if obj is None else [obj]
+        if term is not None and term.context is not NOT_SET:
+            ctx = ctx.scoped(term.context, term.base_url)
+            term = ctx.terms.get(key)
+        obj = self.scalar(value, ctx, term)
+        return [] if obj is None else [obj]
+
+    def scalar(self, value: Any, ctx: CompiledContext, term: Optional[TermDefinition]) -> Optional[Node]:
+        typ = term.type if term is not None else None
+        if isinstance(value, str):
+            if typ == '@id':
+                return self.node_ref(ctx.expand_iri(value, document_relative=True))
+            if typ == '@vocab':
+                return self.node_ref(ctx.expand_iri(value, vocab=True, document_relative=True))
+        if typ in ('@id', '@vocab', '@none'):
+            typ = None
+        language = None
+        if typ is None and isinstance(value, str):
+            language = term.language if term is not None and term.language is not NOT_SET else ctx.language
+        return _literal(value, typ, language, self.typed_literals, self.terms)
+
+    def rdf_list(self, items: List[Any], ctx: CompiledContext, key: Optional[str]) -> Node:
+        nodes = []
+        for item in items:
+            nodes += self.values(item, ctx, key, in_list=True)
+        head = RDF.nil
+        for node in reversed(nodes):
+            cell = BNode()
+            self.add((cell, RDF.first, node))
+            self.add((cell, RDF.rest, head))
+            head = cell
+        return head
+
+    def map_value(self, element: Dict[str, Any], ctx: CompiledContext, key: Optional[str],
+                  top: bool = False) -> Union[Node, List[Node], None]:
+        """
+        Emit the triples for a JSON object
+
+        :param element: the object
+        :param ctx: context that key was interpreted in
+        :param key: property whose value element is, None at the top level
+        :param top: True if element is at the top of the document
+        :return: the node, value, or list and set contents that element represents
+        """
+        term = ctx.terms.get(key) if key is not None else None
+        keys = {k: ctx.expand_iri(k, vocab=True) for k in element}
+        outer_ctx = ctx
+        # Type scoped contexts don't apply to nested node objects
+        if ctx.previous is not None and '@value' not in keys.values() and \
+                not (len(keys) == 1 and '@id' in keys.values()):
+            ctx = ctx.previous
+        if term is not None and term.context is not NOT_SET:
+            ctx = ctx.scoped(term.context, term.base_url)
+        if '@context' in element:
+            ctx = ctx.process(element['@context'])
+        if ctx is not outer_ctx:
+            keys = {k: ctx.expand_iri(k, vocab=True) for k in element}
+        type_scoped_ctx = ctx
+        types = []
+        for k in sorted(k for k, v in keys.items() if v == '@type'):
+            for t in element[k] if isinstance(element[k], list) else [element[k]]:
+                if not isinstance(t, str):
+                    raise UnsupportedJSONLD(f'Invalid @type value: {t!r}')
+                types.append(t)
+        for t in sorted(types):
+            type_term = type_scoped_ctx.terms.get(t)
+            if type_term is not None and type_term.context is not NOT_SET:
+                ctx = ctx.scoped(type_term.context, type_term.base_url, propagate=False)
+        if ctx is not type_scoped_ctx:
+            keys = {k: ctx.expand_iri(k, vocab=True) for k in element}
+
+        expanded = set(keys.values())
+        if '@value' in expanded:
+            return None if top else self.value_object(element, keys, type_scoped_ctx)
+        if '@list' in expanded or '@set' in expanded:
+            if top or len(expanded - {'@index'}) > 1:
+                raise UnsupportedJSONLD('Unsupported list or set object')
+            k = next(k for k, v in keys.items() if v in ('@list', '@set'))
+            if keys[k] == '@list':
+                return self.rdf_list(element[k] if isinstance(element[k], list) else [element[k]], ctx, key)
+            return self.values(element[k], ctx, key)
+        if top and (not element or (len(element) == 1 and '@id' in expanded)):
+            return None
+
+        subject = NOT_SET
+        for k, v in keys.items():
+            if v == '@id':
+                if not isinstance(element[k], str):
+                    raise UnsupportedJSONLD(f'Invalid @id value: {element[k]!r}')
+                subject = self.node_ref(ctx.expand_iri(element[k], document_relative=True))
+        if subject is NOT_SET:
+            subject = BNode()
+        for t in types:
+            obj = self.node_ref(type_scoped_ctx.expand_iri(t, vocab=True, document_relative=True))
+            if subject is not None and obj is not None:
+                self.add((subject, RDF.type, obj))
+        for k, v in keys.items():
+            if v is None or v in ('@id', '@type', '@context'):
+                continue
+            if v in KEYWORDS:
+                raise UnsupportedJSONLD(f'{v} is not supported')
+            if not is_absolute_iri(v):
+                continue
+            objs = self.values(element[k], ctx, k)
+            if subject is not None and not v.startswith('_:'):
+                predicate = self.terms.uri(v)
+                for obj in objs:
+                    self.add((subject, predicate, obj))
+        return subject
+
+    def value_object(self, element: Dict[str, Any], keys: Dict[str, Optional[str]],
+                     ctx: CompiledContext) -> Optional[Literal]:
+        entries = {v: element[k] for k, v in keys.items()}
+        if set(entries) - {'@value', '@type', '@language'}:
+            raise UnsupportedJSONLD(f'Unsupported value object: {element!r}')
+        value = entries['@value']
+        if value is None:
+            return None
+        if isinstance(value, (dict, list)):
+            raise UnsupportedJSONLD(f'Unsupported value object: {element!r}')
+        datatype = entries.get('@type')
+        if datatype is not None:
+            datatype = ctx.expand_iri(datatype, vocab=True, document_relative=True)
+            if not is_absolute_iri(datatype):
+                raise UnsupportedJSONLD(f'Invalid datatype: {entries["@type"]}')
+        language = entries.get('@language')
+        if language is not None:
+            if not isinstance(value, str) or datatype is not None:
+                raise UnsupportedJSONLD(f'Unsupported value object: {element!r}')
+            language = language.lower()
+        return _literal(value, datatype, language, self.typed_literals, self.terms)
+
+
+def json_to_rdf(doc: Any, context: CompiledContext, graph: Optional[Graph] = None,
+                typed_literals: bool = True, terms: Optional[TermInterner] = None) -> Graph:
+    """
+    Add the RDF that doc represents under context to graph
+
+    :param doc: JSON document, as python dicts and lists
+    :param context: compiled context to interpret doc with
+    :param graph: graph to add the triples to.  A new graph is created if absent
+    :param typed_literals: False means emit every literal as a plain literal holding its lexical form, which is
+    what rdflib_pyld_compat makes of the pyld output
+    :param terms: interner that the IRIs and literals are drawn from.  A new one is used for each call if absent
+    :return: graph
+    """
+    if graph is None:
+        graph = Graph()
+    _TripleEmitter(graph, typed_literals, terms or TermInterner()).document(doc, context)
+    return graph
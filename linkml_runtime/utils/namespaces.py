@@ -60,6 +60,9 @@ class Namespaces(CaseInsensitiveDict):
             raise ValueError(f"Invalid NCName: {key}")
 
     def __getattr__(self, item):
+        if item.startswith('__'):
+            # Python protocol lookups (e.g. __getstate__ when pickling) aren't prefixes
+            raise AttributeError(item)
         return self[item]
 
     def __setattr__(self, key: str, value):
@@ -0,0 +1,25 @@
+from linkml_runtime.utils.schemaview import SchemaView
+
+
+class SchemaPlans:
+    """
+    Base for the things a loader or dumper derives from a schema and wants to reuse across calls.
+
+    A loader or dumper keeps the plans for the schemaview it last worked with, and builds new ones when is_current
+    says they no longer apply.  Holding them on the instance (rather than in a module level cache keyed on the
+    schemaview) means that only the most recent schemaview is kept alive, and that nothing is shared between
+    loaders or dumpers
+    """
+    def __init__(self, schemaview: SchemaView):
+        self.schemaview = schemaview
+        self.modifications = schemaview.modifications
+        self.namespaces = schemaview.namespaces()
+        self.prefixes = tuple(self.namespaces.items())
+
+    def is_current(self, schemaview: SchemaView) -> bool:
+        """
+        True if these plans can be used for schemaview.  Besides the schemaview itself being modified, prefixes can be
+        added to or remapped in its namespaces (e.g. by a prefix_map) without modifying it
+        """
+        return self.schemaview is schemaview and self.modifications == schemaview.modifications and \
+            self.namespaces is schemaview.namespaces() and self.prefixes == tuple(self.namespaces.items())
@@ -0,0 +1,45 @@
+from typing import Any, Dict, Optional, Tuple
+
+from rdflib import URIRef, Literal
+
+# Number of distinct IRIs (and, separately, literals) that a TermInterner holds on to
+DEFAULT_INTERN_SIZE = 64 * 1024
+
+
+class TermInterner:
+    """
+    Hands out one shared rdflib node for each distinct IRI or literal, so that a graph holding the same predicate,
+    class or value in many triples holds a single copy of it.
+
+    An interner is meant to last for one dump.  It is bounded: once max_size distinct IRIs (or literals) have been
+    seen, it forgets them and starts over, which costs some sharing but never correctness
+    """
+    def __init__(self, max_size: int = DEFAULT_INTERN_SIZE):
+        self.max_size = max_size
+        self._uris: Dict[str, URIRef] = {}
+        self._literals: Dict[Tuple, Literal] = {}
+
+    def uri(self, iri: str) -> URIRef:
+        """ The URIRef for iri.  iri may itself be a URIRef, in which case it is the one that is kept """
+        # rdflib nodes don't hash like the strings they hold, so key on the plain string
+        key = iri if type(iri) is str else str(iri)
+        node = self._uris.get(key)
+        if node is None:
+            if len(self._uris) >= self.max_size:
+                self._uris.clear()
+            node = self._uris[key] = iri if type(iri) is URIRef else URIRef(iri)
+        return node
+
+    def literal(self, value: Any, datatype: Optional[str] = None, lang: Optional[str] = None) -> Literal:
+        """ The Literal for value.  Values of different python types (e.g. True and 1) are kept apart """
+        key = (type(value), value, datatype, lang)
+        try:
+            node = self._literals.get(key)
+        except TypeError:
+            # Unhashable value
+            return Literal(value, datatype=datatype or None, lang=lang)
+        if node is None:
+            if len(self._literals) >= self.max_size:
+                self._literals.clear()
+            node = self._literals[key] = Literal(value, datatype=datatype or None, lang=lang)
+        return node
@@ -0,0 +1,207 @@
+"""
+An on-disk cache for the remote documents (schema imports, JSON-LD contexts, RDF) that loaders and dumpers fetch
+
+Caching is off unless a cache is installed, either with :func:`set_url_cache` or by pointing the
+LINKML_RUNTIME_URL_CACHE environment variable at a cache directory.  Any object with a compatible ``fetch`` method
+can be installed in place of :class:`URLCache`.
+"""
+import hashlib
+import json
+import os
+import ssl
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional, Any, Dict, Union, IO
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+
+from hbreader import FileInfo, HBType, detect_type, hbread
+
+URL_CACHE_ENV = 'LINKML_RUNTIME_URL_CACHE'
+
+
+@dataclass
+class CachedResponse:
+    """ A document fetched from a URL, along with the headers needed to revalidate it """
+    url: str
+    resolved_url: str
+    text: str
+    fetched: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    date: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+class URLCache:
+    """
+    Cache of fetched URLs, stored as one JSON file per URL/accept header pair in directory
+
+    An entry younger than ttl seconds is returned without contacting the server.  Older entries are revalidated
+    using the ETag and Last-Modified headers from the original response.  In offline mode the server is never
+    contacted and a URL that isn't in the cache is an error.
+    """
+    def __init__(self, directory: str, ttl: Optional[float] = None, offline: bool = False) -> None:
+        """
+        :param directory: directory to hold cache entries.  Created if necessary
+        :param ttl: seconds an entry is used without revalidation.  None means always revalidate
+        :param offline: True means never go to the network
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, url: str, accept_header: Optional[str]) -> str:
+        key = hashlib.sha256(f'{url}\n{accept_header or ""}'.encode()).hexdigest()
+        return os.path.join(self.directory, key + '.json')
+
+    def _read_entry(self, url: str, accept_header: Optional[str]) -> Optional[CachedResponse]:
+        try:
+            with open(self._entry_path(url, accept_header)) as f:
+                return CachedResponse(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_entry(self, entry: CachedResponse, accept_header: Optional[str]) -> None:
+        path = self._entry_path(entry.url, accept_header)
+        tmp_path = path + f'.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(entry), f)
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """ Remove all entries from the cache """
+        for fname in os.listdir(self.directory):
+            if fname.endswith('.json'):
+                os.remove(os.path.join(self.directory, fname))
+
+    def fetch(self, url: str, accept_header: Optional[str] = None) -> CachedResponse:
+        """
+        Return the document at url, from the cache if possible
+
+        :param url: absolute URL to fetch
+        :param accept_header: Accept header to send.  Entries are cached separately for each accept header
+        :return: document and response information
+        """
+        # URLs often arrive as rdflib URIRefs, which never compare equal to the str recorded in the entry
+        url = str(url)
+        entry = self._read_entry(url, accept_header)
+        if entry is not None and entry.url != url:
+            entry = None
+        if self.offline:
+            if entry is None:
+                raise URLError(f'{url} is not in the URL cache and offline mode is set')
+            return entry
+        if entry is not None and self.ttl is not None and time.time() - entry.fetched < self.ttl:
+            return entry
+
+        req = Request(quote(url, '/:'))
+        if accept_header:
+            req.add_header('Accept', accept_header)
+        if entry is not None:
+            if entry.etag:
+                req.add_header('If-None-Match', entry.etag)
+            if entry.last_modified:
+                req.add_header('If-Modified-Since', entry.last_modified)
+        try:
+            response = urlopen(req, context=ssl._create_unverified_context())
+        except HTTPError as e:
+            if e.code == 304 and entry is not None:
+                entry.fetched = time.time()
+                self._write_entry(entry, accept_header)
+                return entry
+            e.msg = f"{e.filename}"
+            raise e
+        with response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            entry = CachedResponse(url=url,
+                                   resolved_url=response.url,
+                                   text=response.read().decode(charset),
+                                   fetched=time.time(),
+                                   etag=response.headers['ETag'],
+                                   last_modified=response.headers['Last-Modified'],
+                                   date=response.headers['Date'],
+                                   content_type=response.headers.get_content_type())
+        self._write_entry(entry, accept_header)
+        return entry
+
+
+_url_cache: Optional[URLCache] = URLCache(os.environ[URL_CACHE_ENV]) if os.environ.get(URL_CACHE_ENV) else None
+
+
+def set_url_cache(cache: Optional[URLCache]) -> Optional[URLCache]:
+    """
+    Install cache as the cache used for all URL fetches.  None turns caching off
+
+    :param cache: URLCache (or compatible) instance
+    :return: the previously installed cache
+    """
+    global _url_cache
+    prev_cache = _url_cache
+    _url_cache = cache
+    return prev_cache
+
+
+def get_url_cache() -> Optional[URLCache]:
+    """ Return the installed URL cache, if any """
+    return _url_cache
+
+
+def source_url(source: Any, base_path: Optional[str] = None) -> Optional[str]:
+    """
+    Return the absolute URL that source refers to, or None if source is a file name, text or an open file
+
+    :param source: anything that can be passed to hbread
+    :param base_path: base to resolve relative URLs against
+    :return: absolute URL or None
+    """
+    if isinstance(source, str):
+        source = str(source)
+    if not isinstance(source, str) or detect_type(source, base_path) is not HBType.URL:
+        return None
+    return source if '://' in source else \
+        urljoin(base_path + ('' if base_path.endswith('/') else '/'), source, allow_fragments=True)
+
+
+def read_source(source: Union[str, bytes, IO], open_info: Optional[FileInfo] = None,
+                base_path: Optional[str] = None, accept_header: Optional[str] = None) -> str:
+    """
+    A drop in replacement for hbread that routes URL fetches through the installed URL cache
+
+    :param source: text, file name, URL or open file
+    :param open_info: what we learned about source in the process of reading it
+    :param base_path: base to use if source is a relative URL or file name
+    :param accept_header: Accept header to use if source is a URL
+    :return: contents of source
+    """
+    if isinstance(source, str):
+        source = str(source)
+    url = source_url(source, base_path) if _url_cache is not None else None
+    if url is None:
+        return hbread(source, open_info, base_path, accept_header)
+    entry = _url_cache.fetch(url, accept_header)
+    if open_info is not None:
+        open_info.source_file = entry.resolved_url
+        open_info.source_file_date = entry.last_modified or entry.date
+        open_info.source_file_size = len(entry.text)
+        parts = urlsplit(entry.resolved_url)
+        open_info.base_path = urlunsplit((parts.scheme, parts.netloc, os.path.dirname(parts.path), parts.query, None))
+    return entry.text
+
+
+def pyld_document_loader(url: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    A pyld documentLoader that fetches http(s) documents through the installed URL cache, passing anything else to
+    the pyld default loader
+    """
+    from pyld import jsonld
+
+    if _url_cache is None or not url.startswith(('http://', 'https://')):
+        return jsonld.get_document_loader()(url, options or {})
+    entry = _url_cache.fetch(url, 'application/ld+json, application/json')
+    return {'contentType': entry.content_type,
+            'contextUrl': None,
+            'documentUrl': entry.resolved_url,
+            'document': json.loads(entry.text)}
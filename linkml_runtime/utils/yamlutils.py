@@ -146,13 +146,16 @@ class YAMLRoot(JsonObj):
             for key, raw_obj in items(entries):
                 if raw_obj is None:
                     raw_obj = {}
-                if key_name not in raw_obj:
-                    raw_obj = copy(raw_obj)
-                    raw_obj[key_name] = key
-                if not issubclass(type(raw_obj), slot_type):
-                    order_up(key, slot_type(**as_dict(raw_obj)))
-                else:
+                if issubclass(type(raw_obj), slot_type):
+                    if key_name not in raw_obj:
+                        raw_obj = copy(raw_obj)
+                        raw_obj[key_name] = key
                     order_up(key, raw_obj)
+                else:
+                    # The key is passed as an extra keyword rather than added to a copy of raw_obj
+                    kwargs = as_kwargs(raw_obj)
+                    order_up(key, slot_type(**kwargs) if key_name in kwargs else
+                             slot_type(**kwargs, **{key_name: key}))
 
         # TODO: Make an external function extract a root JSON list
         if isinstance(raw_slot, JsonObj):
@@ -177,7 +180,7 @@ class YAMLRoot(JsonObj):
                                 form_1(list_entry)
                     else:
                         # **kwargs
-                        cooked_obj = slot_type(**as_dict(list_entry))
+                        cooked_obj = slot_type(**as_kwargs(list_entry))
                         order_up(cooked_obj[key_name], cooked_obj)
                 elif isinstance(list_entry, list):
                     # *args
@@ -190,7 +193,7 @@ class YAMLRoot(JsonObj):
             # We have a dictionary
             if key_name in raw_slot and not isinstance(raw_slot[key_name], (list, dict, JsonObj)):
                 # Vanilla dictionary - {key: v11, s12: v12, ...}
-                order_up(raw_slot[key_name], slot_type(**as_dict(raw_slot)))
+                order_up(raw_slot[key_name], slot_type(**as_kwargs(raw_slot)))
             else:
                 # We have either {key1: {obj1}, key2: {obj2}...} or {key1:, key2:, ...}
                 for k, v in items(raw_slot):
@@ -246,6 +249,24 @@ class YAMLRoot(JsonObj):
         raise ValueError(f"{field_name} must be supplied")
 
 
+def as_kwargs(obj: Union[dict, JsonObj]) -> dict:
+    """
+    Return obj in a form that can be passed as keyword arguments to a YAMLRoot constructor
+
+    Plain dictionaries are returned as is.  A JsonObj contributes its top level entries only -- the nested values are
+    converted by the target class's __post_init__ as it is constructed, so we avoid the deep copy that as_dict makes
+    at every level of the tree.
+
+    :param obj: dictionary or JsonObj to convert
+    :return: dictionary whose keys are the top level entries in obj
+    """
+    if isinstance(obj, dict):
+        return obj
+    if isinstance(obj, JsonObj) and '_root' not in obj:
+        return dict(items(obj))
+    return as_dict(obj)
+
+
 def root_representer(dumper: yaml.Dumper, data: YAMLRoot):
     """ YAML callback -- used to filter out empty values (None, {}, [] and false)
 
@@ -410,6 +431,16 @@ yaml.SafeDumper.add_multi_representer(str, yaml.SafeDumper.represent_str)
 yaml.SafeDumper.add_multi_representer(int, yaml.SafeDumper.represent_int)
 yaml.SafeDumper.add_multi_representer(float, yaml.SafeDumper.represent_float)
 
+if hasattr(yaml, 'CSafeDumper'):
+    # The libyaml emitter keeps its own representer tables and only accepts exact str scalar values
+    def c_str_representer(dumper: yaml.CSafeDumper, data: str) -> yaml.Node:
+        return dumper.represent_str(str.__str__(data))
+
+    yaml.CSafeDumper.add_multi_representer(YAMLRoot, root_representer)
+    yaml.CSafeDumper.add_multi_representer(str, c_str_representer)
+    yaml.CSafeDumper.add_multi_representer(int, yaml.CSafeDumper.represent_int)
+    yaml.CSafeDumper.add_multi_representer(float, yaml.CSafeDumper.represent_float)
+
 
 def as_rdf(element: YAMLRoot, contexts: CONTEXTS_PARAM_TYPE = None) -> Graph:
     """
@@ -1,3 +1,4 @@
+import io
 import os
 import unittest
 import json
@@ -84,12 +85,68 @@ class CSVGenTestCase(unittest.TestCase):
         logging.debug(json_dumper.dumps(roundtrip))
         assert roundtrip == data
 
+    def test_csv_load_iter(self):
+        schemaview = SchemaView(SCHEMA)
+        data = yaml_loader.load(DATA2, target_class=Shop)
+        csv_dumper.dump(data, to_file=OUTPUT2, index_slot='all_book_series', schemaview=schemaview)
+        rows = list(csv_loader.load_iter(OUTPUT2, target_class=Shop, index_slot='all_book_series',
+                                         schemaview=schemaview))
+        assert all(isinstance(row, BookSeries) for row in rows)
+        assert rows == data.all_book_series
+        batches = list(csv_loader.load_iter(OUTPUT2, target_class=Shop, index_slot='all_book_series',
+                                            schemaview=schemaview, batch_size=2))
+        assert [len(b) for b in batches] == [2] * (len(rows) // 2) + ([len(rows) % 2] if len(rows) % 2 else [])
+        assert [row for b in batches for row in b] == rows
+
+    def test_csv_dump_stream(self):
+        schemaview = SchemaView(SCHEMA)
+        data = yaml_loader.load(DATA2, target_class=Shop)
+        output = io.StringIO()
+        csv_dumper.dump_stream((s for s in data.all_book_series), output, index_slot='all_book_series',
+                               schemaview=schemaview)
+        assert output.getvalue() == csv_dumper.dumps(data, index_slot='all_book_series', schemaview=schemaview)
+        roundtrip = csv_loader.loads(output.getvalue(), target_class=Shop, index_slot='all_book_series',
+                                     schemaview=schemaview)
+        assert roundtrip == data
 
-
-
-
-
-
+    def test_csv_loads_single_line(self):
+        """ Text without a newline is read as CSV unless it names a file """
+        schemaview = SchemaView(SCHEMA)
+        shop = csv_loader.loads('id\tname', target_class=Shop, index_slot='all_book_series', schemaview=schemaview)
+        assert shop.all_book_series == []
+        shop = csv_loader.loads('id,name', target_class=Shop, index_slot='all_book_series', schemaview=schemaview,
+                                csv_delimiter=',')
+        assert shop.all_book_series == []
+        with self.assertRaises(FileNotFoundError):
+            csv_loader.load(os.path.join(INPUT_DIR, 'no_such_file.tsv'), target_class=Shop,
+                            index_slot='all_book_series', schemaview=schemaview)
+
+    def test_csv_row_plans(self):
+        """ Row plans are kept by the loader and rebuilt when the schema view changes """
+        schemaview = SchemaView(SCHEMA)
+        data = yaml_loader.load(DATA2, target_class=Shop)
+        tsv = csv_dumper.dumps(data, index_slot='all_book_series', schemaview=schemaview)
+        csv_loader.loads(tsv, target_class=Shop, index_slot='all_book_series', schemaview=schemaview)
+        plans = csv_loader._plans
+        assert plans.is_current(schemaview)
+        csv_loader.loads(tsv, target_class=Shop, index_slot='all_book_series', schemaview=schemaview)
+        assert csv_loader._plans is plans
+        schemaview.set_modified()
+        assert csv_loader.loads(tsv, target_class=Shop, index_slot='all_book_series', schemaview=schemaview) == data
+        assert csv_loader._plans is not plans
+
+    def test_csv_column_plans(self):
+        """ Column plans are kept by the dumper and rebuilt when the schema view changes """
+        schemaview = SchemaView(SCHEMA)
+        data = yaml_loader.load(DATA2, target_class=Shop)
+        tsv = csv_dumper.dumps(data, index_slot='all_book_series', schemaview=schemaview)
+        plans = csv_dumper._plans
+        assert plans.is_current(schemaview)
+        assert csv_dumper.dumps(data, index_slot='all_book_series', schemaview=schemaview) == tsv
+        assert csv_dumper._plans is plans
+        schemaview.set_modified()
+        assert csv_dumper.dumps(data, index_slot='all_book_series', schemaview=schemaview) == tsv
+        assert csv_dumper._plans is not plans
 
 
 if __name__ == '__main__':
@@ -1,10 +1,17 @@
+import asyncio
+import io
+import json
 import os
+import sys
 import unittest
 from typing import cast
+from unittest.mock import patch
 
+import yaml
 from rdflib import Namespace, SKOS, Literal
 
 from linkml_runtime.dumpers import yaml_dumper, json_dumper, rdf_dumper
+from linkml_runtime.utils.formatutils import remove_empty_items
 from linkml_runtime.utils.yamlutils import as_json_object
 from tests.support.clicktestcase import ClickTestCase
 from tests.test_loaders_dumpers import LD_11_DIR, LD_11_SSL_SVR, LD_11_SVR, HTTP_TEST_PORT, HTTPS_TEST_PORT, \
@@ -59,6 +66,59 @@ class DumpersTestCase(LoaderDumperTestCase):
                         lambda: json_dumper.dumps(self.test_package,
                                                   GITHUB_LD11_CONTEXT + 'termci_schema_inlined.context.jsonld'))
 
+    def test_yaml_dump_stream(self):
+        """ Test the libyaml emitter, streaming and multi-document output """
+        expected = yaml_dumper.dumps(self.test_package)
+        self.assertEqual(yaml.safe_load(expected), yaml.safe_load(yaml_dumper.dumps(self.test_package, fast=True)))
+        out = io.StringIO()
+        yaml_dumper.dump_stream(self.test_package, out)
+        self.assertEqual(expected, out.getvalue())
+
+        out = io.StringIO()
+        systems = self.test_package.system
+        yaml_dumper.dump_stream((s for s in systems), out, fast=True, multi_document=True)
+        docs = list(yaml.safe_load_all(out.getvalue()))
+        self.assertEqual(len(systems), len(docs))
+        self.assertEqual(yaml.safe_load(yaml_dumper.dumps(systems[0])), docs[0])
+
+    def test_json_dump_stream(self):
+        """ Test streaming the json emitter to text and binary streams """
+        expected = json_dumper.dumps(self.test_package)
+        out = io.StringIO()
+        json_dumper.dump_stream(self.test_package, out)
+        self.assertEqual(expected, out.getvalue())
+        out = io.BytesIO()
+        json_dumper.dump_stream(self.test_package, out, compact=True)
+        compact = out.getvalue().decode()
+        self.assertNotIn('\n', compact)
+        self.assertIn('"code":"C147796"', compact)
+        self.assertEqual(json.loads(expected), json.loads(compact))
+
+        # The element tree is encoded in place, not copied first
+        context = {'@context': {'@vocab': 'http://example.org/'}}
+        for inject_type in (True, False):
+            reference = json.dumps(remove_empty_items(as_json_object(self.test_package, context, inject_type),
+                                                      hide_protected_keys=True), indent='  ')
+            with patch.object(sys.modules['linkml_runtime.dumpers.json_dumper'], 'as_json_object',
+                              side_effect=AssertionError):
+                out = io.StringIO()
+                json_dumper.dump_stream(self.test_package, out, context, inject_type=inject_type)
+                self.assertEqual(reference, out.getvalue())
+                self.assertEqual(reference, json_dumper.dumps(self.test_package, context, inject_type=inject_type))
+
+    def test_json_to_dict(self):
+        """ to_dict matches a round trip through the json emitter """
+        self.assertEqual(json.loads(json_dumper.dumps(self.test_package, inject_type=False)),
+                         json_dumper.to_dict(self.test_package))
+        d = json_dumper.to_dict(self.test_package, inject_type=True)
+        self.assertEqual('Package', d['@type'])
+        self.assertIs(str, type(d['system'][0]['contents'][0]['code']))
+
+    def test_adump(self):
+        """ Test the asynchronous form of dump """
+        self.dump_test('obo_sample.yaml',
+                       lambda out_fname: asyncio.run(yaml_dumper.adump(self.test_package, out_fname)))
+
     @unittest.skipIf(False, "This needs an enhanced (https://github.com/hsolbrig/pyld) version of pyld")
     def test_rdf_dumper(self):
         """ Test the rdf dumper """
@@ -1,16 +1,71 @@
+import asyncio
+import gzip
+import io
+import json
 import os
 import unittest
 from typing import Union, TextIO, Type, Optional
 
 from hbreader import FileInfo
+from rdflib import Graph, RDF
 
 from linkml_runtime.loaders import yaml_loader, json_loader, rdf_loader, RDFLoader
+from linkml_runtime.loaders.loader_root import Loader, LoadResult
+from linkml_runtime.loaders.yaml_loader import YAMLLoader
+from linkml_runtime.utils.schemaview import SchemaView
 from linkml_runtime.utils.yamlutils import YAMLRoot
-from tests.test_loaders_dumpers import LD_11_SVR, LD_11_SSL_SVR, LD_11_DIR
+from tests.test_loaders_dumpers import LD_11_SVR, LD_11_SSL_SVR, LD_11_DIR, INPUT_DIR
 from tests.test_loaders_dumpers.environment import env
 from tests.test_loaders_dumpers.loaderdumpertestcase import LoaderDumperTestCase
+from tests.test_loaders_dumpers.models.personinfo import Container
 from tests.test_loaders_dumpers.models.termci_schema import Package
 
+PERSONS_TTL = """
+@prefix P: <http://example.org/P/> .
+@prefix personinfo: <https://w3id.org/linkml/examples/personinfo/> .
+@prefix sdo: <http://schema.org/> .
+
+[] a personinfo:Container ;
+    personinfo:persons P:001, P:002 .
+
+P:001 a sdo:Person ; sdo:name "fred bloggs" ; sdo:email "fred.bloggs@example.com" ; personinfo:age_in_years 33 .
+P:002 a sdo:Person ; sdo:name "joe schmoe" ; personinfo:age_in_years 44 .
+"""
+
+# Frame that pyld needs to reproduce PERSONS_TTL as a Container
+PERSONS_FRAME = {
+    '@context': {
+        '@vocab': 'https://w3id.org/linkml/examples/personinfo/',
+        'P': 'http://example.org/P/',
+        'sdo': 'http://schema.org/',
+        'xsd': 'http://www.w3.org/2001/XMLSchema#',
+        'id': '@id',
+        'Container': {'@id': 'https://w3id.org/linkml/examples/personinfo/Container', '@context': {'id': None}},
+        'Person': 'sdo:Person',
+        'name': 'sdo:name',
+        'primary_email': 'sdo:email',
+        'age_in_years': {'@type': 'xsd:integer'},
+        'persons': {'@container': '@set'}
+    },
+    '@type': 'Container',
+    'persons': {'@embed': '@always'}
+}
+
+
+class UnpicklableError(Exception):
+    """ An exception that can't be sent back from a worker process """
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.callback = lambda: message
+
+
+class FailingLoader(YAMLLoader):
+    """ A loader that fails on sources with 'bad' in their names """
+    def load_any(self, source, target_class, **kwargs):
+        if 'bad' in source:
+            raise UnpicklableError(source)
+        return super().load_any(source, target_class, **kwargs)
+
 
 class LoadersUnitTest(LoaderDumperTestCase):
     env = env
@@ -54,6 +109,126 @@ class LoadersUnitTest(LoaderDumperTestCase):
         fmt = 'json-ld'
         self.loader_test('obo_sample.jsonld', Package, RDFLoaderWrapper())
 
+    def test_rdf_loader_schemaview(self):
+        """ RDFLoader with a schemaview constructs the same objects as framing does """
+        view = SchemaView(os.path.join(INPUT_DIR, 'personinfo.yaml'))
+        prefix_map = {'P': 'http://example.org/P/'}
+
+        def persons(c: Container) -> list:
+            # RDF doesn't order the persons
+            return sorted(c.persons, key=lambda p: p.id)
+
+        expected = persons(rdf_loader.load(PERSONS_TTL, Container, contexts=PERSONS_FRAME))
+        self.assertEqual(['P:001', 'P:002'], [p.id for p in expected])
+        self.assertEqual(expected, persons(rdf_loader.load(PERSONS_TTL, Container, contexts=PERSONS_FRAME,
+                                                           schemaview=view, prefix_map=prefix_map)))
+        g = Graph()
+        g.parse(data=PERSONS_TTL, format='turtle')
+        self.assertEqual(expected, persons(rdf_loader.load(g, Container, schemaview=view, prefix_map=prefix_map)))
+        fname = self.env.temp_file_path('persons.ttl')
+        with open(fname, 'w') as f:
+            f.write(PERSONS_TTL)
+        self.assertEqual(expected, persons(rdf_loader.load(os.path.basename(fname), Container, schemaview=view,
+                                                           base_dir=os.path.dirname(fname), prefix_map=prefix_map)))
+        self.assertEqual(expected, persons(rdf_loader.load(io.StringIO(PERSONS_TTL), Container, schemaview=view,
+                                                           prefix_map=prefix_map)))
+        # RDF text on a single line isn't taken for a file name
+        nt = f'_:c <{RDF.type}> <https://w3id.org/linkml/examples/personinfo/Container> .'
+        self.assertEqual(Container(), rdf_loader.load(nt, Container, fmt='nt', schemaview=view))
+        self.assertEqual(Container(), rdf_loader.load(io.StringIO(nt), Container, fmt='nt', schemaview=view))
+
+    def test_json_clean(self):
+        """ json_clean and json_clean_hook remove empty values and JSON-LD keys in place """
+        text = '{"@context": "x", "a": null, "b": [null, {}, [], "v", {"@id": "y"}, [[], ["w", null]]], ' \
+               '"c": {"d": {"e": []}}, "f": 0, "g": ""}'
+        expected = {"b": ["v", {}, [["w"]]], "c": {"d": {}}, "f": 0, "g": ""}
+        inp = json.loads(text)
+        self.assertIs(inp, Loader.json_clean(inp))
+        self.assertEqual(expected, inp)
+        self.assertEqual(expected, json.loads(text, object_hook=Loader.json_clean_hook))
+
+        # Parents are cleaned before their children, so entries that are emptied by cleaning are kept
+        for text, expected in [('{"c": {"d": {"e": []}}}', {"c": {"d": {}}}),
+                               ('{"l": [{"@type": "X"}, {}]}', {"l": [{}]}),
+                               ('{"l": [[null], []], "m": {"@id": "x"}}', {"l": [[]], "m": {}}),
+                               ('{"@type": "X"}', {})]:
+            self.assertEqual(expected, Loader.json_clean(json.loads(text)))
+            self.assertEqual(expected, json.loads(text, object_hook=Loader.json_clean_hook))
+
+        # Deep structures don't hit the recursion limit
+        deep = {"a": "v"}
+        for _ in range(5000):
+            deep = {"a": [deep, None], "@id": "x"}
+        Loader.json_clean(deep)
+        for _ in range(5000):
+            self.assertEqual(["a"], list(deep.keys()))
+            self.assertEqual(1, len(deep["a"]))
+            deep = deep["a"][0]
+        self.assertEqual({"a": "v"}, deep)
+
+    def test_json_loader_typecheck(self):
+        """ The root @type is still checked when cleaning is fused into the decode step """
+        with self.assertLogs(level='WARNING') as logs:
+            json_loader.loads_any('{"@type": "Other", "system": [{"@type": "ConceptSystem"}]}', Package)
+        self.assertIn('Actual: Other', logs.output[0])
+
+    def test_load_many(self):
+        """ Load a batch of files, with and without worker processes """
+        good = self.env.input_path('obo_sample.yaml')
+        bad = self.env.input_path('obo_sample.ttl')
+        expected = yaml_loader.load(good, Package)
+        for workers in (None, 2):
+            results = list(yaml_loader.load_many([good, bad, good], Package, workers=workers))
+            self.assertEqual([good, bad, good], [r.source for r in results])
+            self.assertEqual(expected, results[0].result)
+            self.assertEqual(expected, results[2].result)
+            self.assertIsNone(results[1].result)
+            self.assertIsNotNone(results[1].error)
+        results = list(json_loader.load_many([good, bad], Package, workers=2, ordered=False))
+        self.assertEqual({good, bad}, {r.source for r in results})
+        self.assertTrue(all(isinstance(r, LoadResult) and r.error is not None for r in results))
+
+        # Exceptions that can't be pickled are still reported per source
+        for ordered in (True, False):
+            results = list(FailingLoader().load_many([good, 'bad_source.yaml'], Package, workers=2, ordered=ordered))
+            self.assertEqual({good, 'bad_source.yaml'}, {r.source for r in results})
+            error = [r.error for r in results if r.source != good][0]
+            self.assertTrue(error.startswith("UnpicklableError('bad_source.yaml')"))
+            self.assertIn('Traceback', error)
+            self.assertEqual([expected], [r.result for r in results if r.source == good])
+
+    def test_aload(self):
+        """ Load several files concurrently from an event loop """
+        fname = self.env.input_path('obo_sample.yaml')
+        expected = yaml_loader.load(fname, Package)
+
+        async def load_all():
+            return await asyncio.gather(*[yaml_loader.aload(fname, Package) for _ in range(3)])
+
+        self.assertEqual([expected] * 3, asyncio.run(load_all()))
+
+        # Compressed input, relative to base_dir, is read as load reads it
+        with open(fname) as f:
+            text = f.read()
+        gz_fname = self.env.temp_file_path('obo_sample_aload.yaml.gz')
+        with gzip.open(gz_fname, 'wt') as f:
+            f.write(text)
+        metadata = FileInfo()
+        self.assertEqual(expected, asyncio.run(yaml_loader.aload(os.path.basename(gz_fname), Package,
+                                                                 base_dir=os.path.dirname(gz_fname),
+                                                                 metadata=metadata)))
+        self.assertEqual(os.path.dirname(gz_fname), metadata.base_path)
+
+    def test_compressed_input(self):
+        """ Loaders read gzip compressed files transparently """
+        for fname, loader in (('obo_sample.yaml', yaml_loader), ('obo_sample.json', json_loader)):
+            with open(self.env.input_path(fname)) as f:
+                text = f.read()
+            gz_fname = self.env.temp_file_path(fname + '.gz')
+            with gzip.open(gz_fname, 'wt') as f:
+                f.write(text)
+            self.assertEqual(loader.loads(text, Package), loader.load(gz_fname, Package))
+
 
 if __name__ == '__main__':
     unittest.main()
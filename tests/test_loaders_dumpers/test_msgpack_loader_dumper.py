@@ -0,0 +1,73 @@
+import asyncio
+import gzip
+import io
+import os
+import unittest
+
+from linkml_runtime.dumpers import json_dumper, msgpack_dumper
+from linkml_runtime.loaders import yaml_loader, msgpack_loader
+from tests.test_loaders_dumpers.models.books_normalized import Shop, BookSeries, Book
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+INPUT_DIR = os.path.join(ROOT, 'input')
+OUTPUT_DIR = os.path.join(ROOT, 'output')
+
+DATA = os.path.join(INPUT_DIR, 'books_normalized_02.yaml')
+OUTPUT = os.path.join(OUTPUT_DIR, 'books_normalized_02.msgpack')
+
+
+@unittest.skipIf(msgpack is None, "msgpack is not installed")
+class MessagePackTestCase(unittest.TestCase):
+
+    def test_msgpack_roundtrip(self):
+        data = yaml_loader.load(DATA, target_class=Shop)
+        image = msgpack_dumper.dumps(data)
+        # Same content as the JSON rendering, enums as codes and empty values removed
+        self.assertEqual(json_dumper.to_dict(data, inject_type=True), msgpack.unpackb(image))
+        self.assertEqual(data, msgpack_loader.loads(image, target_class=Shop))
+
+        msgpack_dumper.dump(data, OUTPUT)
+        self.assertEqual(data, msgpack_loader.load(OUTPUT, target_class=Shop))
+        self.assertEqual(data, asyncio.run(msgpack_loader.aload(OUTPUT, target_class=Shop)))
+
+    def test_msgpack_compressed(self):
+        data = yaml_loader.load(DATA, target_class=Shop)
+        msgpack_dumper.dump(data, OUTPUT)
+        with open(OUTPUT, 'rb') as f:
+            image = f.read()
+        with open(OUTPUT, 'wb') as f:
+            f.write(gzip.compress(image))
+        self.assertEqual(data, msgpack_loader.load(OUTPUT, target_class=Shop))
+        if zstandard is not None:
+            with open(OUTPUT, 'wb') as f:
+                f.write(zstandard.ZstdCompressor().compress(image))
+            self.assertEqual(data, msgpack_loader.load(OUTPUT, target_class=Shop))
+
+    def test_msgpack_wrong_type(self):
+        image = msgpack_dumper.dumps(Book(id='S001.1', name='Fellowship of the Ring'))
+        with self.assertLogs(level='WARNING') as logs:
+            msgpack_loader.loads(image, target_class=BookSeries)
+        self.assertIn('Actual: Book', logs.output[0])
+
+    def test_msgpack_stream(self):
+        data = yaml_loader.load(DATA, target_class=Shop)
+        stream = io.BytesIO()
+        msgpack_dumper.dump_stream(iter(data.all_book_series), stream)
+        stream.seek(0)
+        series = list(msgpack_loader.load_iter(stream, target_class=BookSeries))
+        self.assertEqual(data.all_book_series, series)
+        self.assertEqual(series, list(msgpack_loader.load_iter(stream.getvalue(), target_class=BookSeries)))
+
+
+if __name__ == '__main__':
+    unittest.main()
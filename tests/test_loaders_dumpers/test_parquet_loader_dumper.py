@@ -0,0 +1,96 @@
+import os
+import unittest
+from decimal import Decimal
+
+from linkml_runtime.dumpers import parquet_dumper
+from linkml_runtime.linkml_model.meta import SchemaDefinition, ClassDefinition, SlotDefinition, TypeDefinition
+from linkml_runtime.loaders import yaml_loader, parquet_loader
+from linkml_runtime.utils.arrowutils import get_arrow_schema
+from linkml_runtime.utils.schemaview import SchemaView
+from tests.test_loaders_dumpers.models.books_normalized import Shop, BookSeries
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+INPUT_DIR = os.path.join(ROOT, 'input')
+OUTPUT_DIR = os.path.join(ROOT, 'output')
+MODEL_DIR = os.path.join(ROOT, 'models')
+
+SCHEMA = os.path.join(MODEL_DIR, 'books_normalized.yaml')
+DATA = os.path.join(INPUT_DIR, 'books_normalized_02.yaml')
+OUTPUT = os.path.join(OUTPUT_DIR, 'books_normalized_02.parquet')
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class ParquetTestCase(unittest.TestCase):
+
+    def test_arrow_schema(self):
+        schemaview = SchemaView(SCHEMA)
+        table = parquet_dumper.to_table(yaml_loader.load(DATA, target_class=Shop), index_slot='all_book_series',
+                                        schemaview=schemaview)
+        self.assertEqual(pyarrow.string(), table.schema.field('id').type)
+        self.assertEqual(pyarrow.list_(pyarrow.string()), table.schema.field('genres').type)
+        self.assertTrue(pyarrow.types.is_struct(table.schema.field('creator').type))
+        books = table.schema.field('books').type
+        self.assertTrue(pyarrow.types.is_list(books))
+        self.assertEqual(pyarrow.float64(), books.value_type.field('price').type)
+
+    def test_arrow_schema_plans(self):
+        """ Arrow schemas are kept by the dumper and rebuilt when the schema view changes """
+        schemaview = SchemaView(SCHEMA)
+        data = yaml_loader.load(DATA, target_class=Shop)
+        arrow_schema = parquet_dumper.to_table(data, index_slot='all_book_series', schemaview=schemaview).schema
+        plans = parquet_dumper._plans
+        self.assertTrue(plans.is_current(schemaview))
+        parquet_dumper.to_table(data, index_slot='all_book_series', schemaview=schemaview)
+        self.assertIs(plans, parquet_dumper._plans)
+        schemaview.set_modified()
+        self.assertEqual(arrow_schema,
+                         parquet_dumper.to_table(data, index_slot='all_book_series', schemaview=schemaview).schema)
+        self.assertIsNot(plans, parquet_dumper._plans)
+
+    def test_decimal(self):
+        """ Decimals are stored as float64, which is no more precise than the JSON form that rows are written from """
+        schemaview = SchemaView(SchemaDefinition(
+            id='http://example.org/dectest', name='dectest', default_range='string',
+            types=[TypeDefinition('string', base='str', uri='xsd:string'),
+                   TypeDefinition('decimal', base='Decimal', uri='xsd:decimal')],
+            classes=[ClassDefinition('Container', slots=['items'], tree_root=True),
+                     ClassDefinition('Item', slots=['id', 'amount'])],
+            slots=[SlotDefinition('items', range='Item', multivalued=True, inlined_as_list=True),
+                   SlotDefinition('id', identifier=True),
+                   SlotDefinition('amount', range='decimal')]))
+        self.assertEqual(pyarrow.float64(), get_arrow_schema(schemaview, 'Item').field('amount').type)
+        amount = Decimal('1.10000000000000000001')
+        table = parquet_dumper.to_table([{'id': 'i1', 'amount': float(amount)}], index_slot='items',
+                                        schemaview=schemaview)
+        self.assertEqual(1.1, table.column('amount')[0].as_py())
+        self.assertNotEqual(amount, Decimal(table.column('amount')[0].as_py()))
+
+    def test_parquet_roundtrip(self):
+        schemaview = SchemaView(SCHEMA)
+        data = yaml_loader.load(DATA, target_class=Shop)
+        parquet_dumper.dump(data, OUTPUT, index_slot='all_book_series', schemaview=schemaview, row_group_size=2)
+        self.assertEqual(2, pyarrow.parquet.ParquetFile(OUTPUT).metadata.row_group(0).num_rows)
+        roundtrip = parquet_loader.load(OUTPUT, target_class=Shop, index_slot='all_book_series')
+        self.assertEqual(data, roundtrip)
+
+        rows = list(parquet_loader.load_iter(OUTPUT, target_class=Shop, index_slot='all_book_series',
+                                             schemaview=schemaview))
+        self.assertTrue(all(isinstance(row, BookSeries) for row in rows))
+        self.assertEqual(data.all_book_series, rows)
+
+        table = parquet_dumper.to_table((s for s in data.all_book_series), index_slot='all_book_series',
+                                        schemaview=schemaview)
+        self.assertEqual(data, parquet_loader.load(table, target_class=Shop, index_slot='all_book_series'))
+
+        image = parquet_dumper.dumps(data, index_slot='all_book_series', schemaview=schemaview)
+        self.assertTrue(image.startswith(b'PAR1'))
+        self.assertEqual(data, parquet_loader.loads(image, target_class=Shop, index_slot='all_book_series'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,21 @@
+import gzip
+import io
 import json
 import os
 import unittest
 import logging
+import multiprocessing
 
-from rdflib import Graph, Literal, URIRef
+from rdflib import Graph, Literal, URIRef, BNode
 from rdflib.namespace import RDF, SKOS, XSD
 from rdflib import Namespace
+from rdflib.compare import isomorphic
 
 from linkml_runtime import MappingError, DataNotFoundError
 from linkml_runtime.loaders import json_loader
-from linkml_runtime.dumpers import rdflib_dumper, yaml_dumper
+from linkml_runtime.dumpers import rdflib_dumper, yaml_dumper, RDFLibDumper
 from linkml_runtime.loaders import yaml_loader
-from linkml_runtime.loaders import rdflib_loader
+from linkml_runtime.loaders import rdflib_loader, RDFLibLoader
 from linkml_runtime.utils.schemaview import SchemaView
 from linkml_runtime.utils.schemaops import roll_up, roll_down
 from tests.test_loaders_dumpers import INPUT_DIR, OUTPUT_DIR
@@ -116,6 +120,140 @@ class RdfLibDumperTestCase(unittest.TestCase):
         #person = next(p for p in container.persons if p.id == 'P:002')
         #mh = person.has_medical_history[0]
 
+    def test_dump_stream(self):
+        """
+        N-Triples written a triple at a time hold the same graph as the rdflib serialization
+        """
+        view = SchemaView(SCHEMA)
+        container = yaml_loader.load(DATA, target_class=Container)
+        expected = rdflib_dumper.as_rdf_graph(container, schemaview=view, prefix_map=prefix_map)
+        out = io.StringIO()
+        n = rdflib_dumper.dump_stream(container, out, schemaview=view)
+        g = Graph()
+        g.parse(data=out.getvalue(), format='nt')
+        self.assertEqual(len(expected), n)
+        self.assertTrue(isomorphic(expected, g))
+        # N-Quads, one container at a time
+        out = io.StringIO()
+        rdflib_dumper.dump_stream(iter([container, container]), out, schemaview=view, fmt='nquads',
+                                  graph_name='https://example.org/graph')
+        lines = out.getvalue().splitlines()
+        self.assertTrue(all(line.endswith(' <https://example.org/graph> .') for line in lines))
+        with self.assertRaises(ValueError):
+            rdflib_dumper.dump_stream(container, out, schemaview=view, fmt='ttl')
+
+    def test_dump_line_formats(self):
+        """ dump and dumps write the line based formats a triple at a time, expanding CURIEs with the prefix_map """
+        org1 = Organization('ROR:1', name='foo')
+        expected = rdflib_dumper.as_rdf_graph(org1, schemaview=SchemaView(SCHEMA), prefix_map=prefix_map)
+        self.assertIn((ROR['1'], RDF.type, SDO.Organization), expected)
+        fname = os.path.join(OUTPUT_DIR, 'organization.nt')
+        rdflib_dumper.dump(org1, fname, schemaview=SchemaView(SCHEMA), fmt='nt', prefix_map=prefix_map)
+        g = Graph()
+        g.parse(fname, format='nt')
+        self.assertTrue(isomorphic(expected, g))
+        g = Graph()
+        g.parse(data=rdflib_dumper.dumps(org1, schemaview=SchemaView(SCHEMA), fmt='nt', prefix_map=prefix_map),
+                format='nt')
+        self.assertTrue(isomorphic(expected, g))
+        # N-Quads without a graph name are in the default graph
+        rdflib_dumper.dump(org1, fname, schemaview=SchemaView(SCHEMA), fmt='nquads', prefix_map=prefix_map)
+        g = Graph()
+        g.parse(fname, format='nquads')
+        self.assertTrue(isomorphic(expected, g))
+
+    def test_load_iter(self):
+        """
+        Streaming N-Triples into objects gives the same objects as loading an rdflib Graph
+        """
+        view = SchemaView(SCHEMA)
+        g = Graph()
+        g.parse(DATA_TTL, format='ttl')
+        expected = rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=view, prefix_map=prefix_map)
+        lines = g.serialize(format='nt')
+        lines = (lines.decode() if isinstance(lines, bytes) else lines).splitlines(keepends=True)
+        by_id = lambda objs: sorted(objs, key=lambda p: p.id)
+        # Sorted lines are grouped by subject.  A tiny index forces the spill to disk
+        people = list(rdflib_loader.load_iter(io.StringIO(''.join(sorted(lines))), Person, schemaview=view,
+                                              prefix_map=prefix_map, max_in_memory_subjects=2))
+        self.assertEqual(by_id(expected), by_id(people))
+        people = list(rdflib_loader.load_iter(''.join(reversed(lines)), Person, schemaview=view,
+                                              prefix_map=prefix_map, grouped=False, max_in_memory_subjects=2))
+        self.assertEqual(by_id(expected), by_id(people))
+        # A root whose triples reappear after it was yielded
+        with self.assertRaises(ValueError):
+            list(rdflib_loader.load_iter(''.join(sorted(lines) + sorted(lines)), Person, schemaview=view,
+                                         prefix_map=prefix_map))
+        with self.assertRaises(ValueError):
+            list(rdflib_loader.load_iter(DATA_TTL, Person, schemaview=view, fmt='ttl'))
+        # Escapes, language tags and datatypes are read as rdflib reads them
+        line = '<http://example.org/P/1> <http://schema.org/name> "caf\\u00E9 \\"x\\""@fr .\n'
+        [person] = rdflib_loader.load_iter(line + f'<http://example.org/P/1> <{RDF.type}> <{SDO.Person}> .',
+                                           Person, schemaview=view)
+        self.assertEqual('caf\u00e9 "x"', person.name)
+        with self.assertRaises(ValueError):
+            list(rdflib_loader.load_iter('<http://example.org/P/1> "not a predicate" .\n', Person, schemaview=view))
+
+    def test_load_iter_shared_objects(self):
+        """ A grouped source can inline an object under several roots as long as they are read together """
+        view = SchemaView(SCHEMA)
+        g = rdflib_dumper.as_rdf_graph(Container(persons=[Person('P:001', name='fred')]), schemaview=view,
+                                       prefix_map=prefix_map)
+        [c1] = g.subjects(RDF.type, URIRef(Container.class_class_uri))
+        c2 = BNode()
+        for p, o in list(g.predicate_objects(c1)):
+            g.add((c2, p, o))
+        person = URIRef('http://example.org/P/001')
+
+        def nt(subjects):
+            out = Graph()
+            for s in subjects:
+                for p, o in g.predicate_objects(s):
+                    out.add((s, p, o))
+            lines = out.serialize(format='nt')
+            return lines.decode() if isinstance(lines, bytes) else lines
+
+        containers = list(rdflib_loader.load_iter(nt([c1]) + nt([c2]) + nt([person]), Container, schemaview=view,
+                                                  prefix_map=prefix_map))
+        self.assertEqual(2, len(containers))
+        self.assertTrue(all(c.persons[0].name == 'fred' for c in containers))
+        # Once the first container has been loaded, the person's triples are gone
+        source = nt([person]) + nt([c1]) + nt([c2])
+        with self.assertRaises(ValueError):
+            list(rdflib_loader.load_iter(source, Container, schemaview=view, prefix_map=prefix_map))
+        self.assertEqual(2, len(list(rdflib_loader.load_iter(source, Container, schemaview=view,
+                                                             prefix_map=prefix_map, grouped=False))))
+
+    def test_from_rdf_graph_workers(self):
+        """
+        Splitting the root subjects between worker processes gives the same objects, in the same order
+        """
+        view = SchemaView(SCHEMA)
+        g = Graph()
+        g.parse(DATA_TTL, format='ttl')
+        # Enough roots, each with an inlined address, for the chunks to split between the workers
+        for i in range(10):
+            person = P[f'1{i:02}']
+            address = BNode()
+            g.add((person, RDF.type, SDO.Person))
+            g.add((person, SDO.name, Literal(f'person {i}')))
+            g.add((person, INFO.current_address, address))
+            g.add((address, RDF.type, SDO.PostalAddress))
+            g.add((address, INFO.city, Literal(f'city {i % 3}')))
+        expected = rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=view, prefix_map=prefix_map)
+        self.assertEqual(12, len(expected))
+        for chunksize in [None, 1, 5]:
+            people = rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=view, prefix_map=prefix_map,
+                                                  workers=2, chunksize=chunksize)
+            self.assertEqual(expected, people)
+        # Workers that don't fork get the graph as N-Triples
+        people = rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=view, prefix_map=prefix_map,
+                                              workers=2, mp_context=multiprocessing.get_context('spawn'))
+        self.assertEqual(expected, people)
+        with self.assertRaises(ValueError):
+            rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=view, prefix_map=prefix_map,
+                                         allow_unprocessed_triples=False, workers=2)
+
     def test_enums(self):
         view = SchemaView(SCHEMA)
         org1type1 = OrganizationType('non profit')  ## no meaning declared
@@ -136,6 +274,51 @@ class RdfLibDumperTestCase(unittest.TestCase):
         print(catsx)
         self.assertCountEqual([org1type1, org1type2], catsx)
 
+    def test_emit_plans(self):
+        """ Emit plans are kept by the dumper and rebuilt when the schemaview or its prefixes change """
+        view = SchemaView(SCHEMA)
+        dumper = RDFLibDumper()
+        org1 = Organization('ROR:1', categories=[OrganizationType('charity')])
+        g = dumper.as_rdf_graph(org1, schemaview=view, prefix_map=prefix_map)
+        plans = dumper._plans
+        self.assertIn((ROR['1'], RDF.type, URIRef('http://schema.org/Organization')), g)
+        dumper.as_rdf_graph(org1, schemaview=view, prefix_map=prefix_map)
+        self.assertIs(plans, dumper._plans)
+
+        extended = dict(prefix_map, ROR2='http://example.org/ror2/')
+        g = dumper.as_rdf_graph(Organization('ROR2:1'), schemaview=view, prefix_map=extended)
+        self.assertIsNot(plans, dumper._plans)
+        self.assertIn((URIRef('http://example.org/ror2/1'), RDF.type, URIRef('http://schema.org/Organization')), g)
+
+        plans = dumper._plans
+        view.set_modified()
+        dumper.as_rdf_graph(org1, schemaview=view, prefix_map=extended)
+        self.assertIsNot(plans, dumper._plans)
+        self.assertIs(view, dumper._plans.schemaview)
+
+    def test_load_plans(self):
+        """ Dispatch tables are kept by the loader and rebuilt when the schemaview or its prefixes change """
+        view = SchemaView(SCHEMA)
+        loader = RDFLibLoader()
+        g = rdflib_dumper.as_rdf_graph(Organization('ROR:1', name='charity'), schemaview=view, prefix_map=prefix_map)
+        [org] = loader.from_rdf_graph(g, target_class=Organization, schemaview=view, prefix_map=prefix_map)
+        self.assertEqual('ROR:1', org.id)
+        plans = loader._plans
+        self.assertTrue(plans.is_current(view))
+        loader.from_rdf_graph(g, target_class=Organization, schemaview=view, prefix_map=prefix_map)
+        self.assertIs(plans, loader._plans)
+
+        extended = dict(prefix_map, ROR2='http://example.org/ror2/')
+        loader.from_rdf_graph(g, target_class=Organization, schemaview=view, prefix_map=extended)
+        self.assertIsNot(plans, loader._plans)
+
+        plans = loader._plans
+        view.set_modified()
+        [org] = loader.from_rdf_graph(g, target_class=Organization, schemaview=view, prefix_map=extended)
+        self.assertEqual('charity', org.name)
+        self.assertIsNot(plans, loader._plans)
+        self.assertIs(view, loader._plans.schemaview)
+
     def test_undeclared_prefix(self):
         view = SchemaView(SCHEMA)
         org1 = Organization('foo')  # not a CURIE or URI
@@ -144,7 +327,18 @@ class RdfLibDumperTestCase(unittest.TestCase):
         org1 = Organization('http://example.org/foo/o1')
         rdflib_dumper.as_rdf_graph(org1, schemaview=view)
 
-
+    def test_prefix_map_identifiers(self):
+        """ Identifiers are compacted with the data prefix_map, as object references are """
+        g = Graph()
+        person = URIRef('http://example.org/people/1')
+        g.add((person, RDF.type, URIRef(Person.class_class_uri)))
+        g.add((person, URIRef('http://schema.org/name'), Literal('fred')))
+        people_map = {'PEOPLE': 'http://example.org/people/'}
+        [fred] = rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=SchemaView(SCHEMA),
+                                              prefix_map=people_map)
+        self.assertEqual('PEOPLE:1', fred.id)
+        [fred] = rdflib_loader.from_rdf_graph(g, target_class=Person, schemaview=SchemaView(SCHEMA))
+        self.assertEqual('http://example.org/people/1', fred.id)
 
     def test_rdflib_loader(self):
         """
@@ -154,6 +348,12 @@ class RdfLibDumperTestCase(unittest.TestCase):
         container: Container = rdflib_loader.load(DATA_TTL, target_class=Container, schemaview=view, prefix_map=prefix_map)
         self._check_objs(view, container)
         yaml_dumper.dump(container, to_file=DATA_ROUNDTRIP)
+        # Compressed files are decompressed as rdflib reads them
+        gz_fname = os.path.join(OUTPUT_DIR, 'example_personinfo_data.ttl.gz')
+        with open(DATA_TTL, 'rb') as f, gzip.open(gz_fname, 'wb') as out:
+            out.write(f.read())
+        self.assertEqual(container, rdflib_loader.load(gz_fname, target_class=Container, schemaview=view,
+                                                       prefix_map=prefix_map))
 
     def test_unmapped_predicates(self):
         """
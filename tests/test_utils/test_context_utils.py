@@ -1,9 +1,12 @@
+import json
+import os
 import unittest
 
 from jsonasobj2 import JsonObj, loads
 
-from linkml_runtime.utils.context_utils import merge_contexts
+from linkml_runtime.utils.context_utils import merge_contexts, load_context, clear_context_cache
 from tests.test_utils import METAMODEL_CONTEXT_URI, META_BASE_URI
+from tests.test_utils.environment import env
 
 json_1 = '{ "ex": "http://example.org/test/", "ex2": "http://example.org/test2/" }'
 json_2 = '{ "foo": 17, "@context": { "ex": "http://example.org/test3/", "ex2": {"@id": "http://example.org/test4/" }}}'
@@ -81,6 +84,30 @@ class ContextUtilsTestCase(unittest.TestCase):
    ]
 }"""), merge_contexts([METAMODEL_CONTEXT_URI, json_1, json_2], base=META_BASE_URI))
 
+    def test_load_context(self):
+        """ Context documents are parsed once, and read again when the file changes """
+        fname = env.temp_file_path('load_context.context.jsonld')
+        with open(fname, 'w') as f:
+            json.dump({'@context': {'ex': 'http://example.org/test/'}}, f)
+        clear_context_cache()
+        ctx = load_context(fname)
+        self.assertEqual({'@context': {'ex': 'http://example.org/test/'}}, ctx)
+        self.assertIs(ctx, load_context(fname))
+        self.assertIs(ctx, load_context('file://' + fname))
+        self.assertIs(ctx, load_context(os.path.basename(fname), base_path=os.path.dirname(fname)))
+
+        with open(fname, 'w') as f:
+            json.dump({'@context': {'ex': 'http://example.org/test2/'}}, f)
+        os.utime(fname, ns=(0, os.stat(fname).st_mtime_ns + 1_000_000_000))
+        self.assertEqual({'@context': {'ex': 'http://example.org/test2/'}}, load_context(fname))
+
+        self.assertIs(load_context(json_2), load_context(json_2))
+        self.assertEqual({'ex': 'http://example.org/test/'}, load_context(JsonObj(ex='http://example.org/test/')))
+        # merge_contexts gets a fresh JsonObj each time
+        self.assertIsNot(merge_contexts(json_2)['@context'], merge_contexts(json_2)['@context'])
+        json_3 = '{"@context": [{"ex": "http://example.org/test/"}, {"ex2": {"@id": "http://example.org/test4/"}}]}'
+        self.assertEqual(loads(json_3)['@context'], merge_contexts(json_3)['@context'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from linkml_runtime.linkml_model.meta import SchemaDefinition, ClassDefinition, SlotDefinition
+from linkml_runtime.utils import csvutils
+from linkml_runtime.utils.csvutils import get_configmap, get_schemaview
+
+
+def _schema() -> SchemaDefinition:
+    return SchemaDefinition(
+        id='http://example.org/csvtest', name='csvtest', default_range='string',
+        classes=[ClassDefinition('Container', slots=['things'], tree_root=True),
+                 ClassDefinition('Thing', slots=['id', 'name', 'parts']),
+                 ClassDefinition('Part', slots=['name'])],
+        slots=[SlotDefinition('things', range='Thing', multivalued=True, inlined_as_list=True),
+               SlotDefinition('id', identifier=True),
+               SlotDefinition('name'),
+               SlotDefinition('parts', range='Part', multivalued=True, inlined=True)])
+
+
+class CSVUtilsTestCase(unittest.TestCase):
+
+    def test_schemaview_cache(self):
+        """ Schema views are reused for the same schema, and only the most recently used ones are kept """
+        schema = _schema()
+        sv = get_schemaview(schema)
+        self.assertIs(sv, get_schemaview(schema))
+        self.assertIs(schema, sv.schema)
+        self.assertIsNot(sv, get_schemaview(_schema()))
+
+        for _ in range(2 * csvutils.SCHEMAVIEW_CACHE_SIZE):
+            get_schemaview(_schema())
+            get_schemaview(schema)
+        self.assertEqual(csvutils.SCHEMAVIEW_CACHE_SIZE, len(csvutils._schemaview_cache))
+        self.assertIs(sv, get_schemaview(schema))
+
+    def test_configmap(self):
+        """ Configuration maps reflect the current state of the schema view """
+        schema = _schema()
+        sv = get_schemaview(schema)
+        cm = get_configmap(sv, 'things')
+        self.assertEqual(['parts'], list(cm.keys()))
+        self.assertEqual({'name': 'parts_name'}, cm['parts'].mappings)
+        self.assertTrue(cm['parts'].is_list)
+        self.assertEqual({'name': 'parts-name'}, get_configmap(sv, 'things', sep='-')['parts'].mappings)
+
+        # Changes are picked up once the view is marked as modified
+        schema.slots['size'] = SlotDefinition('size', range='integer')
+        schema.classes['Part'].slots.append('size')
+        sv.set_modified()
+        self.assertEqual({'name': 'parts_name', 'size': 'parts_size'}, get_configmap(sv, 'things')['parts'].mappings)
+
+
+if __name__ == '__main__':
+    unittest.main()
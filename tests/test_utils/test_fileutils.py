@@ -0,0 +1,50 @@
+import gzip
+import unittest
+from unittest.mock import patch
+
+from hbreader import FileInfo
+
+from linkml_runtime.utils import fileutils
+from linkml_runtime.utils.fileutils import local_file_name, compression_type, open_text, open_binary
+from tests.test_utils.environment import env
+
+
+class FileUtilsTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        with open(env.input_path('yaml1.yaml')) as f:
+            self.text = f.read()
+        self.gz_file = env.temp_file_path('yaml1.yaml.gz')
+        with gzip.open(self.gz_file, 'wt') as f:
+            f.write(self.text)
+
+    def test_local_file_name(self):
+        self.assertEqual(env.input_path('yaml1.yaml'), local_file_name('yaml1.yaml', env.indir))
+        self.assertIsNone(local_file_name('not_a_file.yaml', env.indir))
+        self.assertIsNone(local_file_name('a: 1\nb: 2\n'))
+        self.assertIsNone(local_file_name('https://w3id.org/linkml/types'))
+        self.assertIsNone(local_file_name({'a': 1}))
+
+    def test_compression_type(self):
+        self.assertIsNone(compression_type(env.input_path('yaml1.yaml')))
+        self.assertEqual('gzip', compression_type(self.gz_file))
+
+    def test_open_binary(self):
+        with open_binary(self.gz_file) as f:
+            self.assertEqual(self.text.encode(), f.read())
+        with open_binary(env.input_path('yaml1.yaml')) as f:
+            self.assertEqual(self.text.encode(), f.read())
+
+    def test_open_text(self):
+        info = FileInfo()
+        with open_text(self.gz_file, info) as f:
+            self.assertEqual(self.text, f.read())
+        self.assertEqual(self.gz_file, info.source_file)
+        with patch.object(fileutils, 'MMAP_THRESHOLD', 0):
+            with open_text(env.input_path('yaml1.yaml')) as f:
+                self.assertEqual(self.text[:10], f.read(10))
+                self.assertEqual(self.text[10:], f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
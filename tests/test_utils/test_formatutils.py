@@ -154,5 +154,37 @@ class FormatUtilsTestCase(unittest.TestCase):
    "production"
 ]""", as_json(remove_empty_items(json.loads(issue_157_2), hide_protected_keys=True)))
 
+    def test_remove_empty_items_deep(self):
+        """ Trees nested well past the recursion limit can be cleaned """
+        depth = 20000
+        tree = {'leaf': 'x', 'empty': [None]}
+        for _ in range(depth):
+            tree = {'k': [tree, None], 'e': {}}
+        actual = remove_empty_items(tree)
+        for _ in range(depth):
+            self.assertEqual(['k'], list(actual.keys()))
+            self.assertEqual(1, len(actual['k']))
+            actual = actual['k'][0]
+        self.assertEqual({'leaf': 'x'}, actual)
+
+    def test_remove_empty_items_share_unchanged(self):
+        """ Unchanged plain containers are only shared when asked for """
+        inner = {'a': [1, 2], 'b': 'text'}
+        outer = {'inner': inner, 'gone': None}
+        actual = remove_empty_items(outer, share_unchanged=True)
+        self.assertEqual({'inner': inner}, actual)
+        self.assertIsNot(outer, actual)
+        self.assertIs(inner, actual['inner'])
+        self.assertIs(inner['a'], actual['inner']['a'])
+        self.assertIsNot(inner, remove_empty_items(outer)['inner'])
+        self.assertIs(inner, remove_empty_items(inner, share_unchanged=True))
+
+        # JSON objects are always converted
+        obj = JsonObj(a=[1, 2])
+        actual = remove_empty_items(obj, share_unchanged=True)
+        self.assertEqual({'a': [1, 2]}, actual)
+        self.assertFalse(isinstance(actual, JsonObj))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+import json
+import os
+import unittest
+
+from pyld.jsonld import expand
+from rdflib import Literal, URIRef, XSD, RDF
+from rdflib.compare import isomorphic
+from rdflib_pyld_compat import rdflib_graph_from_pyld_jsonld
+
+from linkml_runtime.utils.jsonld_context import CompiledContext, UnsupportedJSONLD, json_to_rdf, compile_contexts
+from tests.test_loaders_dumpers import LD_10_DIR, LD_11_DIR, INPUT_DIR
+from tests.test_utils.environment import env
+
+EX = 'http://example.org/'
+
+context = {
+    '@context': {
+        'ex': EX,
+        'xsd': 'http://www.w3.org/2001/XMLSchema#',
+        '@vocab': EX + 'v/',
+        'id': '@id',
+        'type': '@type',
+        'n': {'@id': 'ex:n', '@type': 'xsd:decimal'},
+        'l': {'@id': 'ex:l', '@container': '@list'},
+        'r': {'@id': 'ex:r', '@type': '@id'},
+        'v': {'@type': '@vocab'},
+        'Thing': {'@id': 'ex:Thing', '@context': {'name': 'ex:thingname'}},
+        'p': {'@id': 'ex:p', '@context': {'@vocab': 'http://other.org/', 'q': {'@type': '@id'}}},
+        'dropme': None
+    }
+}
+
+document = {
+    'id': 'ex:a', 'type': ['Thing', 'Other'], 'name': 'nm', 'x': 1, 'y': 1.5, 'z': True, 'n': 3,
+    'l': [1, 'a', {'id': 'ex:b'}], 'r': ['ex:c', 'relative', '_:b1'], 'v': 'Thing', 'dropme': 'x',
+    'child': {'name': 'inner', 'type': 'Thing'},
+    'p': {'q': 'ex:d', 'name': 'zz', 'w': {'k': 'deep'}},
+    'bn': {'id': '_:b1', 'ex:foo': 'bar'}
+}
+
+
+class JSONLDContextTestCase(unittest.TestCase):
+
+    def assertSameAsPyLD(self, doc, ctx) -> None:
+        expected = rdflib_graph_from_pyld_jsonld(expand(doc, options=dict(expandContext=ctx)))
+        actual = json_to_rdf(doc, CompiledContext.compile(ctx), typed_literals=False)
+        self.assertTrue(isomorphic(expected, actual))
+
+    def test_matches_pyld(self):
+        """ json_to_rdf generates the graph that pyld expansion does """
+        self.assertSameAsPyLD(document, context)
+        with open(os.path.join(INPUT_DIR, 'obo_sample.json')) as f:
+            obo_sample = json.load(f)
+        for ctx_file in [os.path.join(LD_10_DIR, 'termci_schema.context.jsonld'),
+                         os.path.join(LD_11_DIR, 'termci_schema_inlined.context.jsonld')]:
+            with open(ctx_file) as f:
+                self.assertSameAsPyLD(obo_sample, json.load(f))
+
+    def test_compiled_terms(self):
+        ctx = CompiledContext.compile(context)
+        self.assertEqual(EX + 'n', ctx.terms['n'].iri)
+        self.assertEqual(str(XSD.decimal), ctx.terms['n'].type)
+        self.assertEqual('@id', ctx.expand_iri('id', vocab=True))
+        self.assertEqual(EX + 'v/other', ctx.expand_iri('other', vocab=True))
+        self.assertEqual(EX + 'b', ctx.expand_iri('ex:b'))
+        self.assertIsNone(ctx.expand_iri('dropme', vocab=True))
+        # Scoped contexts are compiled once
+        self.assertIs(ctx.scoped(ctx.terms['p'].context, None), ctx.scoped(ctx.terms['p'].context, None))
+
+    def test_typed_literals(self):
+        g = json_to_rdf(document, CompiledContext.compile(context))
+        a = URIRef(EX + 'a')
+        self.assertIn(Literal(1), g.objects(a, URIRef(EX + 'v/x')))
+        self.assertIn(Literal('1.5E0', datatype=XSD.double), g.objects(a, URIRef(EX + 'v/y')))
+        self.assertIn(Literal('3', datatype=XSD.decimal), g.objects(a, URIRef(EX + 'n')))
+        self.assertIn(Literal('nm'), g.objects(a, URIRef(EX + 'thingname')))
+        # Each IRI is held once, however many triples it appears in
+        types = [o for s, o in g.subject_objects(RDF.type) if o == URIRef(EX + 'Thing')]
+        self.assertEqual(2, len(types))
+        self.assertIs(types[0], types[1])
+
+    def test_compile_contexts(self):
+        """ Compiled contexts are cached until one of their files changes """
+        ctx_file = env.temp_file_path('compile_contexts.context.jsonld')
+        nested_file = env.temp_file_path('compile_contexts_nested.context.jsonld')
+        with open(nested_file, 'w') as f:
+            json.dump({'@context': {'ex': EX}}, f)
+        with open(ctx_file, 'w') as f:
+            json.dump({'@context': [os.path.basename(nested_file), {'a': 'ex:a'}]}, f)
+        ctx = compile_contexts(ctx_file)
+        self.assertEqual(EX + 'a', ctx.terms['a'].iri)
+        self.assertIs(ctx, compile_contexts(ctx_file))
+        self.assertIs(ctx, compile_contexts([ctx_file]))
+        self.assertIsNot(ctx, compile_contexts([ctx_file, {'b': 'ex:b'}]))
+
+        with open(nested_file, 'w') as f:
+            json.dump({'@context': {'ex': EX + 'v2/'}}, f)
+        os.utime(nested_file, ns=(0, os.stat(nested_file).st_mtime_ns + 1_000_000_000))
+        self.assertEqual(EX + 'v2/a', compile_contexts(ctx_file).terms['a'].iri)
+
+    def test_unsupported(self):
+        """ Features that aren't compiled are reported, so that the caller can fall back to pyld """
+        with self.assertRaises(UnsupportedJSONLD):
+            CompiledContext.compile({'@context': {'rev': {'@reverse': EX + 'rev'}}})
+        with self.assertRaises(UnsupportedJSONLD):
+            CompiledContext.compile({'@context': {'m': {'@id': EX + 'm', '@container': '@language'}}})
+        with self.assertRaises(UnsupportedJSONLD):
+            json_to_rdf({'@graph': [{'@id': EX + 'a'}]}, CompiledContext.compile(context))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from rdflib import URIRef
@@ -77,6 +78,15 @@ class NamespacesTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             ns.uri_for("1abc:junk")
 
+    def test_pickle(self):
+        ns = Namespaces()
+        ns['meta'] = "https://w3id.org/biolink/metamodel/"
+        ns._default = "http://example.org/"
+        ns2 = pickle.loads(pickle.dumps(ns))
+        self.assertEqual(ns, ns2)
+        self.assertEqual('meta:Element', ns2.curie_for('https://w3id.org/biolink/metamodel/Element'))
+        self.assertEqual("http://example.org/", str(ns2._default))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from rdflib import Literal, URIRef, XSD
+
+from linkml_runtime.utils.term_interner import TermInterner
+
+EX = 'http://example.org/'
+
+
+class TermInternerTestCase(unittest.TestCase):
+
+    def test_interning(self):
+        terms = TermInterner()
+        a = terms.uri(EX + 'a')
+        self.assertEqual(URIRef(EX + 'a'), a)
+        self.assertIs(a, terms.uri(EX + 'a'))
+        self.assertIs(a, terms.uri(URIRef(EX + 'a')))
+        b = URIRef(EX + 'b')
+        self.assertIs(b, terms.uri(b))
+
+        lit = terms.literal('17', datatype=str(XSD.integer))
+        self.assertEqual(Literal('17', datatype=XSD.integer), lit)
+        self.assertIs(lit, terms.literal('17', datatype=str(XSD.integer)))
+        self.assertEqual(Literal('x', lang='en'), terms.literal('x', lang='en'))
+        self.assertIsNot(terms.literal('x'), terms.literal('x', lang='en'))
+
+        # Equal python values of different types give different literals
+        self.assertEqual(Literal(True), terms.literal(True))
+        self.assertEqual(Literal(1), terms.literal(1))
+        self.assertEqual(Literal(1.0), terms.literal(1.0))
+
+    def test_bounded(self):
+        terms = TermInterner(max_size=10)
+        for i in range(25):
+            terms.uri(f'{EX}{i}')
+            terms.literal(i)
+        self.assertLessEqual(len(terms._uris), 10)
+        self.assertLessEqual(len(terms._literals), 10)
+        self.assertEqual(URIRef(EX + '3'), terms.uri(EX + '3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import shutil
+import threading
+import unittest
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.error import URLError
+
+from hbreader import FileInfo
+
+from linkml_runtime.linkml_model.meta import SchemaDefinition
+from linkml_runtime.loaders import yaml_loader
+from linkml_runtime.utils.schemaview import SchemaView
+from linkml_runtime.utils.url_cache import URLCache, set_url_cache, read_source
+from tests.test_utils.environment import env
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """ Serves the test input directory, recording the status of each response """
+    statuses = []
+
+    def send_response(self, code, message=None):
+        CountingHandler.statuses.append(code)
+        super().send_response(code, message)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class URLCacheTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(CountingHandler, directory=env.indir))
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.cache_dir = env.temp_file_path('url_cache', is_dir=True)
+        CountingHandler.statuses.clear()
+
+    def tearDown(self) -> None:
+        set_url_cache(None)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_revalidation(self):
+        """ Entries are revalidated with If-Modified-Since once the ttl has expired """
+        url = self.base_url + 'yaml1.yaml'
+        with open(env.input_path('yaml1.yaml')) as f:
+            expected = f.read()
+        set_url_cache(URLCache(self.cache_dir))
+        info = FileInfo()
+        self.assertEqual(expected, read_source(url, info))
+        self.assertEqual(url, info.source_file)
+        self.assertEqual(self.base_url, info.base_path)
+        self.assertEqual(expected, read_source(url))
+        self.assertEqual([200, 304], CountingHandler.statuses)
+
+        CountingHandler.statuses.clear()
+        set_url_cache(URLCache(self.cache_dir, ttl=3600))
+        self.assertEqual(expected, read_source(url))
+        self.assertEqual([], CountingHandler.statuses)
+
+    def test_offline(self):
+        """ Offline mode only answers from the cache """
+        url = self.base_url + 'schema1.yaml'
+        set_url_cache(URLCache(self.cache_dir, offline=True))
+        with self.assertRaises(URLError):
+            read_source(url)
+        set_url_cache(URLCache(self.cache_dir))
+        schema1 = read_source(url)
+        set_url_cache(URLCache(self.cache_dir, offline=True))
+        self.assertEqual(schema1, read_source(url))
+        self.assertEqual([200], CountingHandler.statuses)
+
+    def test_loader(self):
+        """ Loaders fetch URLs through the cache """
+        url = self.base_url + 'schema1.yaml'
+        set_url_cache(URLCache(self.cache_dir, ttl=3600))
+        s1 = yaml_loader.load(url, SchemaDefinition)
+        s2 = yaml_loader.load(url, SchemaDefinition)
+        self.assertEqual('schema1', s1.name)
+        self.assertEqual(s1, s2)
+        self.assertEqual([200], CountingHandler.statuses)
+
+    def test_schemaview_imports(self):
+        """ Schema imports, which SchemaView hands over as URIRefs, are answered from the cache """
+        importer = env.temp_file_path('url_cache_importer.yaml')
+        with open(importer, 'w') as f:
+            f.write(f'id: http://example.org/importer\nname: importer\nimports:\n  - {self.base_url}schema1\n')
+        schema1 = self.base_url + 'schema1'
+        set_url_cache(URLCache(self.cache_dir, ttl=3600))
+        self.assertIn(schema1, SchemaView(importer).imports_closure())
+        self.assertIn(schema1, SchemaView(importer).imports_closure())
+        self.assertEqual([200], CountingHandler.statuses)
+
+        set_url_cache(URLCache(self.cache_dir, offline=True))
+        self.assertIn(schema1, SchemaView(importer).imports_closure())
+        self.assertEqual([200], CountingHandler.statuses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,13 @@
 import unittest
 
 import yaml
+from jsonasobj2 import JsonObj
 
-from linkml_runtime.utils.yamlutils import DupCheckYamlLoader
+from linkml_runtime.loaders import json_loader
+from linkml_runtime.utils.yamlutils import DupCheckYamlLoader, as_kwargs
 from tests.support.test_environment import TestEnvironmentTestCase
 from tests.test_utils.environment import env
+from tests.test_utils.input.inlined_as_dict import E
 
 
 class YamlUtilTestCase(TestEnvironmentTestCase):
@@ -25,6 +28,21 @@ class YamlUtilTestCase(TestEnvironmentTestCase):
             s1 = yaml.load(f, DupCheckYamlLoader)
             self.assertEqual('schema1', s1['name'])
 
+    def test_as_kwargs(self):
+        """ as_kwargs passes dictionaries through and only unpacks the top level of a JsonObj """
+        d = {'ev': {'k1': {'s2': 'v21'}}}
+        self.assertIs(d, as_kwargs(d))
+        j = JsonObj(d)
+        kwargs = as_kwargs(j)
+        self.assertEqual(['ev'], list(kwargs.keys()))
+        self.assertIs(j.ev, kwargs['ev'])
+        self.assertEqual(E(**d), E(**as_kwargs(j)))
+        self.assertEqual("E(ev={'k1': EInst(s1='k1', s2='v21', s3=None)})", str(E(**as_kwargs(j))))
+
+        # Lists of JsonObjs at the root of a load
+        objs = json_loader.load_any('[{"ev": {"k1": {"s2": "v21"}}}, {"ev": {"k2": {"s3": "v3"}}}]', E)
+        self.assertEqual([E(ev={'k1': {'s2': 'v21'}}), E(ev={'k2': {'s3': 'v3'}})], objs)
+
 
 if __name__ == '__main__':
     unittest.main()